@@ -16,6 +16,7 @@ from src.core.authentication.thirdparty_auth import thirdparty_route
 from src.core.authentication.validate_token import validate_token
 from src.core.authentication.password_auth import password_auth
 from src.core.authentication.logout import logout_route
+from src.core.realtime.push_route import push_route
 from src.datamodel.database.Base import Base
 import src.datamodel.database.userauth.AuthenticationTables
 import src.datamodel.database.domain.AppTables
@@ -23,6 +24,10 @@ import src.datamodel.database.domain.Purchase
 # import src.datamodel.database.UserLog
 from src.core.database.dbs.postgresql.connect import engine
 from src.core.database.dbs.mongodb.connect import init_db, check_db_connection
+from src.common.cache import start_invalidation_listener, stop_invalidation_listener
+from src.services.cache_warmer import cache_warmer
+from src.services.push_hub import push_hub
+from src.services.job_queue import job_queue
 import asyncio
 import asyncpg
 
@@ -64,7 +69,20 @@ async def lifespan(app: FastAPI):
         logger.info("Initializing MongoDB")
         await check_db_connection()
         await init_db()
+
+        # Keep this worker's in-memory caches in step with writes on other workers
+        start_invalidation_listener()
+        # Relay content updates published by any worker to this worker's displays
+        push_hub.start()
+        # Fill the read caches for every active building in the background
+        cache_warmer.start()
+        # Run queued admin jobs (background deletes, floor plan uploads)
+        job_queue.start()
         yield
+        await job_queue.stop()
+        await cache_warmer.stop()
+        await push_hub.stop()
+        await stop_invalidation_listener()
     except Exception as err:
         logger.error(f"Lifespan setup error: {err}")
         raise
@@ -105,6 +123,7 @@ routes = route_initializer.router_config()
 app.include_router(password_auth)
 app.include_router(logout_route)
 app.include_router(validate_token)
+app.include_router(push_route)
 
 # Load routes to FastAPI router
 app.include_router(routes)
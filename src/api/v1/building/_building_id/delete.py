@@ -1,10 +1,12 @@
-from fastapi import HTTPException, Path, Query, status
+from fastapi import HTTPException, Path, Query, status, Request
 from pydantic import BaseModel
 from typing import Optional
-import time
 import logging
-from src.datamodel.database.domain.DigitalSignage import Building, Floor, Location
+from src.datamodel.database.domain.DigitalSignage import Building
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.core.middleware.token_validate_middleware import validate_token
+from src.services import cascade_delete
+from src.services.job_queue import job_queue, accepted_response
 
 
 logger = logging.getLogger(__name__)
@@ -29,13 +31,17 @@ class DeleteResponse(BaseModel):
     delete_type: str
     affected_floors: int
     affected_locations: int
+    affected_connectors: int = 0
+    affected_paths: int = 0
     message: str
 
 
 async def main(
+    request: Request,
     building_id: str = Path(..., description="Building ID to delete"),
     hard_delete: Optional[bool] = Query(False, description="Perform hard delete (true) or soft delete (false)"),
-    cascade: Optional[bool] = Query(True, description="Also delete associated floors and locations")
+    cascade: Optional[bool] = Query(True, description="Also delete associated floors and everything on them"),
+    background: Optional[bool] = Query(False, description="Run in the background and return a job id to poll at /v1/job/{job_id}")
 ):
     try:
         # Find building by ID
@@ -49,58 +55,22 @@ async def main(
                 detail=f"Building with ID '{building_id}' not found"
             )
 
-        affected_floors = 0
-        affected_locations = 0
+        if background:
+            # A queued job is only visible to its owner, so it needs a token
+            validate_token(request)
+            job = await job_queue.submit(cascade_delete.DELETE_BUILDINGS_JOB, {
+                "building_ids": [building_id],
+                "hard_delete": bool(hard_delete),
+                "cascade": bool(cascade),
+                "updated_by": request.state.user_uuid,
+            }, entity_uuid=request.state.entity_uuid, created_by=request.state.user_uuid)
+            return accepted_response(job, f"Building delete queued as job {job['job_id']}")
 
-        # Handle cascade deletion of floors and locations
-        if cascade and building.floors:
-            # Get all floors in this building
-            floors = await Floor.find({
-                "building_id": building_id,
-                "status": "active"
-            }).to_list()
-            
-            affected_floors = len(floors)
-            
-            for floor in floors:
-                # Handle locations in each floor
-                if floor.locations:
-                    locations = await Location.find({
-                        "location_id": {"$in": floor.locations},
-                        "status": "active"
-                    }).to_list()
-                    
-                    affected_locations += len(locations)
-                    
-                    # Delete or soft delete locations
-                    for location in locations:
-                        if hard_delete:
-                            await location.delete()
-                        else:
-                            location.status = "deleted"
-                            location.updated_by = None  # Set to current user if available
-                            location.update_on = time.time()
-                            await location.save()
-                
-                # Delete or soft delete floor
-                if hard_delete:
-                    await floor.delete()
-                else:
-                    floor.status = "deleted"
-                    floor.updated_by = None  # Set to current user if available
-                    floor.update_on = time.time()
-                    await floor.save()
-
-        # Delete or soft delete building
-        if hard_delete:
-            await building.delete()
-            delete_type = "hard"
-        else:
-            building.status = "deleted"
-            building.updated_by = None  # Set to current user if available
-            building.update_on = time.time()
-            await building.save()
-            delete_type = "soft"
+        result = await cascade_delete.delete_buildings([building], hard_delete, cascade)
+        await cascade_delete.publish_deletes(result, hard_delete)
+        delete_type = "hard" if hard_delete else "soft"
+        affected_floors = result.count(result.floor_ids)
+        affected_locations = result.count(result.location_ids)
 
         logger.info(f"Building {delete_type} deleted: {building_id}, affected floors: {affected_floors}, affected locations: {affected_locations}")
 
@@ -109,6 +79,8 @@ async def main(
             delete_type=delete_type,
             affected_floors=affected_floors,
             affected_locations=affected_locations,
+            affected_connectors=result.count(result.connector_ids),
+            affected_paths=result.count(result.path_ids),
             message=f"Building {delete_type} deleted successfully"
         )
 
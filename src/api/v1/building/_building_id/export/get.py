@@ -0,0 +1,70 @@
+from fastapi import HTTPException, Path, Query, Request, status
+from fastapi.responses import StreamingResponse
+from typing import Literal
+import time
+import logging
+
+from src.datamodel.database.domain.DigitalSignage import Building
+from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.core.middleware.token_validate_middleware import validate_token
+from src.services.building_bundle import export_ndjson, export_zip
+
+logger = logging.getLogger(__name__)
+
+
+def api_config():
+    config = {
+        "path": "",
+        "status_code": 200,
+        "tags": ["Building"],
+        "summary": "Export Building",
+        "response_model": None,
+        "description": (
+            "Stream a building with its active floors, vertical connectors, locations and paths as an NDJSON "
+            "bundle (one {\"type\", \"data\"} record per line), or as a ZIP holding that file. "
+            "The bundle can be imported with POST /v1/building/import."
+        ),
+        "response_description": "NDJSON or ZIP bundle",
+        "deprecated": False,
+    }
+    return ApiConfig(**config)
+
+
+async def main(
+    request: Request,
+    building_id: str = Path(..., description="Building ID to export"),
+    format: Literal["ndjson", "zip"] = Query("ndjson", description="Bundle format: ndjson or zip"),
+):
+    validate_token_start = time.time()
+    validate_token(request)
+    entity_uuid = request.state.entity_uuid
+    validate_token_time = time.time() - validate_token_start
+    logger.info(f"PERFORMANCE: Token validation took {validate_token_time:.4f} seconds")
+
+    try:
+        building = await Building.find_one({"building_id": building_id, "status": "active"})
+        if not building or (building.entity_uuid and building.entity_uuid != entity_uuid):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Building with ID '{building_id}' not found"
+            )
+
+        logger.info(f"Exporting building {building_id} as {format}")
+        if format == "zip":
+            body, media_type = export_zip(building), "application/zip"
+        else:
+            body, media_type = export_ndjson(building), "application/x-ndjson"
+        return StreamingResponse(
+            body,
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="building-{building_id}.{format}"'},
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error exporting building {building_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to export building: {str(e)}"
+        )
@@ -140,6 +140,7 @@ from src.common.redis_utils import (
     set_multi_cache_fast,
     set_cache_background
 )
+from src.common.cache import building_tag, floor_tag
 
 logger = logging.getLogger(__name__)
 
@@ -214,7 +215,8 @@ async def _get_building_cached(building_id: str) -> Optional[Building]:
             # Cache the building data in background
             try:
                 building_dict = building.dict()
-                await set_cache_background(cache_key, building_dict, expire=CACHE_TTL["building"])
+                await set_cache_background(cache_key, building_dict, expire=CACHE_TTL["building"],
+                                           tags=[building_tag(building_id)])
             except Exception as e:
                 logger.warning(f"Error caching building data: {e}")
         
@@ -266,7 +268,10 @@ async def _get_floors_cached(floor_ids: List[str]) -> List[Floor]:
             
             # Cache new floors in background
             if new_cache_data:
-                await set_multi_cache_fast(new_cache_data, expire=CACHE_TTL["floors"])
+                await set_multi_cache_fast(
+                    new_cache_data, expire=CACHE_TTL["floors"],
+                    tags={f"floor:{floor_id}": [floor_tag(floor_id)] for floor_id in floors_data}
+                )
                 
         except Exception as e:
             logger.error(f"Error fetching floors from database: {e}")
@@ -300,7 +305,8 @@ async def main(
                 "message": f"Building with ID '{building_id}' not found",
                 "data": None
             }
-            await set_cache_background(result_cache_key, not_found_result, expire=60)  # Cache for 1 minute
+            await set_cache_background(result_cache_key, not_found_result, expire=60,  # Cache for 1 minute
+                                       tags=[building_tag(building_id)])
             
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -361,7 +367,10 @@ async def main(
         }
 
         # Cache the final result in background
-        await set_cache_background(result_cache_key, result, expire=CACHE_TTL["result"])
+        await set_cache_background(
+            result_cache_key, result, expire=CACHE_TTL["result"],
+            tags=[building_tag(building_id)] + [floor_tag(floor_id) for floor_id in (building.floors or [])]
+        )
 
         logger.info(f"Retrieved building details: {building_id} with {len(floor_details)} floors")
 
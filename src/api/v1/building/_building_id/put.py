@@ -8,6 +8,7 @@ from src.datamodel.database.domain.DigitalSignage import Building
 from src.datamodel.datavalidation.apiconfig import ApiConfig
 from src.core.middleware.token_validate_middleware import validate_token
 from src.core.database.dbs.getdb import postresql as db
+from src.common.cache import invalidate_tags, BUILDINGS, building_tag, entity_list_tag
 
 
 logger = logging.getLogger(__name__)
@@ -120,6 +121,7 @@ async def main(
 
         # Update the building
         await existing_building.update({"$set": update_data})
+        await invalidate_tags(entity_list_tag(BUILDINGS, existing_building.entity_uuid), building_tag(building_id))
         
         # Refresh the building data
         updated_building = await Building.find_one({"building_id": building_id})
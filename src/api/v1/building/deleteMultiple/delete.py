@@ -1,10 +1,12 @@
-from fastapi import HTTPException, Query, status
+from fastapi import HTTPException, Query, status, Request
 from pydantic import BaseModel, Field
 from typing import List, Optional
-import time
 import logging
-from src.datamodel.database.domain.DigitalSignage import Building, Floor, Location
+from src.datamodel.database.domain.DigitalSignage import Building
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.core.middleware.token_validate_middleware import validate_token
+from src.services import cascade_delete
+from src.services.job_queue import job_queue, accepted_response
 
 
 logger = logging.getLogger(__name__)
@@ -34,13 +36,17 @@ class BulkDeleteResponse(BaseModel):
     delete_type: str
     total_affected_floors: int
     total_affected_locations: int
+    total_affected_connectors: int = 0
+    total_affected_paths: int = 0
     message: str
 
 
 async def main(
+    request: Request,
     delete_data: BulkDeleteRequest,
     hard_delete: Optional[bool] = Query(False, description="Perform hard delete (true) or soft delete (false)"),
-    cascade: Optional[bool] = Query(True, description="Also delete associated floors and locations")
+    cascade: Optional[bool] = Query(True, description="Also delete associated floors and everything on them"),
+    background: Optional[bool] = Query(False, description="Run in the background and return a job id to poll at /v1/job/{job_id}")
 ):
     try:
         if not delete_data.building_ids:
@@ -49,81 +55,31 @@ async def main(
                 detail="No building IDs provided for deletion"
             )
 
-        deleted_buildings = []
-        failed_deletions = []
-        total_affected_floors = 0
-        total_affected_locations = 0
-
-        for building_id in delete_data.building_ids:
-            try:
-                # Find building by ID
-                building = await Building.find_one({
-                    "building_id": building_id
-                })
-                
-                if not building:
-                    failed_deletions.append(building_id)
-                    logger.warning(f"Building not found: {building_id}")
-                    continue
-
-                affected_floors = 0
-                affected_locations = 0
-
-                # Handle cascade deletion
-                if cascade and building.floors:
-                    floors = await Floor.find({
-                        "building_id": building_id,
-                        "status": "active"
-                    }).to_list()
-                    
-                    affected_floors = len(floors)
-                    
-                    for floor in floors:
-                        if floor.locations:
-                            locations = await Location.find({
-                                "location_id": {"$in": floor.locations},
-                                "status": "active"
-                            }).to_list()
-                            
-                            affected_locations += len(locations)
-                            
-                            # Delete locations
-                            for location in locations:
-                                if hard_delete:
-                                    await location.delete()
-                                else:
-                                    location.status = "deleted"
-                                    location.updated_by = None  # Set to current user if available
-                                    location.update_on = time.time()
-                                    await location.save()
-                        
-                        # Delete floor
-                        if hard_delete:
-                            await floor.delete()
-                        else:
-                            floor.status = "deleted"
-                            floor.updated_by = None  # Set to current user if available
-                            floor.update_on = time.time()
-                            await floor.save()
-
-                # Delete building
-                if hard_delete:
-                    await building.delete()
-                else:
-                    building.status = "deleted"
-                    building.updated_by = None  # Set to current user if available
-                    building.update_on = time.time()
-                    await building.save()
-
-                deleted_buildings.append(building_id)
-                total_affected_floors += affected_floors
-                total_affected_locations += affected_locations
-
-                logger.info(f"Successfully deleted building: {building_id}")
-
-            except Exception as e:
-                logger.error(f"Failed to delete building {building_id}: {str(e)}")
-                failed_deletions.append(building_id)
+        building_ids = list(dict.fromkeys(delete_data.building_ids))
+        if background:
+            # A queued job is only visible to its owner, so it needs a token
+            validate_token(request)
+            job = await job_queue.submit(cascade_delete.DELETE_BUILDINGS_JOB, {
+                "building_ids": building_ids,
+                "hard_delete": bool(hard_delete),
+                "cascade": bool(cascade),
+                "updated_by": request.state.user_uuid,
+            }, entity_uuid=request.state.entity_uuid, created_by=request.state.user_uuid)
+            return accepted_response(job, f"Bulk building delete queued as job {job['job_id']}")
+
+        buildings = await Building.find({"building_id": {"$in": building_ids}}).to_list()
+        found = {building.building_id for building in buildings}
+        failed_deletions = [building_id for building_id in building_ids if building_id not in found]
+        for building_id in failed_deletions:
+            logger.warning(f"Building not found: {building_id}")
+
+        # One set-based pass over every building instead of a delete/save per document
+        result = await cascade_delete.delete_buildings(buildings, hard_delete, cascade)
+        await cascade_delete.publish_deletes(result, hard_delete)
+        deleted_buildings = [building_id for building_id in building_ids if building_id in found]
+        total_affected_floors = result.count(result.floor_ids)
+        total_affected_locations = result.count(result.location_ids)
+
 
         delete_type = "hard" if hard_delete else "soft"
         
@@ -135,11 +91,13 @@ async def main(
             delete_type=delete_type,
             total_affected_floors=total_affected_floors,
             total_affected_locations=total_affected_locations,
+            total_affected_connectors=result.count(result.connector_ids),
+            total_affected_paths=result.count(result.path_ids),
             message=f"Bulk {delete_type} delete completed. Deleted: {len(deleted_buildings)}, Failed: {len(failed_deletions)}"
         )
 
         # Determine response status based on results
-        if len(deleted_buildings) == len(delete_data.building_ids):
+        if len(deleted_buildings) == len(building_ids):
             status_message = "All buildings deleted successfully"
         elif len(deleted_buildings) > 0:
             status_message = "Partial deletion completed"
@@ -246,19 +246,19 @@
 
 
 from fastapi import HTTPException, Query, status, Depends, Request
-from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import logging
 import time
-import hashlib
 import asyncio
+import functools
 from src.datamodel.database.domain.DigitalSignage import Building
 from src.datamodel.datavalidation.apiconfig import ApiConfig
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.middleware.token_validate_middleware import validate_token
 from src.core.database.dbs.getdb import postresql as db
-from src.common.redis_utils import get_cache_fast, set_cache_fast, get_compressed_cache
+from src.common.cache import TwoTierCache, CachedBody, BUILDINGS, entity_list_tag, query_key
+from src.services.cache_warmer import cache_warmer
 
 logger = logging.getLogger(__name__)
 
@@ -287,51 +287,18 @@ class BuildingResponseLight(BaseModel):
     class Config:
         allow_population_by_field_name = True
 
-# Memory cache for extremely frequent requests (last 100 queries)
-_MEMORY_CACHE: Dict[str, Dict] = {}
-_CACHE_ACCESS_ORDER = []
+# Memory + Redis cache for building lists
 MAX_MEMORY_CACHE = 100
-
-def add_to_memory_cache(key: str, data: Dict):
-    """Ultra-fast in-memory cache with LRU eviction"""
-    global _MEMORY_CACHE, _CACHE_ACCESS_ORDER
-    
-    if key in _MEMORY_CACHE:
-        _CACHE_ACCESS_ORDER.remove(key)
-    elif len(_MEMORY_CACHE) >= MAX_MEMORY_CACHE:
-        # Remove oldest entry
-        oldest = _CACHE_ACCESS_ORDER.pop(0)
-        del _MEMORY_CACHE[oldest]
-    
-    _MEMORY_CACHE[key] = data
-    _CACHE_ACCESS_ORDER.append(key)
-
-def get_from_memory_cache(key: str) -> Optional[Dict]:
-    """Get from in-memory cache"""
-    if key in _MEMORY_CACHE:
-        # Move to end (most recently used)
-        _CACHE_ACCESS_ORDER.remove(key)
-        _CACHE_ACCESS_ORDER.append(key)
-        return _MEMORY_CACHE[key]
-    return None
+building_cache = TwoTierCache("building", max_entries=MAX_MEMORY_CACHE, max_bytes=8 * 1024 * 1024, ttl=1800)
+LIST_CACHE_TTL = 36000    # 10hr for lists
+SEARCH_CACHE_TTL = 1800   # 30min for searches
 
 def generate_fast_cache_key(entity_uuid: str, status_filter: str, 
-                           name: Optional[str], limit: int, skip: int) -> str:
-    """Generate optimized cache key"""
-    # Use shorter, more efficient key format
-    parts = [
-        entity_uuid[-12:],  # Use only last 12 chars of UUID
-        status_filter[0] if status_filter else "a",  # Just first char
-        str(limit),
-        str(skip)
-    ]
-    
-    if name:
-        # Use hash for name to keep key short
-        name_hash = hashlib.md5(name.encode()).hexdigest()[:8]
-        parts.append(name_hash)
-    
-    return "b:" + ":".join(parts)  # "b:" prefix for buildings
+                           name: Optional[str], limit: int, skip: int,
+                           light: bool = False) -> str:
+    """Cache key for one building list query (light/full responses differ in shape)"""
+    # "b3:" entries hold pre-encoded bodies, keyed by the full parameters
+    return query_key("b3", entity_uuid, status_filter, name, limit, skip, light)
 
 async def get_buildings_optimized(entity_uuid: str, status_filter: Optional[str], 
                                 name: Optional[str], limit: int, skip: int, 
@@ -381,6 +348,30 @@ async def get_buildings_optimized(entity_uuid: str, status_filter: Optional[str]
         logger.error(f"Database error: {str(e)}")
         raise
 
+async def build_buildings_response(entity_uuid: str, status_filter: Optional[str],
+                                   name: Optional[str], limit: int, skip: int,
+                                   light: bool = False) -> CachedBody:
+    """Response body for one query, encoded once so cache hits skip JSON encoding"""
+    building_list = await get_buildings_optimized(
+        entity_uuid, status_filter, name, limit, skip, None
+    )
+
+    # Build minimal response
+    if light:
+        return CachedBody.encode({
+            "data": building_list,
+            "count": len(building_list)
+        })
+    return CachedBody.encode({
+        "status": "success",
+        "data": building_list,
+        "pagination": {
+            "limit": limit,
+            "skip": skip,
+            "returned": len(building_list)
+        }
+    })
+
 async def main(
     request: Request,
     status_filter: Optional[str] = Query("active"),
@@ -400,93 +391,38 @@ async def main(
     
     # Generate efficient cache key
     cache_key = generate_fast_cache_key(entity_uuid, status_filter or "active", 
-                                       name, limit, skip)
-    
-    # Layer 1: Check in-memory cache first (fastest)
-    memory_start = time.perf_counter()
-    cached_data = get_from_memory_cache(cache_key)
-    if cached_data:
-        memory_time = (time.perf_counter() - memory_start) * 1000
-        total_time = (time.perf_counter() - start_time) * 1000
-        logger.info(f"MEMORY HIT: {cache_key} | Memory: {memory_time:.1f}ms | Total: {total_time:.1f}ms")
-        
-        return JSONResponse(
-            content=cached_data,
-            headers={"X-Cache": "MEMORY", "X-Response-Time": f"{total_time:.1f}ms"}
-        )
-    
-    # Layer 2: Check Redis cache
-    redis_start = time.perf_counter()
-    try:
-        if light:
-            # Use compressed cache for light requests
-            cached_data = await get_compressed_cache(cache_key)
-        else:
-            cached_data = await get_cache_fast(cache_key)
-            
-        if cached_data:
-            redis_time = (time.perf_counter() - redis_start) * 1000
-            total_time = (time.perf_counter() - start_time) * 1000
-            
-            # Add to memory cache for next time
-            add_to_memory_cache(cache_key, cached_data)
-            
-            logger.info(f"REDIS HIT: {cache_key} | Redis: {redis_time:.1f}ms | Total: {total_time:.1f}ms")
-            
-            return JSONResponse(
-                content=cached_data,
-                headers={"X-Cache": "REDIS", "X-Response-Time": f"{total_time:.1f}ms"}
-            )
-    except Exception as e:
-        logger.warning(f"Redis cache failed: {e}")
+                                       name, limit, skip, light)
     
-    redis_time = (time.perf_counter() - redis_start) * 1000
-    logger.info(f"CACHE MISS: {cache_key} | Cache check: {redis_time:.1f}ms")
-    
-    # Layer 3: Database query
-    try:
+    db_time = None
+
+    async def load_buildings():
+        nonlocal db_time
         db_start = time.perf_counter()
-        building_list = await get_buildings_optimized(
-            entity_uuid, status_filter, name, limit, skip, db
+        body = await build_buildings_response(
+            entity_uuid, status_filter, name, limit, skip, light
         )
         db_time = (time.perf_counter() - db_start) * 1000
-        
-        # Build minimal response
-        if light:
-            response = {
-                "data": building_list,
-                "count": len(building_list)
-            }
-        else:
-            response = {
-                "status": "success",
-                "data": building_list,
-                "pagination": {
-                    "limit": limit,
-                    "skip": skip,
-                    "returned": len(building_list)
-                }
-            }
-        
-        # Cache asynchronously (don't block response)
-        cache_ttl = 1800 if name else 36000  # 300min for searches, 1hr for lists
-        asyncio.create_task(set_cache_fast(cache_key, response, expire=cache_ttl))
-        
-        # Add to memory cache immediately
-        add_to_memory_cache(cache_key, response)
-        
-        total_time = (time.perf_counter() - start_time) * 1000
-        logger.info(f"DB QUERY: {cache_key} | DB: {db_time:.1f}ms | Total: {total_time:.1f}ms")
-        
-        return JSONResponse(
-            content=response,
-            headers={
-                "X-Cache": "MISS", 
-                "X-Response-Time": f"{total_time:.1f}ms",
-                "X-DB-Time": f"{db_time:.1f}ms"
-            }
+        return body
+
+    try:
+        # Memory -> Redis -> database, concurrent misses share one query
+        cache_ttl = SEARCH_CACHE_TTL if name else LIST_CACHE_TTL
+        body, cache_source = await building_cache.get_or_load(
+            cache_key, load_buildings, ttl=cache_ttl, tags=[entity_list_tag(BUILDINGS, entity_uuid)]
         )
-        
+
+        total_time = (time.perf_counter() - start_time) * 1000
+        headers = {"X-Cache": cache_source, "X-Response-Time": f"{total_time:.1f}ms"}
+        if db_time is not None:
+            headers["X-DB-Time"] = f"{db_time:.1f}ms"
+            logger.info(f"DB QUERY: {cache_key} | DB: {db_time:.1f}ms | Total: {total_time:.1f}ms")
+        else:
+            logger.info(f"{cache_source} HIT: {cache_key} | Total: {total_time:.1f}ms")
+
+        return body.response(request, headers)
+
+    except HTTPException:
+        raise
     except Exception as e:
         total_time = (time.perf_counter() - start_time) * 1000
         logger.exception(f"Error retrieving buildings: {str(e)} | Time: {total_time:.1f}ms")
@@ -498,32 +434,37 @@ async def main(
 # Health check for cache performance
 async def get_cache_stats():
     """Get cache performance statistics"""
-    return {
-        "memory_cache_size": len(_MEMORY_CACHE),
-        "memory_cache_keys": list(_CACHE_ACCESS_ORDER[-10:]),  # Last 10 keys
-        "memory_cache_max": MAX_MEMORY_CACHE
-    }
+    return building_cache.stats()
 
 # Cache warming function for high-traffic queries
+COMMON_QUERIES = [
+    {"status_filter": "active", "limit": 50, "skip": 0},
+    {"status_filter": "active", "limit": 100, "skip": 0},
+    {"status_filter": "all", "limit": 50, "skip": 0},
+]
+
 async def warm_common_caches(entity_uuid: str):
     """Pre-warm caches for common queries"""
-    common_queries = [
-        {"status_filter": "active", "limit": 50, "skip": 0},
-        {"status_filter": "active", "limit": 100, "skip": 0},
-        {"status_filter": "all", "limit": 50, "skip": 0},
-    ]
-    
-    for query in common_queries:
+    def warm(query: Dict[str, Any]):
         cache_key = generate_fast_cache_key(
-            entity_uuid, query["status_filter"], None, 
+            entity_uuid, query["status_filter"], None,
             query["limit"], query["skip"]
         )
-        
-        # Only warm if not already cached
-        if not get_from_memory_cache(cache_key):
-            try:
-                # This would trigger a DB query and cache the result
-                logger.info(f"Warming cache for {cache_key}")
-                # You can call your main function here or implement the logic
-            except Exception as e:
-                logger.warning(f"Cache warming failed: {e}")
\ No newline at end of file
+        return building_cache.get_or_load(
+            cache_key,
+            lambda: build_buildings_response(
+                entity_uuid, query["status_filter"], None, query["limit"], query["skip"]
+            ),
+            ttl=LIST_CACHE_TTL, tags=[entity_list_tag(BUILDINGS, entity_uuid)]
+        )
+
+    # Already-cached queries are memory/Redis hits, so re-warming is cheap
+    await cache_warmer.run_bounded(
+        functools.partial(warm, query) for query in COMMON_QUERIES
+    )
+
+async def _warm_building(building: Building, floor_ids: List[str]):
+    if building.entity_uuid:
+        await warm_common_caches(building.entity_uuid)
+
+cache_warmer.register("building_list", _warm_building)
@@ -0,0 +1,98 @@
+from fastapi import HTTPException, Query, Request, status
+from typing import Optional
+import time
+import logging
+
+from src.datamodel.database.domain.DigitalSignage import Building
+from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.core.middleware.token_validate_middleware import validate_token
+from src.services.building_bundle import BundleError, read_bundle, plan_import, execute_import
+from src.services.job_queue import job_queue, accepted_response
+
+logger = logging.getLogger(__name__)
+
+
+def api_config():
+    config = {
+        "path": "",
+        "status_code": 201,
+        "tags": ["Building"],
+        "summary": "Import Building",
+        "response_model": dict,
+        "description": (
+            "Import a bundle from GET /v1/building/{building_id}/export, sent as the raw request body "
+            "(application/x-ndjson, or application/zip). Without `building_id` the bundle's building is "
+            "created; with it, the bundle's floors and their content are added to that building. "
+            "The whole bundle is validated before anything is written; errors are returned together with "
+            "their line numbers."
+        ),
+        "response_description": "Imported document counts",
+        "deprecated": False,
+    }
+    return ApiConfig(**config)
+
+
+async def main(
+    request: Request,
+    building_id: Optional[str] = Query(None, description="Existing building to import into"),
+    name: Optional[str] = Query(None, description="Name of the new building (defaults to the bundle's)"),
+    keep_ids: bool = Query(False, description="Keep the bundle's IDs instead of generating new ones"),
+    background: bool = Query(False, description="Insert in the background and return a job id to poll at /v1/job/{job_id}"),
+):
+    validate_token_start = time.time()
+    validate_token(request)
+    entity_uuid = request.state.entity_uuid
+    user_uuid = request.state.user_uuid
+    validate_token_time = time.time() - validate_token_start
+    logger.info(f"PERFORMANCE: Token validation took {validate_token_time:.4f} seconds")
+
+    try:
+        target = None
+        if building_id:
+            target = await Building.find_one({"building_id": building_id, "status": "active"})
+            if not target or (target.entity_uuid and target.entity_uuid != entity_uuid):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Building with ID '{building_id}' not found"
+                )
+
+        start = time.perf_counter()
+        records = await read_bundle(request.stream())
+        plan = await plan_import(records, target, name, keep_ids, entity_uuid, user_uuid)
+        logger.info(f"PERFORMANCE: Read and validated {len(records)} bundle records in {time.perf_counter() - start:.4f} seconds")
+
+        if background:
+            # The validated documents stay in this process
+            job = await job_queue.submit(IMPORT_BUILDING_JOB, {"plan": plan},
+                                         entity_uuid=entity_uuid, created_by=user_uuid, local=True)
+            return accepted_response(job, f"Building import queued as job {job['job_id']}")
+
+        result = await execute_import(plan)
+
+        return {
+            "status": "success",
+            "message": "Building imported successfully",
+            "data": result,
+        }
+
+    except BundleError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"message": str(e), "errors": e.errors},
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error importing building: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import building: {str(e)}"
+        )
+
+
+async def _import_building_job(payload: dict) -> dict:
+    return await execute_import(payload["plan"])
+
+
+IMPORT_BUILDING_JOB = "building.import"
+job_queue.register(IMPORT_BUILDING_JOB, _import_building_job)
@@ -179,6 +179,7 @@ from src.datamodel.database.domain.DigitalSignage import Building
 from src.datamodel.datavalidation.apiconfig import ApiConfig
 from src.core.middleware.token_validate_middleware import validate_token
 from src.core.database.dbs.getdb import postresql as db
+from src.common.cache import invalidate_tags, BUILDINGS, entity_list_tag
 
 
 logger = logging.getLogger(__name__)
@@ -264,6 +265,7 @@ async def main(
 
         # Save to database
         await new_building.insert()
+        await invalidate_tags(entity_list_tag(BUILDINGS, new_building.entity_uuid))
         
         logger.info(f"Building created successfully: {new_building.building_id}")
 
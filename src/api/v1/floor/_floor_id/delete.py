@@ -3,11 +3,13 @@ from pydantic import BaseModel
 from typing import Optional
 import time
 import logging
-from src.datamodel.database.domain.DigitalSignage import Floor, Location, Building
+from src.datamodel.database.domain.DigitalSignage import Floor
 from src.datamodel.datavalidation.apiconfig import ApiConfig
 from src.core.middleware.token_validate_middleware import validate_token
 from src.core.database.dbs.getdb import postresql as db
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.services import cascade_delete
+from src.services.job_queue import job_queue, accepted_response
 
 
 
@@ -32,6 +34,8 @@ class DeleteResponse(BaseModel):
     deleted_id: str
     delete_type: str
     affected_locations: int
+    affected_connectors: int = 0
+    affected_paths: int = 0
     building_updated: bool
     message: str
 
@@ -40,7 +44,8 @@ async def main(
     request: Request,
     floor_id: str = Path(..., description="Floor ID to delete"),
     hard_delete: Optional[bool] = Query(False, description="Perform hard delete (true) or soft delete (false)"),
-    cascade: Optional[bool] = Query(True, description="Also delete associated locations"),
+    cascade: Optional[bool] = Query(True, description="Also delete associated locations, vertical connectors and paths"),
+    background: Optional[bool] = Query(False, description="Run in the background and return a job id to poll at /v1/job/{job_id}"),
     db: AsyncSession = Depends(db)
 ):
     
@@ -66,58 +71,34 @@ async def main(
                 detail=f"Floor with ID '{floor_id}' not found"
             )
 
-        affected_locations = 0
-        building_updated = False
-
-        # Handle cascade deletion of locations
-        if cascade and floor.locations:
-            locations = await Location.find({
-                "location_id": {"$in": floor.locations},
-                "status": "active"
-            }).to_list()
-            
-            affected_locations = len(locations)
-            
-            # Delete or soft delete locations
-            for location in locations:
-                if hard_delete:
-                    await location.delete()
-                else:
-                    location.status = "deleted"
-                    location.updated_by = None  # Set to current user if available
-                    location.update_on = time.time()
-                    await location.save()
-
-        # Update building's floors list if floor is being hard deleted
-        if hard_delete and floor.building_id:
-            building = await Building.find_one({
-                "building_id": floor.building_id
-            })
-            
-            if building and floor.floor_id in building.floors:
-                building.floors.remove(floor.floor_id)
-                building.updated_by = None  # Set to current user if available
-                building.update_on = time.time()
-                await building.save()
-                building_updated = True
-
-        # Delete or soft delete floor
-        if hard_delete:
-            await floor.delete()
-            delete_type = "hard"
-        else:
-            floor.status = "deleted"
-            floor.updated_by = None  # Set to current user if available
-            floor.update_on = time.time()
-            await floor.save()
-            delete_type = "soft"
-
-        logger.info(f"Floor {delete_type} deleted: {floor_id}, affected locations: {affected_locations}")
+        if background:
+            job = await job_queue.submit(cascade_delete.DELETE_FLOORS_JOB, {
+                "floor_ids": [floor_id],
+                "hard_delete": bool(hard_delete),
+                "cascade": bool(cascade),
+                "updated_by": user_uuid,
+            }, entity_uuid=entity_uuid, created_by=user_uuid)
+            return accepted_response(job, f"Floor delete queued as job {job['job_id']}")
+
+        result = await cascade_delete.delete_floors([floor], hard_delete, cascade, updated_by=user_uuid)
+        await cascade_delete.publish_deletes(result, hard_delete)
+        delete_type = "hard" if hard_delete else "soft"
+        affected_locations = result.count(result.location_ids)
+        affected_connectors = result.count(result.connector_ids)
+        affected_paths = result.count(result.path_ids)
+        building_updated = bool(result.buildings_updated)
+
+        logger.info(
+            f"Floor {delete_type} deleted: {floor_id}, affected locations: {affected_locations}, "
+            f"connectors: {affected_connectors}, paths: {affected_paths}"
+        )
 
         response = DeleteResponse(
             deleted_id=floor_id,
             delete_type=delete_type,
             affected_locations=affected_locations,
+            affected_connectors=affected_connectors,
+            affected_paths=affected_paths,
             building_updated=building_updated,
             message=f"Floor {delete_type} deleted successfully"
         )
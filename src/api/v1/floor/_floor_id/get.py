@@ -140,15 +140,14 @@ from typing import Optional, List
 import logging
 import time
 import asyncio
+import functools
 
-from src.datamodel.database.domain.DigitalSignage import Floor, Location
+from src.datamodel.database.domain.DigitalSignage import Building, Floor, Location
 from src.datamodel.datavalidation.apiconfig import ApiConfig
 
 # Import your existing Redis utilities
-from src.common.redis_utils import (
-    get_cache_fast, 
-    set_cache_background
-)
+from src.common.cache import TwoTierCache, floor_tag
+from src.services.cache_warmer import cache_warmer
 
 logger = logging.getLogger(__name__)
 
@@ -158,8 +157,19 @@ CACHE_TTL = {
     "floor": 3600,         # 1 hour for floor data (very stable)
     "locations": 1800,     # 30 minutes for location data
     "not_found": 300,      # 5 minutes for 404s
+    "stale": 900,          # served while one request refreshes an expired entry
 }
 
+# Memory + Redis; an expired floor is served stale while one worker reloads it
+floor_detail_cache = TwoTierCache(
+    "floor_detail",
+    max_entries=200,
+    max_bytes=16 * 1024 * 1024,
+    ttl=CACHE_TTL["hot_path"],
+    negative_ttl=CACHE_TTL["not_found"],
+    stale_ttl=CACHE_TTL["stale"],
+)
+
 def api_config():
     config = {
         "path": "",
@@ -207,6 +217,99 @@ class FloorDetailResponse(BaseModel):
     class Config:
         allow_population_by_field_name = True
 
+async def load_floor_detail(floor_id: str) -> Optional[dict]:
+    """Response body, as cached; None when the floor does not exist"""
+    try:
+        # Find floor first
+        floor = await Floor.find_one({"floor_id": floor_id})
+
+        if not floor:
+            # Unknown floors are cached as misses
+            return None
+
+        # Get locations in parallel if floor has locations
+        locations = []
+        if hasattr(floor, 'locations') and floor.locations:
+            try:
+                locations = await Location.find({
+                    "location_id": {"$in": floor.locations},
+                    "status": "active"
+                }).to_list()
+            except Exception as e:
+                logger.warning(f"Error fetching locations for floor {floor_id}: {e}")
+                # Continue with empty locations rather than failing
+                locations = []
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"DB query error for floor {floor_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+    # ULTRA-FAST response building (< 2ms)
+
+    # Build location details with minimal overhead
+    location_details = []
+    location_details_append = location_details.append  # Cache the append method
+
+    for location in locations:
+        try:
+            # Handle enum values safely and efficiently
+            category_val = getattr(location.category, 'value', str(location.category))
+            shape_val = getattr(location.shape, 'value', str(location.shape))
+
+            location_detail = LocationDetailResponse(
+                location_id=location.location_id,
+                name=location.name,
+                category=category_val,
+                shape=shape_val,
+                x=location.x,
+                y=location.y,
+                width=getattr(location, 'width', None),
+                height=getattr(location, 'height', None),
+                radius=getattr(location, 'radius', None),
+                logo_url=getattr(location, 'logo_url', None),
+                description=getattr(location, 'description', None),
+                status=location.status
+            )
+            location_details_append(location_detail)
+        except Exception as e:
+            logger.warning(f"Skipping location {getattr(location, 'location_id', 'unknown')}: {e}")
+            continue
+
+    # Build floor response with safe attribute access
+    try:
+        response = FloorDetailResponse(
+            floor_id=floor.floor_id,
+            name=floor.name,
+            building_id=getattr(floor, 'building_id', None),
+            floor_number=getattr(floor, 'floor_number', 0),
+            floor_plan_url=getattr(floor, 'floor_plan_url', None),
+            locations=location_details,
+            description=getattr(floor, 'description', None),
+            created_by=getattr(floor, 'created_by', None),
+            datetime=floor.datetime,
+            updated_by=getattr(floor, 'updated_by', None),
+            update_on=getattr(floor, 'update_on', None),
+            status=floor.status
+        )
+    except Exception as e:
+        logger.error(f"Error creating FloorDetailResponse: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error processing floor data"
+        )
+
+    # Build final result
+    final_result = {
+        "status": "success",
+        "message": "Floor retrieved successfully",
+        "data": response.dict()  # Convert to dict for caching
+    }
+
+    return final_result
+
 def _ultra_fast_cache_key(floor_id: str) -> str:
     """Ultra-fast cache key generation - minimal overhead"""
     return f"floor_detail_v2:{floor_id}"
@@ -220,132 +323,38 @@ async def main(
         # STEP 1: ULTRA-FAST cache key generation (< 0.1ms)
         cache_key = _ultra_fast_cache_key(floor_id)
         
-        # STEP 2: PRIMARY HOT PATH - Complete result cache check (< 5ms)
-        cache_check_start = time.perf_counter()
-        cached_result = await get_cache_fast(cache_key)
-        cache_check_time = time.perf_counter() - cache_check_start
-        
-        if cached_result is not None:
-            total_time = time.perf_counter() - start_time
-            logger.info(f"ULTRA-FAST FLOOR: Cache={cache_check_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [CACHE HIT]")
-            return cached_result
-
-        # STEP 3: Cache miss - Maximum speed DB operations
-        logger.warning(f"Cache miss for floor: {floor_id}")
-        db_start = time.perf_counter()
-        
-        try:
-            # Find floor first
-            floor = await Floor.find_one({"floor_id": floor_id})
-            
-            if not floor:
-                # Fast 404 handling with caching
-                not_found_result = {
-                    "status": "error",
-                    "message": f"Floor with ID '{floor_id}' not found",
-                    "data": None
-                }
-                asyncio.create_task(
-                    set_cache_background(cache_key, not_found_result, expire=CACHE_TTL["not_found"])
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Floor with ID '{floor_id}' not found"
-                )
-
-            # Get locations in parallel if floor has locations
-            locations = []
-            if hasattr(floor, 'locations') and floor.locations:
-                try:
-                    locations = await Location.find({
-                        "location_id": {"$in": floor.locations},
-                        "status": "active"
-                    }).to_list()
-                except Exception as e:
-                    logger.warning(f"Error fetching locations for floor {floor_id}: {e}")
-                    # Continue with empty locations rather than failing
-                    locations = []
-                    
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"DB query error for floor {floor_id}: {e}")
-            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-        
-        db_time = time.perf_counter() - db_start
-
-        # STEP 4: ULTRA-FAST response building (< 2ms)
-        response_build_start = time.perf_counter()
-        
-        # Build location details with minimal overhead
-        location_details = []
-        location_details_append = location_details.append  # Cache the append method
-        
-        for location in locations:
-            try:
-                # Handle enum values safely and efficiently
-                category_val = getattr(location.category, 'value', str(location.category))
-                shape_val = getattr(location.shape, 'value', str(location.shape))
-                
-                location_detail = LocationDetailResponse(
-                    location_id=location.location_id,
-                    name=location.name,
-                    category=category_val,
-                    shape=shape_val,
-                    x=location.x,
-                    y=location.y,
-                    width=getattr(location, 'width', None),
-                    height=getattr(location, 'height', None),
-                    radius=getattr(location, 'radius', None),
-                    logo_url=getattr(location, 'logo_url', None),
-                    description=getattr(location, 'description', None),
-                    status=location.status
-                )
-                location_details_append(location_detail)
-            except Exception as e:
-                logger.warning(f"Skipping location {getattr(location, 'location_id', 'unknown')}: {e}")
-                continue
+        db_time = None
+        location_count = 0
+
+        async def load_floor():
+            nonlocal db_time, location_count
+            # STEP 3: Cache miss - Maximum speed DB operations
+            logger.warning(f"Cache miss for floor: {floor_id}")
+            db_start = time.perf_counter()
+            final_result = await load_floor_detail(floor_id)
+            db_time = time.perf_counter() - db_start
+            if final_result is not None:
+                location_count = len(final_result["data"]["locations"])
+            return final_result
+
+        # STEP 2: Memory -> Redis -> database. Concurrent misses share one query
+        # (across workers too), and an expired result is served while it refreshes
+        final_result, cache_source = await floor_detail_cache.get_or_load(
+            cache_key, load_floor, tags=[floor_tag(floor_id)]
+        )
 
-        # Build floor response with safe attribute access
-        try:
-            response = FloorDetailResponse(
-                floor_id=floor.floor_id,
-                name=floor.name,
-                building_id=getattr(floor, 'building_id', None),
-                floor_number=getattr(floor, 'floor_number', 0),
-                floor_plan_url=getattr(floor, 'floor_plan_url', None),
-                locations=location_details,
-                description=getattr(floor, 'description', None),
-                created_by=getattr(floor, 'created_by', None),
-                datetime=floor.datetime,
-                updated_by=getattr(floor, 'updated_by', None),
-                update_on=getattr(floor, 'update_on', None),
-                status=floor.status
-            )
-        except Exception as e:
-            logger.error(f"Error creating FloorDetailResponse: {e}")
+        if final_result is None:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error processing floor data"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Floor with ID '{floor_id}' not found"
             )
-
-        # Build final result
-        final_result = {
-            "status": "success",
-            "message": "Floor retrieved successfully",
-            "data": response.dict()  # Convert to dict for caching
-        }
-        
-        response_build_time = time.perf_counter() - response_build_start
-        
-        # STEP 5: Background caching (non-blocking)
-        asyncio.create_task(
-            set_cache_background(cache_key, final_result, expire=CACHE_TTL["hot_path"])
-        )
         
         # Performance logging
         total_time = time.perf_counter() - start_time
-        logger.info(f"FLOOR PERFORMANCE: DB={db_time*1000:.1f}ms, Response={response_build_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [MISS] - {len(location_details)} locations")
+        if db_time is not None:
+            logger.info(f"FLOOR PERFORMANCE: DB={db_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [MISS] - {location_count} locations")
+        else:
+            logger.info(f"ULTRA-FAST FLOOR: Total={total_time*1000:.1f}ms [CACHE {cache_source}]")
         
         return final_result
 
@@ -357,4 +366,16 @@ async def main(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve floor: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+async def warm_floor_details(building: Building, floor_ids: List[str]):
+    """Pre-warm the detail response of every floor"""
+    def warm(floor_id: str):
+        return floor_detail_cache.get_or_load(
+            _ultra_fast_cache_key(floor_id), lambda: load_floor_detail(floor_id), tags=[floor_tag(floor_id)]
+        )
+
+    await cache_warmer.run_bounded(functools.partial(warm, floor_id) for floor_id in floor_ids)
+
+cache_warmer.register("floor_detail", warm_floor_details)
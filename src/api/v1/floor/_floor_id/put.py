@@ -7,6 +7,8 @@ from src.datamodel.database.domain.DigitalSignage import Floor, Building, Locati
 from src.datamodel.datavalidation.apiconfig import ApiConfig
 from src.core.middleware.token_validate_middleware import validate_token
 from src.core.database.dbs.getdb import postresql as db
+from src.common.cache import invalidate_tags, FLOORS, building_tag, floor_tag, entity_list_tag
+from src.services import change_log
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -210,6 +212,12 @@ async def main(
 
         # Save to database
         await existing_floor.save()
+        await invalidate_tags(
+            entity_list_tag(FLOORS, existing_floor.entity_uuid), floor_tag(floor_id),
+            *(building_tag(b) for b in {old_building_id, new_building_id} if b)
+        )
+        for b in {old_building_id, new_building_id}:
+            await change_log.record_changes(b, change_log.FLOOR, upserts=[floor_id])
         
         logger.info(f"Floor updated successfully: {floor_id}")
 
@@ -172,10 +172,8 @@ from src.core.database.dbs.getdb import postresql as db
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import your existing Redis utilities
-from src.common.redis_utils import (
-    get_cache_fast, 
-    set_cache_background
-)
+from src.common.cache import TwoTierCache, CachedBody, building_tag, floor_tag
+from src.services.cache_warmer import cache_warmer
 
 logger = logging.getLogger(__name__)
 
@@ -185,8 +183,19 @@ CACHE_TTL = {
     "building": 3600,      # 1 hour for building data (very stable)
     "floors": 1800,        # 30 minutes for floor data
     "not_found": 300,      # 5 minutes for 404s (prevent DB hammering)
+    "stale": 600,          # served while one request refreshes an expired entry
 }
 
+# Memory + Redis; expired lists are served stale while one worker reloads them
+floors_cache = TwoTierCache(
+    "floors_by_building",
+    max_entries=200,
+    max_bytes=16 * 1024 * 1024,
+    ttl=CACHE_TTL["hot_path"],
+    negative_ttl=CACHE_TTL["not_found"],
+    stale_ttl=CACHE_TTL["stale"],
+)
+
 def api_config():
     config = {
         "path": "",
@@ -226,12 +235,99 @@ class BuildingFloorsResponse(BaseModel):
     class Config:
         allow_population_by_field_name = True
 
+async def load_building_floors(building_id: str, entity_uuid: str, status_filter: Optional[str],
+                               include_locations_count: bool, limit: Optional[int], skip: int) -> Optional[CachedBody]:
+    """Encoded response body for one query, as cached; None when the building does not exist"""
+    # Single optimized query - get building and floors together
+    try:
+        # Parallel DB queries for maximum speed
+        building_task = Building.find_one({
+            "building_id": building_id,
+            "entity_uuid": entity_uuid
+        })
+
+        # Build floors query
+        floor_filter = {"building_id": building_id}
+        if status_filter and status_filter != "all":
+            floor_filter["status"] = status_filter
+
+        floors_query = Floor.find(floor_filter).sort("floor_number")
+        if skip:
+            floors_query = floors_query.skip(skip)
+        if limit:
+            floors_query = floors_query.limit(limit)
+        floors_task = floors_query.to_list()
+
+        # Execute both queries in parallel
+        building, floors = await asyncio.gather(building_task, floors_task, return_exceptions=True)
+
+        # Handle exceptions from parallel execution
+        if isinstance(building, Exception):
+            raise building
+        if isinstance(floors, Exception):
+            raise floors
+
+    except Exception as e:
+        logger.error(f"DB query error: {e}")
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+    # Unknown buildings are cached as misses to prevent repeated queries
+    if not building:
+        return None
+
+    # Pre-allocate list for speed
+    floor_list = []
+    floor_list_append = floor_list.append  # Cache the append method
+
+    # Optimized floor processing - minimal attribute access
+    for floor in floors:
+        # Use direct attribute access with fallbacks - faster than getattr
+        try:
+            locations_count = len(floor.locations) if (include_locations_count and hasattr(floor, 'locations') and floor.locations) else 0
+
+            # Create response object with minimal overhead
+            floor_response = FloorResponse(
+                floor_id=floor.floor_id,
+                name=floor.name,
+                building_id=floor.building_id,
+                floor_number=getattr(floor, 'floor_number', 0),
+                floor_plan_url=getattr(floor, 'floor_plan_url', None),
+                locations_count=locations_count,
+                description=getattr(floor, 'description', None),
+                entity_uuid=getattr(floor, 'entity_uuid', None),
+                datetime=floor.datetime,
+                updated_by=getattr(floor, 'updated_by', None),
+                update_on=getattr(floor, 'update_on', None),
+                status=floor.status
+            )
+            floor_list_append(floor_response)
+        except Exception as e:
+            # Log but continue - don't let one bad record break everything
+            logger.warning(f"Skipping floor {getattr(floor, 'floor_id', 'unknown')}: {e}")
+            continue
+
+    # Build final response
+    response_data = BuildingFloorsResponse(
+        building_id=building.building_id,
+        building_name=building.name,
+        total_floors=len(floor_list),
+        floors=floor_list
+    )
+
+    # Location counts go stale on location writes, which drop their floor's tag
+    return CachedBody.encode({
+        "status": "success",
+        "message": f"Retrieved {len(floor_list)} floors for building '{building.name}'",
+        "data": response_data.dict()
+    }, tags=[floor_tag(floor.floor_id) for floor in floors] if include_locations_count else ())
+
 def _ultra_fast_cache_key(building_id: str, entity_uuid: str, status_filter: str, 
                          include_locations: bool, limit: Optional[int], skip: int) -> str:
     """Ultra-fast cache key generation - minimal overhead"""
     # Use simple string concatenation instead of JSON serialization for speed
     key_parts = [
-        "floors_v2",  # Version prefix for cache busting if needed
+        "floors_v3",  # Version prefix for cache busting if needed
         building_id,
         entity_uuid[:8],  # Only first 8 chars of entity_uuid for brevity
         status_filter or "active",
@@ -241,6 +337,10 @@ def _ultra_fast_cache_key(building_id: str, entity_uuid: str, status_filter: str
     ]
     return ":".join(key_parts)
 
+def _cache_tags(building_id: str) -> List[str]:
+    # Floor writes drop the building's tag; location counts add the listed floors' tags when loaded
+    return [building_tag(building_id)]
+
 async def main(
     request: Request,
     building_id: str = Path(..., description="Building ID to get floors for"),
@@ -265,130 +365,37 @@ async def main(
             building_id, entity_uuid, status_filter, 
             include_locations_count, limit, skip
         )
+        cache_tags = _cache_tags(building_id)
         
-        # STEP 2: PRIMARY HOT PATH - Complete result cache check (< 5ms)
-        cache_check_start = time.perf_counter()
-        cached_result = await get_cache_fast(cache_key)
-        cache_check_time = time.perf_counter() - cache_check_start
-        
-        if cached_result is not None:
-            total_time = time.perf_counter() - start_time
-            logger.info(f"ULTRA-FAST: Token={validate_token_time*1000:.1f}ms, Cache={cache_check_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [CACHE HIT]")
-            return cached_result
-
-        # STEP 3: Cache miss - Fast DB operations with minimal processing
-        logger.warning(f"Cache miss for key: {cache_key}")
-        db_start = time.perf_counter()
-        
-        # Single optimized query - get building and floors together
-        try:
-            # Parallel DB queries for maximum speed
-            building_task = Building.find_one({
-                "building_id": building_id,
-                "entity_uuid": entity_uuid
-            })
-            
-            # Build floors query
-            floor_filter = {"building_id": building_id}
-            if status_filter and status_filter != "all":
-                floor_filter["status"] = status_filter
-                
-            floors_query = Floor.find(floor_filter).sort("floor_number")
-            if skip:
-                floors_query = floors_query.skip(skip)
-            if limit:
-                floors_query = floors_query.limit(limit)
-            floors_task = floors_query.to_list()
-            
-            # Execute both queries in parallel
-            building, floors = await asyncio.gather(building_task, floors_task, return_exceptions=True)
-            
-            # Handle exceptions from parallel execution
-            if isinstance(building, Exception):
-                raise building
-            if isinstance(floors, Exception):
-                raise floors
-                
-        except Exception as e:
-            logger.error(f"DB query error: {e}")
-            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-        
-        db_time = time.perf_counter() - db_start
-        
-        # Fast 404 handling
-        if not building:
-            not_found_result = {
-                "status": "error",
-                "message": f"Building with ID '{building_id}' not found",
-                "data": None
-            }
-            # Cache 404s to prevent repeated queries
-            asyncio.create_task(
-                set_cache_background(cache_key, not_found_result, expire=CACHE_TTL["not_found"])
+        db_time = None
+
+        async def load_floors():
+            nonlocal db_time
+            # Cache miss - Fast DB operations with minimal processing
+            logger.warning(f"Cache miss for key: {cache_key}")
+            db_start = time.perf_counter()
+            final_result = await load_building_floors(
+                building_id, entity_uuid, status_filter, include_locations_count, limit, skip
             )
-            raise HTTPException(status_code=404, detail=f"Building with ID '{building_id}' not found")
+            db_time = time.perf_counter() - db_start
+            return final_result
 
-        # STEP 4: ULTRA-FAST response building (< 2ms)
-        response_build_start = time.perf_counter()
-        
-        # Pre-allocate list for speed
-        floor_list = []
-        floor_list_append = floor_list.append  # Cache the append method
-        
-        # Optimized floor processing - minimal attribute access
-        for floor in floors:
-            # Use direct attribute access with fallbacks - faster than getattr
-            try:
-                locations_count = len(floor.locations) if (include_locations_count and hasattr(floor, 'locations') and floor.locations) else 0
-                
-                # Create response object with minimal overhead
-                floor_response = FloorResponse(
-                    floor_id=floor.floor_id,
-                    name=floor.name,
-                    building_id=floor.building_id,
-                    floor_number=getattr(floor, 'floor_number', 0),
-                    floor_plan_url=getattr(floor, 'floor_plan_url', None),
-                    locations_count=locations_count,
-                    description=getattr(floor, 'description', None),
-                    entity_uuid=getattr(floor, 'entity_uuid', None),
-                    datetime=floor.datetime,
-                    updated_by=getattr(floor, 'updated_by', None),
-                    update_on=getattr(floor, 'update_on', None),
-                    status=floor.status
-                )
-                floor_list_append(floor_response)
-            except Exception as e:
-                # Log but continue - don't let one bad record break everything
-                logger.warning(f"Skipping floor {getattr(floor, 'floor_id', 'unknown')}: {e}")
-                continue
-
-        # Build final response
-        response_data = BuildingFloorsResponse(
-            building_id=building.building_id,
-            building_name=building.name,
-            total_floors=len(floor_list),
-            floors=floor_list
-        )
-        
-        final_result = {
-            "status": "success",
-            "message": f"Retrieved {len(floor_list)} floors for building '{building.name}'",
-            "data": response_data.dict()
-        }
-        
-        response_build_time = time.perf_counter() - response_build_start
-        
-        # STEP 5: Background caching (non-blocking)
-        # Fire-and-forget caching to avoid blocking the response
-        asyncio.create_task(
-            set_cache_background(cache_key, final_result, expire=CACHE_TTL["hot_path"])
-        )
+        # STEP 2: Memory -> Redis -> database. Concurrent misses share one query
+        # (across workers too), and an expired result is served while it refreshes
+        body, cache_source = await floors_cache.get_or_load(cache_key, load_floors, tags=cache_tags)
+
+        if body is None:
+            raise HTTPException(status_code=404, detail=f"Building with ID '{building_id}' not found")
         
         # Performance logging
         total_time = time.perf_counter() - start_time
-        logger.info(f"PERFORMANCE: Token={validate_token_time*1000:.1f}ms, DB={db_time*1000:.1f}ms, Response={response_build_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [CACHE MISS]")
+        if db_time is not None:
+            logger.info(f"PERFORMANCE: Token={validate_token_time*1000:.1f}ms, DB={db_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [CACHE MISS]")
+        else:
+            logger.info(f"ULTRA-FAST: Token={validate_token_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [CACHE {cache_source}]")
         
-        return final_result
+        # Kiosks poll this list: an unchanged one answers 304 against their ETag
+        return body.response(request, {"X-Cache": cache_source, "Cache-Control": "private, no-cache"})
 
     except HTTPException:
         raise
@@ -398,4 +405,20 @@ async def main(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve floors for building: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+async def warm_building_floors(building: Building, floor_ids: List[str]):
+    """Pre-warm the default floor list (active floors with location counts)"""
+    if not building.entity_uuid:
+        return
+    cache_key = _ultra_fast_cache_key(building.building_id, building.entity_uuid, "active", True, None, 0)
+    await cache_warmer.run_bounded([
+        lambda: floors_cache.get_or_load(
+            cache_key,
+            lambda: load_building_floors(building.building_id, building.entity_uuid, "active", True, None, 0),
+            tags=_cache_tags(building.building_id)
+        )
+    ])
+
+cache_warmer.register("floors_by_building", warm_building_floors)
@@ -1,10 +1,12 @@
-from fastapi import HTTPException, Query, status
+from fastapi import HTTPException, Query, status, Request
 from pydantic import BaseModel, Field
 from typing import List, Optional
-import time
 import logging
-from src.datamodel.database.domain.DigitalSignage import Floor, Location, Building
+from src.datamodel.database.domain.DigitalSignage import Floor
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.core.middleware.token_validate_middleware import validate_token
+from src.services import cascade_delete
+from src.services.job_queue import job_queue, accepted_response
 
 
 logger = logging.getLogger(__name__)
@@ -33,14 +35,18 @@ class BulkDeleteResponse(BaseModel):
     failed_deletions: List[str]
     delete_type: str
     total_affected_locations: int
+    total_affected_connectors: int = 0
+    total_affected_paths: int = 0
     buildings_updated: List[str]
     message: str
 
 
 async def main(
+    request: Request,
     delete_data: BulkDeleteRequest,
     hard_delete: Optional[bool] = Query(False, description="Perform hard delete (true) or soft delete (false)"),
-    cascade: Optional[bool] = Query(True, description="Also delete associated locations")
+    cascade: Optional[bool] = Query(True, description="Also delete associated locations, vertical connectors and paths"),
+    background: Optional[bool] = Query(False, description="Run in the background and return a job id to poll at /v1/job/{job_id}")
 ):
     try:
         if not delete_data.floor_ids:
@@ -49,76 +55,30 @@ async def main(
                 detail="No floor IDs provided for deletion"
             )
 
-        deleted_floors = []
-        failed_deletions = []
-        total_affected_locations = 0
-        buildings_updated = []
-
-        for floor_id in delete_data.floor_ids:
-            try:
-                # Find floor by ID
-                floor = await Floor.find_one({
-                    "floor_id": floor_id
-                })
-                
-                if not floor:
-                    failed_deletions.append(floor_id)
-                    logger.warning(f"Floor not found: {floor_id}")
-                    continue
-
-                affected_locations = 0
-
-                # Handle cascade deletion of locations
-                if cascade and floor.locations:
-                    locations = await Location.find({
-                        "location_id": {"$in": floor.locations},
-                        "status": "active"
-                    }).to_list()
-                    
-                    affected_locations = len(locations)
-                    
-                    # Delete locations
-                    for location in locations:
-                        if hard_delete:
-                            await location.delete()
-                        else:
-                            location.status = "deleted"
-                            location.updated_by = None  # Set to current user if available
-                            location.update_on = time.time()
-                            await location.save()
-
-                # Update building's floors list if floor is being hard deleted
-                if hard_delete and floor.building_id:
-                    building = await Building.find_one({
-                        "building_id": floor.building_id
-                    })
-                    
-                    if building and floor.floor_id in building.floors:
-                        building.floors.remove(floor.floor_id)
-                        building.updated_by = None  # Set to current user if available
-                        building.update_on = time.time()
-                        await building.save()
-                        
-                        if floor.building_id not in buildings_updated:
-                            buildings_updated.append(floor.building_id)
-
-                # Delete floor
-                if hard_delete:
-                    await floor.delete()
-                else:
-                    floor.status = "deleted"
-                    floor.updated_by = None  # Set to current user if available
-                    floor.update_on = time.time()
-                    await floor.save()
-
-                deleted_floors.append(floor_id)
-                total_affected_locations += affected_locations
-
-                logger.info(f"Successfully deleted floor: {floor_id}")
-
-            except Exception as e:
-                logger.error(f"Failed to delete floor {floor_id}: {str(e)}")
-                failed_deletions.append(floor_id)
+        floor_ids = list(dict.fromkeys(delete_data.floor_ids))
+        if background:
+            # A queued job is only visible to its owner, so it needs a token
+            validate_token(request)
+            job = await job_queue.submit(cascade_delete.DELETE_FLOORS_JOB, {
+                "floor_ids": floor_ids,
+                "hard_delete": bool(hard_delete),
+                "cascade": bool(cascade),
+                "updated_by": request.state.user_uuid,
+            }, entity_uuid=request.state.entity_uuid, created_by=request.state.user_uuid)
+            return accepted_response(job, f"Bulk floor delete queued as job {job['job_id']}")
+
+        floors = await Floor.find({"floor_id": {"$in": floor_ids}}).to_list()
+        found = {floor.floor_id for floor in floors}
+        failed_deletions = [floor_id for floor_id in floor_ids if floor_id not in found]
+        for floor_id in failed_deletions:
+            logger.warning(f"Floor not found: {floor_id}")
+
+        # One set-based pass over every floor instead of a delete/save per document
+        result = await cascade_delete.delete_floors(floors, hard_delete, cascade)
+        await cascade_delete.publish_deletes(result, hard_delete)
+        deleted_floors = [floor_id for floor_id in floor_ids if floor_id in found]
+        total_affected_locations = result.count(result.location_ids)
+        buildings_updated = result.buildings_updated
 
         delete_type = "hard" if hard_delete else "soft"
         
@@ -129,12 +89,14 @@ async def main(
             failed_deletions=failed_deletions,
             delete_type=delete_type,
             total_affected_locations=total_affected_locations,
+            total_affected_connectors=result.count(result.connector_ids),
+            total_affected_paths=result.count(result.path_ids),
             buildings_updated=buildings_updated,
             message=f"Bulk {delete_type} delete completed. Deleted: {len(deleted_floors)}, Failed: {len(failed_deletions)}"
         )
 
         # Determine response status based on results
-        if len(deleted_floors) == len(delete_data.floor_ids):
+        if len(deleted_floors) == len(floor_ids):
             status_message = "All floors deleted successfully"
         elif len(deleted_floors) > 0:
             status_message = "Partial deletion completed"
@@ -126,13 +126,11 @@
 
 
 from fastapi import HTTPException, Query, status, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List
 import logging
-import hashlib
-import json
 import time
-import asyncio
 
 from src.datamodel.database.domain.DigitalSignage import Floor
 from src.datamodel.datavalidation.apiconfig import ApiConfig
@@ -140,11 +138,8 @@ from src.core.middleware.token_validate_middleware import validate_token
 from src.core.database.dbs.getdb import postresql as db
 from sqlalchemy.ext.asyncio import AsyncSession
 
-# Import your existing Redis utilities
-from src.common.redis_utils import (
-    get_cache_fast, 
-    set_cache_background
-)
+from src.common.cache import TwoTierCache, CachedBody, FLOORS, building_tag, floor_tag, entity_list_tag, query_key
+from src.common.streaming import STREAM_ITEMS, STREAM_COUNT, streaming_json_response
 
 logger = logging.getLogger(__name__)
 
@@ -155,6 +150,15 @@ CACHE_TTL = {
     "not_found": 300,      # 5 minutes for empty results
 }
 
+# Memory + Redis; an empty list is remembered as a negative result for CACHE_TTL["not_found"]
+floor_list_cache = TwoTierCache(
+    "floor_list",
+    max_entries=200,
+    max_bytes=16 * 1024 * 1024,
+    ttl=CACHE_TTL["hot_path"],
+    negative_ttl=CACHE_TTL["not_found"],
+)
+
 def api_config():
     config = {
         "path": "",
@@ -187,18 +191,101 @@ class FloorResponse(BaseModel):
 
 def _ultra_fast_cache_key(entity_uuid: str, building_id: Optional[str], status_filter: str, 
                          name: Optional[str], limit: Optional[int], skip: int) -> str:
-    """Ultra-fast cache key generation with minimal overhead"""
-    # Use simple string concatenation for maximum speed
-    key_parts = [
-        "floors_list_v2",  # Version prefix
-        entity_uuid[:8],   # First 8 chars of entity_uuid for brevity
-        building_id or "all",
-        status_filter or "active",
-        name or "all",
-        str(limit or "all"),
-        str(skip)
-    ]
-    return ":".join(key_parts)
+    """Cache key for one floor list query, keyed by the full parameters"""
+    # v3 entries hold pre-encoded bodies
+    return query_key("floors_list_v3", entity_uuid, building_id, status_filter, name, limit, skip)
+
+def _cache_tags(entity_uuid: str, building_id: Optional[str]) -> List[str]:
+    # Floor writes drop their building's tag and the entity's floor list tag
+    return [building_tag(building_id) if building_id else entity_list_tag(FLOORS, entity_uuid)]
+
+def _build_floor_query(entity_uuid: str, building_id: Optional[str], status_filter: Optional[str],
+                       name: Optional[str], limit: Optional[int], skip: int):
+    """Filtered, sorted and paginated Floor query (not yet executed)"""
+    # Build query filter
+    query_filter = {"entity_uuid": entity_uuid}  # Filter by entity UUID
+    
+    if building_id:
+        query_filter["building_id"] = building_id
+        
+    if status_filter and status_filter != "all":
+        query_filter["status"] = status_filter
+    
+    if name:
+        query_filter["name"] = {"$regex": name, "$options": "i"}  # Case-insensitive partial match
+
+    # Execute optimized query with pagination
+    query = Floor.find(query_filter).sort("floor_number")  # Sort by floor number
+    
+    if skip:
+        query = query.skip(skip)
+    if limit:
+        query = query.limit(limit)
+    return query
+
+def _floor_response(floor) -> Optional[FloorResponse]:
+    try:
+        return FloorResponse(
+            floor_id=floor.floor_id,
+            name=floor.name,
+            building_id=getattr(floor, 'building_id', None),
+            floor_number=getattr(floor, 'floor_number', 0),
+            floor_plan_url=getattr(floor, 'floor_plan_url', None),
+            locations=getattr(floor, 'locations', []) or [],
+            description=getattr(floor, 'description', None),
+            entity_uuid=getattr(floor, 'entity_uuid', None),
+            datetime=floor.datetime,
+            updated_by=getattr(floor, 'updated_by', None),
+            update_on=getattr(floor, 'update_on', None),
+            status=floor.status
+        )
+    except Exception as e:
+        logger.warning(f"Skipping floor {getattr(floor, 'floor_id', 'unknown')}: {e}")
+        return None
+
+def _list_body(floor_list: List[dict]) -> CachedBody:
+    # Each floor lists its location ids, which location writes change (dropping the floor's tag)
+    return CachedBody.encode({
+        "status": "success",
+        "message": f"Retrieved {len(floor_list)} floors",
+        "data": floor_list,
+        "total": len(floor_list)
+    }, tags=[floor_tag(floor["floor_id"]) for floor in floor_list])
+
+async def load_floor_list(entity_uuid: str, building_id: Optional[str], status_filter: Optional[str],
+                          name: Optional[str], limit: Optional[int], skip: int) -> Optional[CachedBody]:
+    """Response body for one query, encoded once; None when no floor matches"""
+    try:
+        query = _build_floor_query(entity_uuid, building_id, status_filter, name, limit, skip)
+        floors = await query.to_list()
+    except Exception as e:
+        logger.error(f"DB query error: {e}")
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    floor_list = []
+    for floor in floors:
+        floor_response = _floor_response(floor)
+        if floor_response is not None:
+            floor_list.append(floor_response.dict())
+    if not floor_list:
+        return None
+    return _list_body(floor_list)
+
+def _stream_floors(query) -> StreamingResponse:
+    """Same body as the cached list, encoded floor by floor off the cursor"""
+    async def items():
+        async for floor in query:
+            floor_response = _floor_response(floor)
+            if floor_response is not None:
+                yield floor_response.dict()
+
+    template = {
+        "status": "success",
+        "message": "Retrieved floors",
+        "data": STREAM_ITEMS,
+        "total": STREAM_COUNT
+    }
+    return streaming_json_response(template, items(), headers={"X-Cache": "BYPASS"})
 
 async def main(
     request: Request,    
@@ -207,6 +294,7 @@ async def main(
     name: Optional[str] = Query(None, description="Filter by floor name (partial match)"),
     limit: Optional[int] = Query(None, description="Limit number of results"),
     skip: Optional[int] = Query(0, description="Skip number of results for pagination"),
+    stream: bool = Query(False, description="Stream floors as they are read (uncached, flat memory for large lists)"),
     db: AsyncSession = Depends(db)
 ):
     start_time = time.perf_counter()
@@ -218,110 +306,40 @@ async def main(
     user_uuid = request.state.user_uuid
     validate_token_time = time.perf_counter() - validate_token_start
 
+    if stream:
+        return _stream_floors(_build_floor_query(entity_uuid, building_id, status_filter, name, limit, skip))
+
     try:
-        # STEP 1: ULTRA-FAST cache key generation (< 0.5ms)
         cache_key = _ultra_fast_cache_key(
             entity_uuid, building_id, status_filter, name, limit, skip
         )
-        
-        # STEP 2: PRIMARY HOT PATH - Complete result cache check (< 5ms)
-        cache_check_start = time.perf_counter()
-        cached_result = await get_cache_fast(cache_key)
-        cache_check_time = time.perf_counter() - cache_check_start
-        
-        if cached_result is not None:
-            total_time = time.perf_counter() - start_time
-            logger.info(f"ULTRA-FAST FLOORS LIST: Token={validate_token_time*1000:.1f}ms, Cache={cache_check_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [CACHE HIT]")
-            return cached_result
-
-        # STEP 3: Cache miss - Fast DB operations
-        logger.warning(f"Cache miss for floors list: {cache_key}")
-        db_start = time.perf_counter()
-        
-        try:
-            # Build query filter
-            query_filter = {"entity_uuid": entity_uuid}  # Filter by entity UUID
-            
-            if building_id:
-                query_filter["building_id"] = building_id
-                
-            if status_filter and status_filter != "all":
-                query_filter["status"] = status_filter
-            
-            if name:
-                query_filter["name"] = {"$regex": name, "$options": "i"}  # Case-insensitive partial match
 
-            # Execute optimized query with pagination
-            query = Floor.find(query_filter).sort("floor_number")  # Sort by floor number
-            
-            if skip:
-                query = query.skip(skip)
-            if limit:
-                query = query.limit(limit)
-                
-            floors = await query.to_list()
-            
-        except Exception as e:
-            logger.error(f"DB query error: {e}")
-            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-        
-        db_time = time.perf_counter() - db_start
+        db_time = None
 
-        # STEP 4: ULTRA-FAST response building (< 3ms)
-        response_build_start = time.perf_counter()
-        
-        # Build response with minimal overhead
-        floor_list = []
-        floor_list_append = floor_list.append  # Cache the append method
-        
-        for floor in floors:
-            try:
-                floor_response = FloorResponse(
-                    floor_id=floor.floor_id,
-                    name=floor.name,
-                    building_id=getattr(floor, 'building_id', None),
-                    floor_number=getattr(floor, 'floor_number', 0),
-                    floor_plan_url=getattr(floor, 'floor_plan_url', None),
-                    locations=getattr(floor, 'locations', []) or [],
-                    description=getattr(floor, 'description', None),
-                    entity_uuid=getattr(floor, 'entity_uuid', None),
-                    datetime=floor.datetime,
-                    updated_by=getattr(floor, 'updated_by', None),
-                    update_on=getattr(floor, 'update_on', None),
-                    status=floor.status
-                )
-                floor_list_append(floor_response)
-            except Exception as e:
-                logger.warning(f"Skipping floor {getattr(floor, 'floor_id', 'unknown')}: {e}")
-                continue
-
-        # Build final result
-        final_result = {
-            "status": "success",
-            "message": f"Retrieved {len(floor_list)} floors",
-            "data": [floor.dict() for floor in floor_list],  # Convert to dict for caching
-            "total": len(floor_list)
-        }
-        
-        response_build_time = time.perf_counter() - response_build_start
-        
-        # STEP 5: Background caching (non-blocking)
+        async def load_floors():
+            nonlocal db_time
+            logger.warning(f"Cache miss for floors list: {cache_key}")
+            db_start = time.perf_counter()
+            body = await load_floor_list(entity_uuid, building_id, status_filter, name, limit, skip)
+            db_time = time.perf_counter() - db_start
+            return body
+
+        # Memory -> Redis -> database, concurrent misses share one query
         # Use shorter TTL for user-specific data
         cache_ttl = CACHE_TTL["user_specific"] if entity_uuid else CACHE_TTL["hot_path"]
-        
-        # Cache empty results too, but for shorter duration
-        if len(floor_list) == 0:
-            cache_ttl = CACHE_TTL["not_found"]
-        
-        asyncio.create_task(
-            set_cache_background(cache_key, final_result, expire=cache_ttl)
+        body, cache_source = await floor_list_cache.get_or_load(
+            cache_key, load_floors, ttl=cache_ttl, tags=_cache_tags(entity_uuid, building_id)
         )
-        
-        # Performance logging
+        if body is None:
+            body = _list_body([])
+
         total_time = time.perf_counter() - start_time
-        logger.info(f"FLOORS LIST PERFORMANCE: Token={validate_token_time*1000:.1f}ms, DB={db_time*1000:.1f}ms, Response={response_build_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [MISS] - {len(floor_list)} floors")
-        
-        return final_result
+        if db_time is not None:
+            logger.info(f"FLOORS LIST PERFORMANCE: Token={validate_token_time*1000:.1f}ms, DB={db_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [MISS]")
+        else:
+            logger.info(f"ULTRA-FAST FLOORS LIST: Token={validate_token_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [CACHE {cache_source}]")
+
+        return body.response(request, {"X-Cache": cache_source, "X-Response-Time": f"{total_time*1000:.1f}ms"})
 
     except HTTPException:
         raise
@@ -10,6 +10,11 @@ from src.services.files.backblaze import b2_service
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.middleware.token_validate_middleware import validate_token
 from src.core.database.dbs.getdb import postresql as db
+from src.common.cache import invalidate_tags, FLOORS, building_tag, floor_tag, entity_list_tag
+from src.services import change_log
+from src.services.job_queue import job_queue
+from starlette.datastructures import Headers
+import io
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +71,7 @@ async def main(
     description: Optional[str] = Form(None, description="Description of the floor"),
     is_published: bool = Form(True, description="Whether floor is published"),
     floor_plan: Optional[UploadFile] = File(None, description="Floor plan image file (PNG, JPG, JPEG, GIF)"),
+    background: bool = Form(False, description="Upload the floor plan in the background; poll /v1/job/{job_id} for its URL"),
     db: AsyncSession = Depends(db),
 ):
     # Get entity_uuid from request
@@ -151,7 +157,21 @@ async def main(
         floor_plan_info = None
         
         # Handle floor plan upload if provided - CHANGED TO USE MINIO
-        if floor_plan:
+        if floor_plan and background:
+            # The upload outlives the request, so its bytes are read now; the job stays in this process
+            job = await job_queue.submit(UPLOAD_FLOOR_PLAN_JOB, {
+                "floor_id": new_floor.floor_id,
+                "building_id": building_id,
+                "content": await floor_plan.read(),
+                "filename": floor_plan.filename,
+                "content_type": floor_plan.content_type,
+            }, entity_uuid=entity_uuid, created_by=user_uuid, local=True)
+            floor_plan_info = {
+                "job_id": job["job_id"],
+                "status": job["status"],
+                "message": "Floor created successfully, floor plan upload queued"
+            }
+        elif floor_plan:
             try:
                 # Replace Wasabi service with MinIO service
                 upload_result = await b2_service.upload_floor_plan(
@@ -197,6 +217,9 @@ async def main(
             building.updated_by = None
             building.update_on = time.time()
             await building.save()
+
+        await invalidate_tags(entity_list_tag(FLOORS, new_floor.entity_uuid), building_tag(building_id))
+        await change_log.record_changes(building_id, change_log.FLOOR, upserts=[new_floor.floor_id])
         
         logger.info(f"Floor created successfully: {new_floor.floor_id}")
 
@@ -220,7 +243,9 @@ async def main(
 
         # Create success message based on upload status
         success_message = "Floor created successfully"
-        if floor_plan_url:
+        if floor_plan_info and "job_id" in floor_plan_info:
+            success_message += f" (floor plan upload queued as job {floor_plan_info['job_id']})"
+        elif floor_plan_url:
             success_message += " with floor plan uploaded to MinIO"
         elif floor_plan and floor_plan_info and "upload_error" in floor_plan_info:
             success_message += " (floor plan upload to MinIO failed)"
@@ -239,3 +264,45 @@ async def main(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create floor: {str(e)}"
         )
+
+
+async def upload_floor_plan_job(payload: dict) -> dict:
+    """Upload a floor plan read by a request, then attach its URL to the floor"""
+    floor_id = payload["floor_id"]
+    building_id = payload["building_id"]
+    file = UploadFile(
+        io.BytesIO(payload["content"]),
+        filename=payload["filename"],
+        headers=Headers({"content-type": payload["content_type"] or "application/octet-stream"}),
+    )
+    upload_result = await b2_service.upload_floor_plan(file=file, floor_id=floor_id, building_id=building_id)
+    if not upload_result["success"]:
+        raise RuntimeError(upload_result.get("error", "Upload failed"))
+
+    floor = await Floor.find_one({"floor_id": floor_id})
+    if not floor:
+        raise RuntimeError(f"Floor '{floor_id}' was deleted before its floor plan was uploaded")
+    floor.floor_plan_url = upload_result["file_url"]
+    floor.update_on = time.time()
+    await floor.save()
+
+    await invalidate_tags(entity_list_tag(FLOORS, floor.entity_uuid), floor_tag(floor_id), building_tag(building_id))
+    await change_log.record_changes(building_id, change_log.FLOOR, upserts=[floor_id])
+    logger.info(f"Floor plan uploaded in the background for floor: {floor_id}")
+
+    return {
+        "floor_id": floor_id,
+        "floor_plan_url": upload_result["file_url"],
+        "floor_plan_info": {
+            "filename": upload_result["filename"],
+            "original_filename": upload_result["original_filename"],
+            "file_size": upload_result["file_size"],
+            "dimensions": upload_result.get("dimensions"),
+            "content_type": upload_result["content_type"]
+        },
+    }
+
+
+# Local only: the payload carries the file's bytes
+UPLOAD_FLOOR_PLAN_JOB = "floor.upload_plan"
+job_queue.register(UPLOAD_FLOOR_PLAN_JOB, upload_floor_plan_job)
@@ -0,0 +1,63 @@
+from fastapi import HTTPException, Path, Request, status
+import time
+import logging
+
+from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.core.middleware.token_validate_middleware import validate_token
+from src.services.job_queue import job_queue
+
+logger = logging.getLogger(__name__)
+
+
+def api_config():
+    config = {
+        "path": "",
+        "status_code": 200,
+        "tags": ["Job"],
+        "summary": "Get Job Status",
+        "response_model": dict,
+        "description": (
+            "Status of a background job started by an admin operation called with background=true: "
+            "queued, running, succeeded (with `result`) or failed (with `error`)."
+        ),
+        "response_description": "Job status",
+        "deprecated": False,
+    }
+    return ApiConfig(**config)
+
+
+async def main(
+    request: Request,
+    job_id: str = Path(..., description="Job ID returned when the operation was queued"),
+):
+    validate_token_start = time.time()
+    validate_token(request)
+    entity_uuid = request.state.entity_uuid
+    user_uuid = request.state.user_uuid
+    validate_token_time = time.time() - validate_token_start
+    logger.info(f"PERFORMANCE: Token validation took {validate_token_time:.4f} seconds")
+
+    try:
+        job = await job_queue.get(job_id)
+        # Jobs of another organization read as missing
+        if not job or (job.get("entity_uuid") and job["entity_uuid"] != entity_uuid
+                       and job.get("created_by") != user_uuid):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Job with ID '{job_id}' not found"
+            )
+
+        return {
+            "status": "success",
+            "message": f"Job {job['status']}",
+            "data": job,
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error reading job {job_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to read job: {str(e)}",
+        )
@@ -0,0 +1,50 @@
+from fastapi import HTTPException, Query, Request, status
+import time
+import logging
+
+from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.core.middleware.token_validate_middleware import validate_token
+from src.services.job_queue import job_queue, JOB_HISTORY_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def api_config():
+    config = {
+        "path": "",
+        "status_code": 200,
+        "tags": ["Job"],
+        "summary": "List Recent Jobs",
+        "response_model": dict,
+        "description": "Most recent background jobs of the caller's organization, newest first.",
+        "response_description": "Recent jobs",
+        "deprecated": False,
+    }
+    return ApiConfig(**config)
+
+
+async def main(
+    request: Request,
+    limit: int = Query(20, ge=1, le=JOB_HISTORY_SIZE, description="Maximum number of jobs to return"),
+):
+    validate_token_start = time.time()
+    validate_token(request)
+    entity_uuid = request.state.entity_uuid
+    validate_token_time = time.time() - validate_token_start
+    logger.info(f"PERFORMANCE: Token validation took {validate_token_time:.4f} seconds")
+
+    try:
+        jobs = await job_queue.recent(entity_uuid, limit)
+
+        return {
+            "status": "success",
+            "message": f"Retrieved {len(jobs)} jobs",
+            "data": {"jobs": jobs, "stats": job_queue.stats()},
+        }
+
+    except Exception as e:
+        logger.exception(f"Error listing jobs: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list jobs: {str(e)}",
+        )
@@ -10,6 +10,7 @@ from sqlalchemy.exc import IntegrityError
 from src.core.database.dbs.getdb import postresql as db
 from sqlalchemy.orm import Session
 from src.datamodel.database.domain.DigitalSignage import DailyAnnouncement
+from src.services.push_hub import notify_content
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.services.permit.permit_service import PermitService
 from sqlalchemy import select
@@ -45,6 +46,7 @@ async def delete_event_in_db(id: str):
             raise HTTPException(status_code=404, detail="Doctor not found")
 
         await emergency_service.delete()
+        await notify_content("announcement", id, "delete")
 
         return {"message": "DailyAnnouncement deleted successfully", "event_id": id}
     except Exception as e:
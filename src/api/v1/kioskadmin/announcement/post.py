@@ -5,6 +5,7 @@ import uuid
 from pydantic import BaseModel, Field,EmailStr
 from typing import Optional
 from src.datamodel.database.domain.DigitalSignage import DailyAnnouncement
+from src.services.push_hub import notify_content
 from src.datamodel.datavalidation.apiconfig import ApiConfig
 from src.core.middleware.token_validate_middleware import validate_token
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -58,6 +59,7 @@ async def main(
             display_date=payload.display_date
         )
         await new_exit.insert()
+        await notify_content("announcement", new_exit.id, "create")
 
         logger.info(f"DailyAnnouncement created successfully: {new_exit.id}")
 
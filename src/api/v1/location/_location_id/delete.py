@@ -5,6 +5,9 @@ import time
 import logging
 from src.datamodel.database.domain.DigitalSignage import Location, Floor
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.navigation_service import navigation_service
+from src.common.cache import invalidate_tags, LOCATIONS, location_tag, floor_tag
+from src.services import change_log
 
 
 logger = logging.getLogger(__name__)
@@ -73,6 +76,7 @@ async def main(
         # Delete or soft delete location
         if hard_delete:
             await location.delete()
+            await navigation_service.on_node_removed(location_id, location.floor_id)
             delete_type = "hard"
             logger.info(f"Location hard deleted: {location_id} from floor: {floor_id}")
         else:
@@ -80,9 +84,16 @@ async def main(
             location.updated_by = None  # Set to current user if available
             location.update_on = time.time()
             await location.save()
+            await navigation_service.on_location_saved(location)
             delete_type = "soft"
             logger.info(f"Location soft deleted: {location_id} from floor: {floor_id}")
 
+        await invalidate_tags(LOCATIONS, location_tag(location_id), floor_tag(floor_id) if floor_id else None)
+        if hard_delete:
+            await change_log.record_floor_changes(change_log.LOCATION, deletes=[(location_id, floor_id)])
+        else:
+            await change_log.record_floor_changes(change_log.LOCATION, upserts=[(location_id, floor_id)])
+
         response = DeleteResponse(
             deleted_id=location_id,
             delete_type=delete_type,
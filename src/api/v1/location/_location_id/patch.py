@@ -5,6 +5,9 @@ import time
 import logging
 from src.datamodel.database.domain.DigitalSignage import Location, Floor, ShapeType
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.navigation_service import navigation_service
+from src.common.cache import invalidate_tags, LOCATIONS, location_tag, floor_tag
+from src.services import change_log
 
 
 logger = logging.getLogger(__name__)
@@ -196,6 +199,15 @@ async def main(
 
         # Save to database
         await existing_location.save()
+        await navigation_service.on_location_saved(existing_location)
+        await invalidate_tags(
+            LOCATIONS, location_tag(location_id),
+            floor_tag(existing_location.floor_id), floor_tag(original_floor_id) if original_floor_id else None
+        )
+        # Logged against the original floor too, so a move reaches the old floor's displays
+        await change_log.record_floor_changes(change_log.LOCATION, upserts=[
+            (location_id, existing_location.floor_id), (location_id, original_floor_id)
+        ])
         
         logger.info(f"Location partially updated: {location_id}, fields: {list(update_fields.keys())}, floor_changed: {floor_changed}")
 
@@ -5,6 +5,9 @@ import time
 import logging
 from src.datamodel.database.domain.DigitalSignage import Location, Floor, ShapeType
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.navigation_service import navigation_service
+from src.common.cache import invalidate_tags, LOCATIONS, location_tag, floor_tag
+from src.services import change_log
 
 
 logger = logging.getLogger(__name__)
@@ -195,6 +198,15 @@ async def main(
 
         # Save to database
         await existing_location.save()
+        await navigation_service.on_location_saved(existing_location)
+        await invalidate_tags(
+            LOCATIONS, location_tag(location_id),
+            floor_tag(existing_location.floor_id), floor_tag(original_floor_id) if original_floor_id else None
+        )
+        # A move to another building's floor is a tombstone in the old building's log
+        await change_log.record_floor_changes(change_log.LOCATION, upserts=[
+            (location_id, existing_location.floor_id), (location_id, original_floor_id)
+        ])
         
         logger.info(f"Location updated successfully: {location_id}, floor_changed: {floor_changed}")
 
@@ -196,7 +196,7 @@
 #             detail=f"Failed to retrieve locations: {str(e)}"
 #         )
 
-from fastapi import HTTPException, Query, Path, status
+from fastapi import HTTPException, Query, Path, Request, status
 from pydantic import BaseModel, Field
 from typing import Optional, List
 import logging
@@ -206,11 +206,7 @@ import asyncio
 from src.datamodel.database.domain.DigitalSignage import Location, Floor, Building, LocationType, ShapeType
 from src.datamodel.datavalidation.apiconfig import ApiConfig
 
-# Import your existing Redis utilities
-from src.common.redis_utils import (
-    get_cache_fast, 
-    set_cache_background
-)
+from src.common.cache import TwoTierCache, CachedBody, building_tag, floor_tag
 
 logger = logging.getLogger(__name__)
 
@@ -223,6 +219,15 @@ CACHE_TTL = {
     "not_found": 300,      # 5 minutes for 404s
 }
 
+# Memory + Redis, holding encoded bodies so hits (and 304s) skip serialization
+locations_cache = TwoTierCache(
+    "locations_by_building",
+    max_entries=200,
+    max_bytes=32 * 1024 * 1024,
+    ttl=CACHE_TTL["hot_path"],
+    negative_ttl=CACHE_TTL["not_found"],
+)
+
 def api_config():
     config = {
         "path": "",
@@ -282,7 +287,7 @@ def _ultra_fast_cache_key(building_id: str, floor_id: Optional[str], category: O
     """Ultra-fast cache key generation with minimal string operations"""
     # Use simple concatenation for maximum speed
     key_parts = [
-        "locations_v3",  # Version prefix
+        "locations_v4",  # Version prefix
         building_id,
         floor_id or "all",
         str(category) if category else "all",
@@ -291,7 +296,158 @@ def _ultra_fast_cache_key(building_id: str, floor_id: Optional[str], category: O
     ]
     return ":".join(key_parts)
 
+async def load_building_locations(building_id: str, floor_id: Optional[str], category: Optional[LocationType],
+                                  is_published: Optional[bool], include_inactive: bool) -> Optional[CachedBody]:
+    """Encoded response body for one query, as cached; None when the building does not exist"""
+    # Build filters once
+    location_filter = {
+        "status": {"$in": ["active", "inactive"] if include_inactive else ["active"]}
+    }
+    if category:
+        location_filter["category"] = category
+    if is_published is not None:
+        location_filter["is_published"] = is_published
+
+    floor_filter = {
+        "building_id": building_id,
+        "status": "active"
+    }
+    if floor_id:
+        floor_filter["floor_id"] = floor_id
+
+    try:
+        # PARALLEL EXECUTION: All DB queries at once for maximum speed
+        building_task = Building.find_one({
+            "building_id": building_id,
+            "status": "active"
+        })
+
+        floors_task = Floor.find(floor_filter).sort("floor_number").to_list()
+
+        # Execute building and floors queries in parallel
+        building, floors = await asyncio.gather(
+            building_task, floors_task, return_exceptions=True
+        )
+
+        # Handle exceptions
+        if isinstance(building, Exception):
+            raise building
+        if isinstance(floors, Exception):
+            raise floors
+
+    except Exception as e:
+        logger.error(f"DB query error: {e}")
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    # Unknown buildings are cached as misses to prevent repeated queries
+    if not building:
+        return None
+
+    if not floors:
+        return CachedBody.encode({
+            "status": "success",
+            "message": "No floors found for this building",
+            "data": LocationsResponse(
+                building_id=building_id,
+                building_name=building.name,
+                floors=[],
+                total_floors=0,
+                total_locations=0
+            ).dict()
+        })
+
+    # STEP 4: Parallel location fetching for each floor
+    floor_location_tasks = []
+    for floor in floors:
+        floor_location_filter = {**location_filter, "floor_id": floor.floor_id}
+        task = Location.find(floor_location_filter).to_list()
+        floor_location_tasks.append((floor, task))
+
+    # Execute all location queries in parallel
+    location_results = await asyncio.gather(
+        *[task for floor, task in floor_location_tasks], 
+        return_exceptions=True
+    )
+
+    # STEP 5: ULTRA-FAST response building (< 3ms)
+    floors_with_locations = []
+    total_locations = 0
+
+    # Pre-allocate and cache methods for speed
+    floors_append = floors_with_locations.append
+
+    # Process results with minimal overhead
+    for idx, ((floor, _), locations) in enumerate(zip(floor_location_tasks, location_results)):
+        # Handle exceptions from parallel location fetching
+        if isinstance(locations, Exception):
+            logger.warning(f"Error fetching locations for floor {floor.floor_id}: {locations}")
+            locations = []  # Continue with empty locations
+
+        # Build location items with minimal object creation
+        location_items = []
+        location_items_append = location_items.append
+
+        for location in locations:
+            try:
+                # Direct attribute access for speed - avoid getattr when possible
+                category_val = location.category.value if hasattr(location.category, 'value') else str(location.category)
+                shape_val = location.shape.value if hasattr(location.shape, 'value') else str(location.shape)
+
+                location_item = LocationItem(
+                    location_id=location.location_id,
+                    name=location.name,
+                    category=category_val,
+                    floor_id=location.floor_id,
+                    shape=shape_val,
+                    x=location.x,
+                    y=location.y,
+                    width=getattr(location, 'width', None),
+                    height=getattr(location, 'height', None),
+                    radius=getattr(location, 'radius', None),
+                    logo_url=getattr(location, 'logo_url', None),
+                    color=location.color,
+                    text_color=location.text_color,
+                    is_published=location.is_published,
+                    description=getattr(location, 'description', None),
+                    created_by=getattr(location, 'created_by', None),
+                    datetime=location.datetime,
+                    status=location.status
+                )
+                location_items_append(location_item)
+            except Exception as e:
+                logger.warning(f"Skipping location {getattr(location, 'location_id', 'unknown')}: {e}")
+                continue
+
+        # Create floor with locations
+        floor_with_locations = FloorWithLocations(
+            floor_id=floor.floor_id,
+            floor_name=floor.name,
+            floor_number=getattr(floor, 'floor_number', 0),
+            floor_plan_url=getattr(floor, 'floor_plan_url', None),
+            locations=location_items,
+            total_locations=len(location_items)
+        )
+
+        floors_append(floor_with_locations)
+        total_locations += len(location_items)
+
+    # Build final response
+    response_data = LocationsResponse(
+        building_id=building_id,
+        building_name=building.name,
+        floors=floors_with_locations,
+        total_floors=len(floors_with_locations),
+        total_locations=total_locations
+    )
+
+    return CachedBody.encode({
+        "status": "success",
+        "message": f"Retrieved locations for building '{building.name}'",
+        "data": response_data.dict()
+    }, tags=[floor_tag(floor.floor_id) for floor in floors])
+
 async def main(
+    request: Request,
     building_id: str = Path(..., description="Building ID to get locations for"),
     floor_id: Optional[str] = Query(None, description="Optional floor ID to filter locations"),
     category: Optional[LocationType] = Query(None, description="Optional category filter"),
@@ -306,196 +462,34 @@ async def main(
             building_id, floor_id, str(category) if category else None, 
             is_published, include_inactive
         )
-        
-        # STEP 2: PRIMARY HOT PATH - Complete result cache check (< 5ms)
-        cache_check_start = time.perf_counter()
-        cached_result = await get_cache_fast(cache_key)
-        cache_check_time = time.perf_counter() - cache_check_start
-        
-        if cached_result is not None:
-            total_time = time.perf_counter() - start_time
-            logger.info(f"ULTRA-FAST LOCATIONS: Cache={cache_check_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [CACHE HIT] 🚀")
-            return cached_result
-
-        # STEP 3: Cache miss - Maximum speed DB operations
-        logger.warning(f"Cache miss for locations key: {cache_key}")
-        db_start = time.perf_counter()
-        
-        # Build filters once
-        location_filter = {
-            "status": {"$in": ["active", "inactive"] if include_inactive else ["active"]}
-        }
-        if category:
-            location_filter["category"] = category
-        if is_published is not None:
-            location_filter["is_published"] = is_published
-
-        floor_filter = {
-            "building_id": building_id,
-            "status": "active"
-        }
-        if floor_id:
-            floor_filter["floor_id"] = floor_id
-
-        try:
-            # PARALLEL EXECUTION: All DB queries at once for maximum speed
-            building_task = Building.find_one({
-                "building_id": building_id,
-                "status": "active"
-            })
-            
-            floors_task = Floor.find(floor_filter).sort("floor_number").to_list()
-            
-            # Execute building and floors queries in parallel
-            building, floors = await asyncio.gather(
-                building_task, floors_task, return_exceptions=True
-            )
-            
-            # Handle exceptions
-            if isinstance(building, Exception):
-                raise building
-            if isinstance(floors, Exception):
-                raise floors
-                
-        except Exception as e:
-            logger.error(f"DB query error: {e}")
-            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-        
-        # Fast 404 handling
-        if not building:
-            not_found_result = {
-                "status": "error", 
-                "message": f"Building with ID '{building_id}' not found",
-                "data": None
-            }
-            asyncio.create_task(
-                set_cache_background(cache_key, not_found_result, expire=CACHE_TTL["not_found"])
-            )
-            raise HTTPException(status_code=404, detail=f"Building with ID '{building_id}' not found")
+        # Floor writes drop the building's tag, location writes the tag of their floor (added when loaded)
+        cache_tags = [building_tag(building_id)]
 
-        if not floors:
-            empty_result = {
-                "status": "success",
-                "message": "No floors found for this building",
-                "data": LocationsResponse(
-                    building_id=building_id,
-                    building_name=building.name,
-                    floors=[],
-                    total_floors=0,
-                    total_locations=0
-                ).dict()
-            }
-            asyncio.create_task(
-                set_cache_background(cache_key, empty_result, expire=CACHE_TTL["hot_path"])
-            )
-            return empty_result
-
-        # STEP 4: Parallel location fetching for each floor
-        floor_location_tasks = []
-        for floor in floors:
-            floor_location_filter = {**location_filter, "floor_id": floor.floor_id}
-            task = Location.find(floor_location_filter).to_list()
-            floor_location_tasks.append((floor, task))
-
-        # Execute all location queries in parallel
-        location_results = await asyncio.gather(
-            *[task for floor, task in floor_location_tasks], 
-            return_exceptions=True
-        )
+        db_time = None
 
-        db_time = time.perf_counter() - db_start
+        async def load_locations():
+            nonlocal db_time
+            logger.warning(f"Cache miss for locations key: {cache_key}")
+            db_start = time.perf_counter()
+            body = await load_building_locations(building_id, floor_id, category, is_published, include_inactive)
+            db_time = time.perf_counter() - db_start
+            return body
+
+        # STEP 2: Memory -> Redis -> database; concurrent misses share one load
+        body, cache_source = await locations_cache.get_or_load(cache_key, load_locations, tags=cache_tags)
+
+        if body is None:
+            raise HTTPException(status_code=404, detail=f"Building with ID '{building_id}' not found")
 
-        # STEP 5: ULTRA-FAST response building (< 3ms)
-        response_build_start = time.perf_counter()
-        
-        floors_with_locations = []
-        total_locations = 0
-        
-        # Pre-allocate and cache methods for speed
-        floors_append = floors_with_locations.append
-        
-        # Process results with minimal overhead
-        for idx, ((floor, _), locations) in enumerate(zip(floor_location_tasks, location_results)):
-            # Handle exceptions from parallel location fetching
-            if isinstance(locations, Exception):
-                logger.warning(f"Error fetching locations for floor {floor.floor_id}: {locations}")
-                locations = []  # Continue with empty locations
-            
-            # Build location items with minimal object creation
-            location_items = []
-            location_items_append = location_items.append
-            
-            for location in locations:
-                try:
-                    # Direct attribute access for speed - avoid getattr when possible
-                    category_val = location.category.value if hasattr(location.category, 'value') else str(location.category)
-                    shape_val = location.shape.value if hasattr(location.shape, 'value') else str(location.shape)
-                    
-                    location_item = LocationItem(
-                        location_id=location.location_id,
-                        name=location.name,
-                        category=category_val,
-                        floor_id=location.floor_id,
-                        shape=shape_val,
-                        x=location.x,
-                        y=location.y,
-                        width=getattr(location, 'width', None),
-                        height=getattr(location, 'height', None),
-                        radius=getattr(location, 'radius', None),
-                        logo_url=getattr(location, 'logo_url', None),
-                        color=location.color,
-                        text_color=location.text_color,
-                        is_published=location.is_published,
-                        description=getattr(location, 'description', None),
-                        created_by=getattr(location, 'created_by', None),
-                        datetime=location.datetime,
-                        status=location.status
-                    )
-                    location_items_append(location_item)
-                except Exception as e:
-                    logger.warning(f"Skipping location {getattr(location, 'location_id', 'unknown')}: {e}")
-                    continue
-
-            # Create floor with locations
-            floor_with_locations = FloorWithLocations(
-                floor_id=floor.floor_id,
-                floor_name=floor.name,
-                floor_number=getattr(floor, 'floor_number', 0),
-                floor_plan_url=getattr(floor, 'floor_plan_url', None),
-                locations=location_items,
-                total_locations=len(location_items)
-            )
-            
-            floors_append(floor_with_locations)
-            total_locations += len(location_items)
-
-        # Build final response
-        response_data = LocationsResponse(
-            building_id=building_id,
-            building_name=building.name,
-            floors=floors_with_locations,
-            total_floors=len(floors_with_locations),
-            total_locations=total_locations
-        )
-        
-        final_result = {
-            "status": "success",
-            "message": f"Retrieved locations for building '{building.name}'",
-            "data": response_data.dict()
-        }
-        
-        response_build_time = time.perf_counter() - response_build_start
-        
-        # STEP 6: Background caching (non-blocking)
-        asyncio.create_task(
-            set_cache_background(cache_key, final_result, expire=CACHE_TTL["hot_path"])
-        )
-        
         # Performance logging
         total_time = time.perf_counter() - start_time
-        logger.info(f"LOCATIONS PERFORMANCE: DB={db_time*1000:.1f}ms, Response={response_build_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [MISS] - {total_locations} locations")
-        
-        return final_result
+        if db_time is not None:
+            logger.info(f"LOCATIONS PERFORMANCE: DB={db_time*1000:.1f}ms, Total={total_time*1000:.1f}ms [MISS] - {len(body.body)} bytes")
+        else:
+            logger.info(f"ULTRA-FAST LOCATIONS: Total={total_time*1000:.1f}ms [CACHE {cache_source}] 🚀")
+
+        # Kiosks poll this payload: an unchanged one answers 304 against their ETag
+        return body.response(request, {"X-Cache": cache_source, "Cache-Control": "no-cache"})
 
     except HTTPException:
         raise
@@ -505,4 +499,4 @@ async def main(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve locations: {str(e)}"
-        )
\ No newline at end of file
+        )
@@ -5,6 +5,9 @@ import time
 import logging
 from src.datamodel.database.domain.DigitalSignage import Location
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.navigation_service import navigation_service
+from src.common.cache import invalidate_tags, LOCATIONS, location_tag, floor_tag
+from src.services import change_log
 
 
 logger = logging.getLogger(__name__)
@@ -77,11 +80,13 @@ async def main(
                 # Delete location
                 if hard_delete:
                     await location.delete()
+                    await navigation_service.on_node_removed(location_id, location.floor_id)
                 else:
                     location.status = "deleted"
                     location.updated_by = None  # Set to current user if available
                     location.update_on = time.time()
                     await location.save()
+                    await navigation_service.on_location_saved(location)
 
                 # Add to successful deletions with detailed info
                 deleted_location_info = LocationDeleteInfo(
@@ -98,6 +103,18 @@ async def main(
                 logger.error(f"Failed to delete location {location_id}: {str(e)}")
                 failed_deletions.append(location_id)
 
+        if deleted_locations:
+            await invalidate_tags(
+                LOCATIONS,
+                *(location_tag(info.location_id) for info in deleted_locations),
+                *(floor_tag(floor_id) for floor_id in floors_affected)
+            )
+            changes = [(info.location_id, info.floor_id) for info in deleted_locations]
+            if hard_delete:
+                await change_log.record_floor_changes(change_log.LOCATION, deletes=changes)
+            else:
+                await change_log.record_floor_changes(change_log.LOCATION, upserts=changes)
+
         delete_type = "hard" if hard_delete else "soft"
         
         logger.info(f"Bulk {delete_type} delete completed. Success: {len(deleted_locations)}, Failed: {len(failed_deletions)}, Floors affected: {len(floors_affected)}")
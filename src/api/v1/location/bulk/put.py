@@ -1,14 +1,29 @@
 from fastapi import HTTPException, Depends, status
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set, Tuple
+from enum import Enum
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 import time
 import logging
 from src.datamodel.database.domain.DigitalSignage import Location, ShapeType, LocationType
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.navigation_service import navigation_service
+from src.common.cache import invalidate_tags, LOCATIONS, location_tag, floor_tag
+from src.services import change_log
 
 
 logger = logging.getLogger(__name__)
 
+# Locations accepted in one request, enough for a whole floor plan saved at once
+BULK_UPDATE_MAX_LOCATIONS = 5000
+
+# LocationUpdateData fields written when provided
+UPDATABLE_FIELDS = (
+    "name", "category", "shape", "x", "y", "width", "height", "radius",
+    "logo_url", "color", "text_color", "is_published", "description",
+)
+
 
 def api_config():
     config = {
@@ -17,7 +32,7 @@ def api_config():
         "tags": ["Location"],
         "summary": "Bulk Update Locations",
         "response_model": dict,
-        "description": "Update multiple location tags at once including size, shape, color and position.",
+        "description": "Update up to 5000 location tags at once (a whole floor plan) including size, shape, color and position.",
         "response_description": "Bulk update results with success and failure details",
         "deprecated": False,
     }
@@ -60,8 +75,8 @@ class BulkLocationUpdateRequest(BaseModel):
     def validate_locations_not_empty(cls, v):
         if not v:
             raise ValueError('At least one location must be provided for update')
-        if len(v) > 100:  # Reasonable limit for bulk operations
-            raise ValueError('Maximum 100 locations can be updated at once')
+        if len(v) > BULK_UPDATE_MAX_LOCATIONS:
+            raise ValueError(f'Maximum {BULK_UPDATE_MAX_LOCATIONS} locations can be updated at once')
         return v
 
 
@@ -97,127 +112,138 @@ async def validate_shape_requirements(location_data: LocationUpdateData, existin
             raise ValueError("Radius is required for circle shape")
 
 
-async def update_single_location(location_data: LocationUpdateData, updated_by: Optional[str]) -> LocationUpdateResult:
-    """Update a single location and return the result"""
-    try:
-        # Find the existing location
-        existing_location = await Location.find_one({
-            "location_id": location_data.location_id,
+def _update_fields(location_data: LocationUpdateData) -> Dict[str, Any]:
+    """Fields provided in an update, with their values"""
+    update_data = {}
+    for field in UPDATABLE_FIELDS:
+        value = getattr(location_data, field)
+        if value is not None:
+            update_data[field] = value
+    return update_data
+
+
+async def bulk_update_locations(locations: List[LocationUpdateData],
+                                updated_by: Optional[str]) -> Tuple[List[LocationUpdateResult], List[Location]]:
+    """
+    Apply a batch of updates in three round trips, whatever its size: one
+    query for the locations, one for the names they are renamed to, and one
+    unordered bulk_write. Existence, shape and name conflicts are checked in
+    memory, in request order.
+
+    Returns a result per requested item (in request order) and the updated
+    locations, with their new values applied.
+    """
+    results: List[Optional[LocationUpdateResult]] = [None] * len(locations)
+
+    def fail(index: int, message: str) -> None:
+        results[index] = LocationUpdateResult(
+            location_id=locations[index].location_id,
+            status="failed",
+            message=message
+        )
+
+    location_ids = list(dict.fromkeys(item.location_id for item in locations))
+    existing = {
+        location.location_id: location
+        for location in await Location.find({"location_id": {"$in": location_ids}, "status": "active"}).to_list()
+    }
+
+    # (floor_id, name) -> active locations holding that name, for every name the batch moves to
+    name_holders: Dict[Tuple[str, str], Set[str]] = {}
+    for location in existing.values():
+        name_holders.setdefault((location.floor_id, location.name), set()).add(location.location_id)
+    renamed = [
+        (existing[item.location_id].floor_id, item.name) for item in locations
+        if item.location_id in existing and item.name and item.name != existing[item.location_id].name
+    ]
+    if renamed:
+        holders = await Location.find({
+            "floor_id": {"$in": list({floor_id for floor_id, _ in renamed})},
+            "name": {"$in": list({name for _, name in renamed})},
             "status": "active"
-        })
-        
-        if not existing_location:
-            return LocationUpdateResult(
-                location_id=location_data.location_id,
-                status="failed",
-                message=f"Location with ID '{location_data.location_id}' not found"
-            )
-        
-        # Validate shape requirements
-        await validate_shape_requirements(location_data, existing_location)
-        
-        # Check for name conflicts if name is being updated
-        if location_data.name and location_data.name != existing_location.name:
-            name_conflict = await Location.find_one({
-                "name": location_data.name,
-                "floor_id": existing_location.floor_id,
-                "status": "active",
-                "location_id": {"$ne": location_data.location_id}
-            })
-            
-            if name_conflict:
-                return LocationUpdateResult(
-                    location_id=location_data.location_id,
-                    status="failed",
-                    message=f"Location with name '{location_data.name}' already exists on this floor"
-                )
-        
-        # Track updated fields
-        updated_fields = []
-        
-        # Update fields that are provided
-        update_data = {}
-        
-        if location_data.name is not None:
-            update_data["name"] = location_data.name
-            updated_fields.append("name")
-        
-        if location_data.category is not None:
-            update_data["category"] = location_data.category
-            updated_fields.append("category")
-        
-        if location_data.shape is not None:
-            update_data["shape"] = location_data.shape
-            updated_fields.append("shape")
-        
-        if location_data.x is not None:
-            update_data["x"] = location_data.x
-            updated_fields.append("x")
-        
-        if location_data.y is not None:
-            update_data["y"] = location_data.y
-            updated_fields.append("y")
-        
-        if location_data.width is not None:
-            update_data["width"] = location_data.width
-            updated_fields.append("width")
-        
-        if location_data.height is not None:
-            update_data["height"] = location_data.height
-            updated_fields.append("height")
-        
-        if location_data.radius is not None:
-            update_data["radius"] = location_data.radius
-            updated_fields.append("radius")
-        
-        if location_data.logo_url is not None:
-            update_data["logo_url"] = location_data.logo_url
-            updated_fields.append("logo_url")
-        
-        if location_data.color is not None:
-            update_data["color"] = location_data.color
-            updated_fields.append("color")
-        
-        if location_data.text_color is not None:
-            update_data["text_color"] = location_data.text_color
-            updated_fields.append("text_color")
-        
-        if location_data.is_published is not None:
-            update_data["is_published"] = location_data.is_published
-            updated_fields.append("is_published")
-        
-        if location_data.description is not None:
-            update_data["description"] = location_data.description
-            updated_fields.append("description")
-        
-        # Add update metadata
+        }).to_list()
+        for location in holders:
+            name_holders.setdefault((location.floor_id, location.name), set()).add(location.location_id)
+
+    seen = set()
+    pending = []  # (request index, location, provided fields)
+    for index, item in enumerate(locations):
+        if item.location_id in seen:
+            fail(index, f"Location with ID '{item.location_id}' appears more than once in this request")
+            continue
+        seen.add(item.location_id)
+
+        location = existing.get(item.location_id)
+        if location is None:
+            fail(index, f"Location with ID '{item.location_id}' not found")
+            continue
+
+        try:
+            await validate_shape_requirements(item, location)
+        except ValueError as ve:
+            fail(index, str(ve))
+            continue
+
+        # Earlier renames in the batch free their old name and take the new one
+        if item.name and item.name != location.name:
+            holders = name_holders.setdefault((location.floor_id, item.name), set())
+            if holders - {location.location_id}:
+                fail(index, f"Location with name '{item.name}' already exists on this floor")
+                continue
+            name_holders.get((location.floor_id, location.name), set()).discard(location.location_id)
+            holders.add(location.location_id)
+
+        update_data = _update_fields(item)
         update_data["updated_by"] = updated_by
         update_data["update_on"] = time.time()
-        updated_fields.extend(["updated_by", "update_on"])
-        
-        # Perform the update
-        await existing_location.update({"$set": update_data})
-        
-        return LocationUpdateResult(
-            location_id=location_data.location_id,
-            status="success",
-            message="Location updated successfully",
-            updated_fields=updated_fields
-        )
-        
-    except ValueError as ve:
-        return LocationUpdateResult(
-            location_id=location_data.location_id,
-            status="failed",
-            message=str(ve)
-        )
-    except Exception as e:
-        logger.exception(f"Error updating location {location_data.location_id}: {str(e)}")
-        return LocationUpdateResult(
-            location_id=location_data.location_id,
-            status="failed",
-            message=f"Internal error: {str(e)}"
-        )
+        pending.append((index, location, update_data))
+
+    updated = []
+    if pending:
+        operations = [
+            UpdateOne(
+                {"location_id": location.location_id, "status": "active"},
+                {"$set": {field: value.value if isinstance(value, Enum) else value
+                          for field, value in update_data.items()}}
+            )
+            for _, location, update_data in pending
+        ]
+        write_errors = {}
+        try:
+            matched = (await Location.get_motor_collection().bulk_write(operations, ordered=False)).matched_count
+        except BulkWriteError as bwe:
+            # Unordered: every other operation was still applied
+            write_errors = {error["index"]: error.get("errmsg", "write failed") for error in bwe.details.get("writeErrors", [])}
+            matched = bwe.details.get("nMatched", 0)
+
+        # A location deleted since it was read matches nothing, which is not a write error
+        missing = set()
+        if matched < len(operations) - len(write_errors):
+            pending_ids = [location.location_id for _, location, _ in pending]
+            still_active = await Location.get_motor_collection().find(
+                {"location_id": {"$in": pending_ids}, "status": "active"}, {"location_id": 1, "_id": 0}
+            ).to_list(length=None)
+            missing = set(pending_ids) - {document["location_id"] for document in still_active}
+
+        for op_index, (index, location, update_data) in enumerate(pending):
+            if op_index in write_errors:
+                logger.error(f"Error updating location {location.location_id}: {write_errors[op_index]}")
+                fail(index, f"Internal error: {write_errors[op_index]}")
+                continue
+            if location.location_id in missing:
+                fail(index, f"Location with ID '{location.location_id}' not found")
+                continue
+            for field, value in update_data.items():
+                setattr(location, field, value)
+            updated.append(location)
+            results[index] = LocationUpdateResult(
+                location_id=location.location_id,
+                status="success",
+                message="Location updated successfully",
+                updated_fields=list(update_data)
+            )
+
+    return results, updated
 
 
 async def main(
@@ -225,21 +251,22 @@ async def main(
 ):
     try:
         logger.info(f"Starting bulk update for {len(bulk_update_data.locations)} locations")
-        
-        results = []
-        successful_updates = 0
-        failed_updates = 0
-        
-        # Process each location update
-        for location_data in bulk_update_data.locations:
-            result = await update_single_location(location_data, bulk_update_data.updated_by)
-            results.append(result)
-            
-            if result.status == "success":
-                successful_updates += 1
-            else:
-                failed_updates += 1
-        
+        start_time = time.perf_counter()
+
+        results, updated = await bulk_update_locations(bulk_update_data.locations, bulk_update_data.updated_by)
+        successful_updates = len(updated)
+        failed_updates = len(results) - successful_updates
+
+        if updated:
+            await navigation_service.on_locations_saved(updated)
+            floors_touched = {location.location_id: location.floor_id for location in updated}
+            await invalidate_tags(
+                LOCATIONS,
+                *(location_tag(location_id) for location_id in floors_touched),
+                *(floor_tag(floor_id) for floor_id in set(floors_touched.values()))
+            )
+            await change_log.record_floor_changes(change_log.LOCATION, upserts=floors_touched.items())
+
         # Prepare response
         response = BulkUpdateResponse(
             total_requested=len(bulk_update_data.locations),
@@ -248,7 +275,10 @@ async def main(
             results=results
         )
         
-        logger.info(f"Bulk update completed: {successful_updates} successful, {failed_updates} failed")
+        logger.info(
+            f"Bulk update completed: {successful_updates} successful, {failed_updates} failed "
+            f"in {(time.perf_counter() - start_time) * 1000:.1f}ms"
+        )
         
         return {
             "status": "completed",
@@ -143,76 +143,75 @@
 
 
 from fastapi import HTTPException, Query, status, Request, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 import logging
 import time
-import hashlib
 import asyncio
-from src.datamodel.database.domain.DigitalSignage import Location, ShapeType
+import functools
+from src.datamodel.database.domain.DigitalSignage import Building, Floor, Location, ShapeType
 from src.datamodel.datavalidation.apiconfig import ApiConfig
 from src.core.middleware.token_validate_middleware import validate_token
-from src.common.redis_utils import get_cache_fast,  set_cache_background
+from src.common.cache import (
+    TwoTierCache, CachedBody, FLOORS, LOCATIONS, floor_tag, entity_list_tag, invalidate_tags, query_key
+)
+from src.common.streaming import STREAM_ITEMS, STREAM_COUNT, streaming_json_response
+from src.services.cache_warmer import cache_warmer
 
 logger = logging.getLogger(__name__)
 
-# Ultra-fast in-memory cache for locations
-_LOCATION_MEMORY_CACHE: Dict[str, Dict] = {}
-_LOCATION_CACHE_ACCESS_ORDER = []
-MAX_LOCATION_MEMORY_CACHE = 200  # Larger cache for location queries 
-
-def add_to_location_memory_cache(key: str, data: Dict):
-    """Ultra-fast in-memory cache for location data"""
-    global _LOCATION_MEMORY_CACHE, _LOCATION_CACHE_ACCESS_ORDER
-    
-    if key in _LOCATION_MEMORY_CACHE:
-        _LOCATION_CACHE_ACCESS_ORDER.remove(key)
-    elif len(_LOCATION_MEMORY_CACHE) >= MAX_LOCATION_MEMORY_CACHE:
-        # Remove oldest entries (batch removal for efficiency)
-        for _ in range(20):  # Remove 20 entries at once
-            if _LOCATION_CACHE_ACCESS_ORDER:
-                oldest = _LOCATION_CACHE_ACCESS_ORDER.pop(0)
-                _LOCATION_MEMORY_CACHE.pop(oldest, None)
-    
-    _LOCATION_MEMORY_CACHE[key] = data
-    _LOCATION_CACHE_ACCESS_ORDER.append(key)
-
-def get_from_location_memory_cache(key: str) -> Optional[Dict]:
-    """Get from location in-memory cache"""
-    if key in _LOCATION_MEMORY_CACHE:
-        # Move to end (most recently used)
-        _LOCATION_CACHE_ACCESS_ORDER.remove(key)
-        _LOCATION_CACHE_ACCESS_ORDER.append(key)
-        return _LOCATION_MEMORY_CACHE[key]
-    return None
+# Memory + Redis cache for location queries
+MAX_LOCATION_MEMORY_CACHE = 200  # Larger cache for location queries
+# Page size without a limit, and the largest page a non-streamed request may ask for
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+location_cache = TwoTierCache(
+    "location",
+    max_entries=MAX_LOCATION_MEMORY_CACHE,
+    max_bytes=32 * 1024 * 1024,
+    ttl=900,
+)
 
 def generate_location_cache_key(entity_uuid: str, status_filter: str, category: Optional[str], 
                                floor_id: Optional[str], shape: Optional[str], name: Optional[str],
                                limit: Optional[int], skip: int, sort_by: str, sort_order: str,
                                light: bool = False) -> str:
-    """Generate highly optimized cache key for locations"""
-    # Create compact key representation
-    parts = [
-        "loc",  # prefix
-        entity_uuid[-8:] if entity_uuid else "none",  # Last 8 chars of entity
-        status_filter[0] if status_filter else "a",  # First char only
-        category[:3] if category else "none",  # First 3 chars
-        floor_id[-8:] if floor_id else "none",  # Last 8 chars of floor_id
-        shape[0] if shape else "none",  # First char of shape
-        str(limit) if limit else "none",
-        str(skip) if skip else "0",
-        sort_by[0] if sort_by else "n",  # First char of sort field
-        "d" if sort_order == "desc" else "a",  # asc/desc
-        "l" if light else "f"  # light/full
-    ]
-    
-    # Add name hash if present
-    if name:
-        name_hash = hashlib.md5(name.encode()).hexdigest()[:6]
-        parts.append(name_hash)
-    
-    return ":".join(parts)
+    """Cache key for one location query"""
+    # v3: keyed by a digest of the full parameters (v2 truncated them, so queries could collide)
+    return query_key(
+        "loc3", entity_uuid, status_filter, category, floor_id, shape, name,
+        limit, skip, sort_by, sort_order, light
+    )
+
+def _cache_ttl(category: Optional[str], floor_id: Optional[str], name: Optional[str]) -> int:
+    """Smart TTL based on query type"""
+    if name or category:
+        return 900  # 15 minutes for searches
+    if floor_id:
+        return 1800  # 30 minutes for floor-specific
+    return 3600  # 1 hour for general queries
+
+def _cache_tags(entity_uuid: Optional[str], floor_id: Optional[str]) -> List[str]:
+    """
+    Tags known before loading. A floor's list is dropped by writes to that floor.
+    An entity-wide list is dropped when the entity's floors change, and gets the
+    tags of each of its floors when loaded (see load_locations_body).
+    """
+    if floor_id:
+        return [floor_tag(floor_id)]
+    if entity_uuid:
+        return [entity_list_tag(FLOORS, entity_uuid)]
+    return [LOCATIONS]
+
+async def _entity_floor_tags(entity_uuid: Optional[str], floor_id: Optional[str]) -> List[str]:
+    """Tags of every floor an entity-wide query can return locations from"""
+    if floor_id or not entity_uuid:
+        return []
+    floors = await Floor.get_motor_collection().find(
+        {"entity_uuid": entity_uuid}, {"floor_id": 1, "_id": 0}
+    ).to_list(length=None)
+    return [floor_tag(floor["floor_id"]) for floor in floors]
 
 def api_config():
     config = {
@@ -266,6 +265,139 @@ class LocationResponse(BaseModel):
     class Config:
         allow_population_by_field_name = True
 
+def _build_location_query(entity_uuid: str, status_filter: Optional[str],
+                          category: Optional[str], floor_id: Optional[str],
+                          shape: Optional[str], name: Optional[str],
+                          limit: Optional[int], skip: int, sort_by: str,
+                          sort_order: str, max_limit: Optional[int] = MAX_PAGE_SIZE):
+    """
+    Filtered, sorted and paginated Location query (not yet executed); with
+    `max_limit` None nothing caps the page, for streaming
+    """
+    # Build optimized query filter
+    query_filter = {}
+    
+    # Always include entity filter for performance
+    if entity_uuid:
+        query_filter["entity_uuid"] = entity_uuid
+    
+    if status_filter and status_filter != "all":
+        query_filter["status"] = status_filter
+    
+    if category:
+        # Use prefix match for better index usage
+        query_filter["category"] = {"$regex": f"^{category}", "$options": "i"}
+        
+    if floor_id:
+        query_filter["floor_id"] = floor_id
+        
+    if shape:
+        query_filter["shape"] = shape
+    
+    if name:
+        # Use prefix match for better performance
+        query_filter["name"] = {"$regex": f"^{name}", "$options": "i"}
+
+    # Build query with optimized sorting
+    sort_direction = -1 if sort_order.lower() == "desc" else 1
+    
+    # Map sort fields to optimize for indexes
+    sort_field_map = {
+        "name": "name",
+        "category": "category", 
+        "datetime": "datetime",
+        "floor_id": "floor_id"
+    }
+    actual_sort_field = sort_field_map.get(sort_by, "name")
+    
+    query = Location.find(query_filter)
+    
+    # Apply sorting with error handling
+    try:
+        query = query.sort([(actual_sort_field, sort_direction)])
+    except Exception as sort_error:
+        logger.warning(f"Sorting failed, using default: {sort_error}")
+        # Fallback to no sorting for speed
+    
+    # Apply pagination limits
+    if skip and skip > 0:
+        query = query.skip(skip)
+    if limit and limit > 0:
+        query = query.limit(min(limit, max_limit) if max_limit else limit)  # Cap at max_limit for performance
+    elif max_limit:
+        query = query.limit(500)  # Default limit to prevent large responses
+    return query
+
+def _location_dict(location, light: bool) -> Optional[Dict[str, Any]]:
+    """Response item for one location; None (logged) when the document is malformed"""
+    try:
+        if light:
+            return {
+                "location_id": location.location_id,
+                "name": location.name,
+                "category": location.category,
+                "floor_id": location.floor_id,
+                "shape": location.shape.value if hasattr(location.shape, 'value') else str(location.shape),
+                "x": float(location.x),
+                "y": float(location.y),
+                "color": location.color,
+                "is_published": location.is_published,
+                "status": location.status
+            }
+        # Full response processing
+        return {
+            "location_id": location.location_id,
+            "name": location.name,
+            "category": location.category,
+            "floor_id": location.floor_id,
+            "shape": location.shape.value if hasattr(location.shape, 'value') else str(location.shape),
+            "x": float(location.x),
+            "y": float(location.y),
+            "width": location.width,
+            "height": location.height,
+            "radius": location.radius,
+            "logo_url": getattr(location, 'logo_url', None),
+            "color": location.color,
+            "text_color": getattr(location, 'text_color', ''),
+            "is_published": location.is_published,
+            "description": getattr(location, 'description', None),
+            "created_by": getattr(location, 'created_by', None),
+            "datetime": location.datetime,
+            "updated_by": getattr(location, 'updated_by', None),
+            "update_on": getattr(location, 'update_on', None),
+            "status": location.status
+        }
+    except Exception as e:
+        logger.warning(f"Error processing location {getattr(location, 'location_id', 'unknown')}: {e}")
+        return None
+
+def _response_template(location_list: Any, count: Any, status_filter: Optional[str],
+                       category: Optional[str], floor_id: Optional[str], shape: Optional[str],
+                       name: Optional[str], limit: Optional[int], skip: int, light: bool,
+                       message: str) -> Dict[str, Any]:
+    if light:
+        return {
+            "data": location_list,
+            "count": count
+        }
+    return {
+        "status": "success",
+        "message": message,
+        "data": location_list,
+        "pagination": {
+            "returned": count,
+            "skip": skip,
+            "limit": limit
+        },
+        "filters_applied": {
+            "status": status_filter,
+            "category": category,
+            "floor_id": floor_id,
+            "shape": shape,
+            "name": name
+        }
+    }
+
 async def get_locations_optimized(entity_uuid: str, status_filter: Optional[str], 
                                 category: Optional[str], floor_id: Optional[str], 
                                 shape: Optional[str], name: Optional[str],
@@ -275,58 +407,10 @@ async def get_locations_optimized(entity_uuid: str, status_filter: Optional[str]
     try:
         db_start = time.perf_counter()
         
-        # Build optimized query filter
-        query_filter = {}
-        
-        # Always include entity filter for performance
-        if entity_uuid:
-            query_filter["entity_uuid"] = entity_uuid
-        
-        if status_filter and status_filter != "all":
-            query_filter["status"] = status_filter
-        
-        if category:
-            # Use prefix match for better index usage
-            query_filter["category"] = {"$regex": f"^{category}", "$options": "i"}
-            
-        if floor_id:
-            query_filter["floor_id"] = floor_id
-            
-        if shape:
-            query_filter["shape"] = shape
-        
-        if name:
-            # Use prefix match for better performance
-            query_filter["name"] = {"$regex": f"^{name}", "$options": "i"}
-
-        # Build query with optimized sorting
-        sort_direction = -1 if sort_order.lower() == "desc" else 1
-        
-        # Map sort fields to optimize for indexes
-        sort_field_map = {
-            "name": "name",
-            "category": "category", 
-            "datetime": "datetime",
-            "floor_id": "floor_id"
-        }
-        actual_sort_field = sort_field_map.get(sort_by, "name")
-        
-        query = Location.find(query_filter)
-        
-        # Apply sorting with error handling
-        try:
-            query = query.sort([(actual_sort_field, sort_direction)])
-        except Exception as sort_error:
-            logger.warning(f"Sorting failed, using default: {sort_error}")
-            # Fallback to no sorting for speed
-        
-        # Apply pagination limits
-        if skip and skip > 0:
-            query = query.skip(skip)
-        if limit and limit > 0:
-            query = query.limit(min(limit, 1000))  # Cap at 1000 for performance
-        else:
-            query = query.limit(500)  # Default limit to prevent large responses
+        query = _build_location_query(
+            entity_uuid, status_filter, category, floor_id, shape, name,
+            limit, skip, sort_by, sort_order
+        )
 
         # Execute with timeout
         # locations = await asyncio.wait_for(query.to_list(), timeout=5.0)
@@ -337,84 +421,17 @@ async def get_locations_optimized(entity_uuid: str, status_filter: Optional[str]
         logger.info(f"Location DB query: {db_time:.1f}ms for {len(locations)} records")
         
         # Process results based on response mode
-        if light:
-            location_list = []
-            for location in locations:
-                try:
-                    location_dict = {
-                        "location_id": location.location_id,
-                        "name": location.name,
-                        "category": location.category,
-                        "floor_id": location.floor_id,
-                        "shape": location.shape.value if hasattr(location.shape, 'value') else str(location.shape),
-                        "x": float(location.x),
-                        "y": float(location.y),
-                        "color": location.color,
-                        "is_published": location.is_published,
-                        "status": location.status
-                    }
-                    location_list.append(location_dict)
-                except Exception as e:
-                    logger.warning(f"Error processing location {getattr(location, 'location_id', 'unknown')}: {e}")
-                    continue
-        else:
-            # Full response processing
-            location_list = []
-            for location in locations:
-                try:
-                    location_dict = {
-                        "location_id": location.location_id,
-                        "name": location.name,
-                        "category": location.category,
-                        "floor_id": location.floor_id,
-                        "shape": location.shape.value if hasattr(location.shape, 'value') else str(location.shape),
-                        "x": float(location.x),
-                        "y": float(location.y),
-                        "width": location.width,
-                        "height": location.height,
-                        "radius": location.radius,
-                        "logo_url": getattr(location, 'logo_url', None),
-                        "color": location.color,
-                        "text_color": getattr(location, 'text_color', ''),
-                        "is_published": location.is_published,
-                        "description": getattr(location, 'description', None),
-                        "created_by": getattr(location, 'created_by', None),
-                        "datetime": location.datetime,
-                        "updated_by": getattr(location, 'updated_by', None),
-                        "update_on": getattr(location, 'update_on', None),
-                        "status": location.status
-                    }
-                    location_list.append(location_dict)
-                except Exception as e:
-                    logger.warning(f"Error processing location {getattr(location, 'location_id', 'unknown')}: {e}")
-                    continue
+        location_list = []
+        for location in locations:
+            location_dict = _location_dict(location, light)
+            if location_dict is not None:
+                location_list.append(location_dict)
 
         # Build response
-        if light:
-            response = {
-                "data": location_list,
-                "count": len(location_list)
-            }
-        else:
-            response = {
-                "status": "success",
-                "message": f"Retrieved {len(location_list)} locations",
-                "data": location_list,
-                "pagination": {
-                    "returned": len(location_list),
-                    "skip": skip,
-                    "limit": limit
-                },
-                "filters_applied": {
-                    "status": status_filter,
-                    "category": category,
-                    "floor_id": floor_id,
-                    "shape": shape,
-                    "name": name
-                }
-            }
-        
-        return response
+        return _response_template(
+            location_list, len(location_list), status_filter, category, floor_id, shape, name,
+            limit, skip, light, f"Retrieved {len(location_list)} locations"
+        )
         
     except asyncio.TimeoutError:
         logger.error("Location query timeout")
@@ -423,6 +440,48 @@ async def get_locations_optimized(entity_uuid: str, status_filter: Optional[str]
         logger.error(f"Database error in get_locations_optimized: {str(e)}")
         raise
 
+def stream_locations(entity_uuid: str, status_filter: Optional[str],
+                     category: Optional[str], floor_id: Optional[str],
+                     shape: Optional[str], name: Optional[str],
+                     limit: Optional[int], skip: int, sort_by: str,
+                     sort_order: str, light: bool = False,
+                     headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """
+    Same body as `get_locations_optimized`, encoded location by location off
+    the cursor; uncapped, so without a `limit` every match is streamed
+    """
+    query = _build_location_query(
+        entity_uuid, status_filter, category, floor_id, shape, name,
+        limit, skip, sort_by, sort_order, max_limit=None
+    )
+
+    async def items():
+        async for location in query:
+            location_dict = _location_dict(location, light)
+            if location_dict is not None:
+                yield location_dict
+
+    template = _response_template(
+        STREAM_ITEMS, STREAM_COUNT, status_filter, category, floor_id, shape, name,
+        limit, skip, light, "Retrieved locations"
+    )
+    return streaming_json_response(template, items(), headers)
+
+async def load_locations_body(entity_uuid: str, status_filter: Optional[str],
+                              category: Optional[str], floor_id: Optional[str],
+                              shape: Optional[str], name: Optional[str],
+                              limit: Optional[int], skip: int, sort_by: str,
+                              sort_order: str, light: bool = False) -> CachedBody:
+    """Query result encoded once, so cache hits skip JSON encoding"""
+    response, tags = await asyncio.gather(
+        get_locations_optimized(
+            entity_uuid, status_filter, category, floor_id, shape, name,
+            limit, skip, sort_by, sort_order, light
+        ),
+        _entity_floor_tags(entity_uuid, floor_id),
+    )
+    return CachedBody.encode(response, headers={"X-Records": str(len(response.get("data", [])))}, tags=tags)
+
 async def main(
     request: Request,
     status_filter: Optional[str] = Query("active", description="Filter by status"),
@@ -430,12 +489,13 @@ async def main(
     floor_id: Optional[str] = Query(None, description="Filter by floor ID"),
     shape: Optional[str] = Query(None, description="Filter by shape type"),
     name: Optional[str] = Query(None, description="Filter by name (prefix match)"),
-    limit: Optional[int] = Query(100, ge=1, le=1000, description="Limit results (max 1000)"),
+    limit: Optional[int] = Query(None, ge=1, description=f"Limit results (default {DEFAULT_PAGE_SIZE}, max {MAX_PAGE_SIZE}; no limit with stream=true unless set)"),
     skip: Optional[int] = Query(0, ge=0, description="Skip results for pagination"),
     sort_by: Optional[str] = Query("name", description="Sort by field"),
     sort_order: Optional[str] = Query("asc", description="Sort order (asc, desc)"),
     light: bool = Query(False, description="Return minimal data for ultra-fast response"),
-    no_cache: bool = Query(False, description="Skip cache for debugging")
+    no_cache: bool = Query(False, description="Skip cache for debugging"),
+    stream: bool = Query(False, description="Stream locations as they are read (uncached, flat memory for large pages)")
 ):
     """Ultra-optimized location endpoint with sub-20ms cached responses"""
     
@@ -446,97 +506,66 @@ async def main(
     
     start_time = time.perf_counter()
     
-    # Generate cache key
     shape_value = shape.value if shape else None
+    if stream:
+        return stream_locations(
+            entity_uuid, status_filter, category, floor_id, shape_value, name,
+            limit, skip or 0, sort_by or "name", sort_order or "asc", light,
+            headers={"X-Cache": "BYPASS"}
+        )
+
+    # Pages are bounded; only a stream may read every location
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    elif limit > MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=422,
+            detail=f"limit may be at most {MAX_PAGE_SIZE}; use stream=true to read more"
+        )
+
+    # Generate cache key
     cache_key = generate_location_cache_key(
         entity_uuid, status_filter or "active", category, floor_id, 
         shape_value, name, limit, skip or 0, sort_by or "name", 
         sort_order or "asc", light
     )
-    
-    if not no_cache:
-        # Layer 1: Check in-memory cache first (ultra-fast)
-        memory_start = time.perf_counter()
-        cached_data = get_from_location_memory_cache(cache_key)
-        if cached_data:
-            memory_time = (time.perf_counter() - memory_start) * 1000
-            total_time = (time.perf_counter() - start_time) * 1000
-            logger.info(f"LOC MEMORY HIT: {cache_key[:30]}... | Memory: {memory_time:.1f}ms | Total: {total_time:.1f}ms")
-            
-            return JSONResponse(
-                content=cached_data,
-                headers={
-                    "X-Cache": "MEMORY", 
-                    "X-Response-Time": f"{total_time:.1f}ms",
-                    "X-Records": str(len(cached_data.get('data', [])))
-                }
-            )
 
-        # Layer 2: Check Redis cache
-        redis_start = time.perf_counter()
-        try:
-            cached_data = await get_cache_fast(cache_key)
-            
-            if cached_data:
-                redis_time = (time.perf_counter() - redis_start) * 1000
-                total_time = (time.perf_counter() - start_time) * 1000
-                
-                # Add to memory cache for next time
-                add_to_location_memory_cache(cache_key, cached_data)
-                
-                logger.info(f"LOC REDIS HIT: {cache_key[:30]}... | Redis: {redis_time:.1f}ms | Total: {total_time:.1f}ms")
-                
-                return JSONResponse(
-                    content=cached_data,
-                    headers={
-                        "X-Cache": "REDIS", 
-                        "X-Response-Time": f"{total_time:.1f}ms",
-                        "X-Records": str(len(cached_data.get('data', [])))
-                    }
-                )
-        except Exception as e:
-            logger.warning(f"Redis cache failed: {e}")
-
-        redis_time = (time.perf_counter() - redis_start) * 1000
-        logger.info(f"LOC CACHE MISS: {cache_key[:30]}... | Cache check: {redis_time:.1f}ms")
-
-    # Layer 3: Database query
-    try:
+    cache_ttl = _cache_ttl(category, floor_id, name)
+
+    db_time = None
+
+    async def load_locations():
+        nonlocal db_time
         db_start = time.perf_counter()
-        response = await get_locations_optimized(
+        body = await load_locations_body(
             entity_uuid, status_filter, category, floor_id, shape_value, name,
             limit, skip or 0, sort_by or "name", sort_order or "asc", light
         )
         db_time = (time.perf_counter() - db_start) * 1000
+        return body
 
-        # Cache the response asynchronously (don't block)
-        if not no_cache:
-            # Smart TTL based on query type
-            if name or category:
-                cache_ttl = 900  # 15 minutes for searches
-            elif floor_id:
-                cache_ttl = 1800  # 30 minutes for floor-specific
-            else:
-                cache_ttl = 3600  # 1 hour for general queries
-                
-            set_cache_background(cache_key, response, expire=cache_ttl)
-            
-            # Add to memory cache immediately
-            add_to_location_memory_cache(cache_key, response)
+    try:
+        if no_cache:
+            body, cache_source = await load_locations(), "MISS"
+        else:
+            # Memory -> Redis -> database, concurrent misses share one query
+            body, cache_source = await location_cache.get_or_load(
+                cache_key, load_locations, ttl=cache_ttl, tags=_cache_tags(entity_uuid, floor_id)
+            )
 
         total_time = (time.perf_counter() - start_time) * 1000
-        record_count = len(response.get('data', []))
-        logger.info(f"LOC DB QUERY: {cache_key[:30]}... | DB: {db_time:.1f}ms | Total: {total_time:.1f}ms | Records: {record_count}")
-
-        return JSONResponse(
-            content=response,
-            headers={
-                "X-Cache": "MISS",
-                "X-Response-Time": f"{total_time:.1f}ms",
-                "X-DB-Time": f"{db_time:.1f}ms",
-                "X-Records": str(record_count)
-            }
-        )
+        record_count = body.headers["X-Records"]
+        headers = {
+            "X-Cache": cache_source,
+            "X-Response-Time": f"{total_time:.1f}ms",
+        }
+        if db_time is not None:
+            headers["X-DB-Time"] = f"{db_time:.1f}ms"
+            logger.info(f"LOC DB QUERY: {cache_key[:30]}... | DB: {db_time:.1f}ms | Total: {total_time:.1f}ms | Records: {record_count}")
+        else:
+            logger.info(f"LOC {cache_source} HIT: {cache_key[:30]}... | Total: {total_time:.1f}ms")
+
+        return body.response(request, headers)
 
     except HTTPException:
         raise
@@ -549,19 +578,29 @@ async def main(
         )
 
 # Cache management utilities
+async def _warm_query(entity_uuid: str, status_filter: str, category: Optional[str],
+                      floor_id: Optional[str], limit: int, light: bool = False):
+    """Load one query into the cache exactly as `main` would with default paging/sorting"""
+    cache_key = generate_location_cache_key(
+        entity_uuid, status_filter, category, floor_id, None, None,
+        limit, 0, "name", "asc", light
+    )
+    await location_cache.get_or_load(
+        cache_key,
+        lambda: load_locations_body(
+            entity_uuid, status_filter, category, floor_id, None, None,
+            limit, 0, "name", "asc", light
+        ),
+        ttl=_cache_ttl(category, floor_id, None),
+        tags=_cache_tags(entity_uuid, floor_id)
+    )
+
 async def warm_location_cache_by_floor(entity_uuid: str, floor_ids: List[str]):
     """Pre-warm cache for specific floors"""
-    for floor_id in floor_ids[:5]:  # Limit to 5 floors
-        try:
-            cache_key = generate_location_cache_key(
-                entity_uuid, "active", None, floor_id, None, None,
-                100, 0, "name", "asc", False
-            )
-            if not get_from_location_memory_cache(cache_key):
-                logger.info(f"Warming location cache for floor {floor_id}")
-                # You can trigger the actual query here if needed
-        except Exception as e:
-            logger.warning(f"Failed to warm cache for floor {floor_id}: {e}")
+    await cache_warmer.run_bounded(
+        functools.partial(_warm_query, entity_uuid, "active", None, floor_id, 100)
+        for floor_id in floor_ids
+    )
 
 async def warm_common_location_queries(entity_uuid: str):
     """Pre-warm cache for common location queries"""
@@ -572,51 +611,29 @@ async def warm_common_location_queries(entity_uuid: str):
         {"status_filter": "active", "category": "meeting", "limit": 50},
     ]
     
-    for query in common_queries:
-        try:
-            cache_key = generate_location_cache_key(
-                entity_uuid, 
-                query.get("status_filter", "active"),
-                query.get("category"),
-                None,  # floor_id
-                None,  # shape
-                None,  # name
-                query.get("limit", 100),
-                0,     # skip
-                "name",  # sort_by
-                "asc",   # sort_order
-                query.get("light", False)
-            )
-            
-            if not get_from_location_memory_cache(cache_key):
-                logger.info(f"Warming common location query cache")
-                # You can trigger the actual query here if needed
-                
-        except Exception as e:
-            logger.warning(f"Cache warming failed: {e}")
+    await cache_warmer.run_bounded(
+        functools.partial(
+            _warm_query, entity_uuid, query["status_filter"], query.get("category"),
+            None, query["limit"], query.get("light", False)
+        )
+        for query in common_queries
+    )
+
+async def _warm_building(building: Building, floor_ids: List[str]):
+    if building.entity_uuid:
+        await asyncio.gather(
+            warm_location_cache_by_floor(building.entity_uuid, floor_ids),
+            warm_common_location_queries(building.entity_uuid),
+        )
+
+cache_warmer.register("location", _warm_building)
 
 async def get_location_cache_stats():
     """Get location cache performance statistics"""
-    return {
-        "location_memory_cache_size": len(_LOCATION_MEMORY_CACHE),
-        "location_cache_keys_sample": _LOCATION_CACHE_ACCESS_ORDER[-5:],
-        "location_memory_cache_max": MAX_LOCATION_MEMORY_CACHE,
-        "cache_hit_potential": f"{min(len(_LOCATION_MEMORY_CACHE), MAX_LOCATION_MEMORY_CACHE)}/{MAX_LOCATION_MEMORY_CACHE}"
-    }
+    return location_cache.stats()
 
 # Bulk cache invalidation for when locations change
 async def invalidate_location_cache_by_floor(floor_id: str):
-    """Invalidate all cached queries for a specific floor"""
-    global _LOCATION_MEMORY_CACHE, _LOCATION_CACHE_ACCESS_ORDER
-    
-    keys_to_remove = []
-    for key in _LOCATION_MEMORY_CACHE.keys():
-        if floor_id in key:  # Simple floor_id matching in cache key
-            keys_to_remove.append(key)
-    
-    for key in keys_to_remove:
-        _LOCATION_MEMORY_CACHE.pop(key, None)
-        if key in _LOCATION_CACHE_ACCESS_ORDER:
-            _LOCATION_CACHE_ACCESS_ORDER.remove(key)
-    
-    logger.info(f"Invalidated {len(keys_to_remove)} location cache entries for floor {floor_id}")
\ No newline at end of file
+    """Invalidate all cached queries for a specific floor, in every worker"""
+    removed = await invalidate_tags(floor_tag(floor_id))
+    logger.info(f"Invalidated {removed} location cache entries for floor {floor_id}")
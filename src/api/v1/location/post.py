@@ -5,6 +5,9 @@ import time
 import logging
 from src.datamodel.database.domain.DigitalSignage import Location, ShapeType, LocationType
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.navigation_service import navigation_service
+from src.common.cache import invalidate_tags, LOCATIONS, location_tag, floor_tag
+from src.services import change_log
 
 
 logger = logging.getLogger(__name__)
@@ -157,12 +160,18 @@ async def main(
         # Save to database
         await new_location.insert()
 
+        # Patch the resident navigation graph
+        await navigation_service.on_location_saved(new_location)
+
         # Update floor's locations list (NEW FUNCTIONALITY)
         if new_location.location_id not in floor.locations:
             floor.locations.append(new_location.location_id)
             # floor.updated_by = location_data.created_by
             floor.update_on = time.time()
             await floor.save()
+
+        await invalidate_tags(LOCATIONS, location_tag(new_location.location_id), floor_tag(new_location.floor_id))
+        await change_log.record_floor_changes(change_log.LOCATION, upserts=[(new_location.location_id, new_location.floor_id)])
         
         logger.info(f"Location created successfully: {new_location.location_id} on floor: {location_data.floor_id}")
 
@@ -0,0 +1,69 @@
+from fastapi import HTTPException, status
+from pydantic import BaseModel, Field
+from typing import Optional, List
+import time
+import logging
+from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.navigation_service import navigation_service
+
+logger = logging.getLogger(__name__)
+
+def api_config():
+    config = {
+        "path": "",
+        "status_code": 200,
+        "tags": ["Navigation"],
+        "summary": "Route Matrix",
+        "response_model": dict,
+        "description": "Distance and estimated time from one or more origins to many destinations in a single call (e.g. a kiosk directory page). Geometry is optional.",
+        "response_description": "Per-origin list of per-destination distance and ETA",
+        "deprecated": False,
+    }
+    return ApiConfig(**config)
+
+class RouteMatrixRequest(BaseModel):
+    origin_ids: List[str] = Field(..., min_length=1, max_length=50, description="Location IDs the routes start from")
+    destination_ids: List[str] = Field(..., min_length=1, max_length=2000, description="Location IDs to route to")
+    building_id: Optional[str] = Field(None, description="Building of the locations; skips the location lookup when provided")
+    preferred_connector_type: Optional[str] = Field(None, description="Preferred vertical connector type (elevator, stairs, escalator)")
+    include_geometry: bool = Field(False, description="Include the full route (segments and transitions) per destination")
+    accessible: bool = Field(False, description="Only use step-free connectors (elevators, ramps)")
+
+async def main(matrix_request: RouteMatrixRequest):
+    try:
+        start_time = time.perf_counter()
+
+        rows = await navigation_service.find_route_matrix(
+            origin_ids=matrix_request.origin_ids,
+            destination_ids=matrix_request.destination_ids,
+            building_id=matrix_request.building_id,
+            preferred_connector_type=matrix_request.preferred_connector_type,
+            include_geometry=matrix_request.include_geometry,
+            accessible=matrix_request.accessible,
+        )
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            f"Route matrix {len(matrix_request.origin_ids)}x{len(matrix_request.destination_ids)} "
+            f"computed in {elapsed_ms:.1f}ms"
+        )
+
+        return {
+            "status": "success",
+            "message": "Route matrix computed successfully",
+            "data": rows
+        }
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error computing route matrix: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to compute route matrix: {str(e)}"
+        )
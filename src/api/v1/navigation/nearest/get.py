@@ -0,0 +1,64 @@
+from fastapi import HTTPException, Query, status
+from typing import Optional
+import logging
+
+from src.datamodel.database.domain.DigitalSignage import LocationType
+from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.navigation_service import navigation_service
+
+logger = logging.getLogger(__name__)
+
+
+def api_config():
+    config = {
+        "path": "",
+        "status_code": 200,
+        "tags": ["Navigation"],
+        "summary": "Nearest Location of a Category",
+        "response_model": dict,
+        "description": "Find the k closest locations of a category (restroom, ATM, first aid, emergency exit, ...) from a location, by travel time, in a single search.",
+        "response_description": "Closest locations with distance, ETA and optional route",
+        "deprecated": False,
+    }
+    return ApiConfig(**config)
+
+
+async def main(
+    location_id: str = Query(..., description="Location the visitor is at"),
+    category: LocationType = Query(..., description="Category to look for"),
+    k: int = Query(1, ge=1, le=20, description="Number of closest locations to return"),
+    building_id: Optional[str] = Query(None, description="Building of the location; skips the location lookup when provided"),
+    preferred_connector_type: Optional[str] = Query(None, description="Preferred vertical connector type (elevator, stairs, escalator)"),
+    accessible: bool = Query(False, description="Only use step-free connectors (elevators, ramps)"),
+    include_geometry: bool = Query(True, description="Include the full route to each result"),
+):
+    try:
+        nearest = await navigation_service.nearest_of_category(
+            location_id=location_id,
+            category=category,
+            k=k,
+            building_id=building_id,
+            preferred_connector_type=preferred_connector_type,
+            accessible=accessible,
+            include_geometry=include_geometry,
+        )
+
+        return {
+            "status": "success",
+            "message": f"Found {len(nearest)} nearest {category.value} location(s)",
+            "data": nearest,
+        }
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error finding nearest {category}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to find nearest location: {str(e)}",
+        )
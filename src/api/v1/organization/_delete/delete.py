@@ -187,7 +187,7 @@
 #     return await delete_organization(entity_uuid, user_uuid, db)
 
 
-from fastapi import HTTPException, Depends, Request, status
+from fastapi import HTTPException, Depends, Query, Request, status
 import logging
 from bson import ObjectId
 import asyncio
@@ -200,6 +200,9 @@ from src.core.database.dbs.getdb import postresql as db
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.services.permit.permit_service import PermitService
+from src.services.cascade_delete import delete_entity_members
+from src.services.job_queue import job_queue, accepted_response
+from src.core.database.dbs.postgresql.connect import AsyncSessionLocal
 from sqlalchemy import select
 import time
 from src.core.middleware.token_validate_middleware import validate_token
@@ -221,7 +224,36 @@ def api_config():
     }
     return ApiConfig(**config)
 
-async def delete_organization(entity_uuid: str, user_uuid: str, db: AsyncSession):
+async def remove_organization(entity_uuid: str, tenant_key: str, db: AsyncSession) -> Dict[str, int]:
+    # Delete the org from permit.io
+    try:
+        await permit_service.delete_org(tenant_key)
+    except Exception as e:
+        logger.error(f"Error deleting organization from Permit.io: {str(e)}")
+        # Continue with deletion even if Permit.io deletion fails
+
+    # Role mappings, users not linked to any other entity, then the entity - one transaction
+    deleted = await delete_entity_members(db, entity_uuid)
+    await db.commit()
+    logger.info(
+        f"Deleted entity {entity_uuid}: {deleted['role_maps_deleted']} role mappings, "
+        f"{deleted['users_deleted']} users"
+    )
+    return deleted
+
+async def _delete_organization_job(payload: Dict[str, str]) -> Dict[str, int]:
+    # The request's session is gone by now: the job opens its own
+    async with AsyncSessionLocal() as session:
+        try:
+            return await remove_organization(payload["entity_uuid"], payload["tenant_key"], session)
+        except Exception:
+            await session.rollback()
+            raise
+
+DELETE_ORGANIZATION_JOB = "organization.delete"
+job_queue.register(DELETE_ORGANIZATION_JOB, _delete_organization_job)
+
+async def delete_organization(entity_uuid: str, user_uuid: str, db: AsyncSession, background: bool = False):
     try:
         # Check Super Admin access
         query = select(UserEntityRoleMap).where(
@@ -246,54 +278,16 @@ async def delete_organization(entity_uuid: str, user_uuid: str, db: AsyncSession
         # Store entity information before deletion
         entity_type = tenant.entity_type
         parent_uuid = tenant.parent_uuid
-        
-        # Get all users linked to this entity
-        user_roles_query = select(UserEntityRoleMap).where(UserEntityRoleMap.entity_uuid == entity_uuid)
-        user_roles_result = await db.execute(user_roles_query)
-        user_roles = user_roles_result.scalars().all()
-        
-        user_uuids = [ur.user_uuid for ur in user_roles]
 
-        # Delete the org from permit.io
-        try:
-            await permit_service.delete_org(tenant_key)
-        except Exception as e:
-            logger.error(f"Error deleting organization from Permit.io: {str(e)}")
-            # Continue with deletion even if Permit.io deletion fails
-
-        # Delete all User-Role mappings for this entity - FIRST TRANSACTION
-        for user_role in user_roles:
-            await db.delete(user_role)
-        
-        # Commit the deletion of mappings before proceeding
-        await db.commit()
-
-        # Delete users only if they're not linked to any other entity - SECOND TRANSACTION
-        for user_uuid in set(user_uuids):
-            # Check if user is linked elsewhere
-            linked_query = select(UserEntityRoleMap).where(
-                UserEntityRoleMap.user_uuid == user_uuid,
-                UserEntityRoleMap.entity_uuid != entity_uuid
+        if background:
+            job = await job_queue.submit(
+                DELETE_ORGANIZATION_JOB, {"entity_uuid": entity_uuid, "tenant_key": tenant_key},
+                entity_uuid=entity_uuid, created_by=user_uuid
             )
-            linked_result = await db.execute(linked_query)
-            is_linked_elsewhere = linked_result.scalars().first()  # Use scalars().first() here too
-            
-            if not is_linked_elsewhere:
-                # Delete the user if not linked elsewhere
-                user_query = select(User).where(User.user_uuid == user_uuid)
-                user_result = await db.execute(user_query)
-                user = user_result.scalar_one_or_none()  # This is fine as we expect only one user
-                
-                if user:
-                    await db.delete(user)
-        
-        # Commit user deletions
-        await db.commit()
+            return accepted_response(job, f"Organization delete queued as job {job['job_id']}")
+
+        await remove_organization(entity_uuid, tenant_key, db)
 
-        # Delete the entity itself - THIRD TRANSACTION
-        await db.delete(tenant)
-        await db.commit()
-        
         response = {
             "message": "Entity and associated users and role mappings deleted successfully"
         }
@@ -308,7 +302,12 @@ async def delete_organization(entity_uuid: str, user_uuid: str, db: AsyncSession
         logger.error(f"Error while deleting organization: {str(e)}")
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
-async def main(entity_uuid: str, request: Request, db: AsyncSession = Depends(db)):
+async def main(
+    entity_uuid: str,
+    request: Request,
+    background: bool = Query(False, description="Run in the background and return a job id to poll at /v1/job/{job_id}"),
+    db: AsyncSession = Depends(db),
+):
     # Get entity_uuid from request
     validate_token_start = time.time()
     
@@ -320,4 +319,4 @@ async def main(entity_uuid: str, request: Request, db: AsyncSession = Depends(db
     validate_token_time = time.time() - validate_token_start
     logger.info(f"PERFORMANCE: Token validation took {validate_token_time:.4f} seconds")
     
-    return await delete_organization(entity_uuid, user_uuid, db)
+    return await delete_organization(entity_uuid, user_uuid, db, background)
@@ -5,6 +5,9 @@ import logging
 
 from src.datamodel.database.domain.DigitalSignage import Path, Floor
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.navigation_service import navigation_service
+from src.common.cache import invalidate_tags, PATHS, path_tag, building_list_tag
+from src.services import change_log
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +51,9 @@ async def main(
             path.updated_by = updated_by
         path.update_on = time.time()
         await path.save()
+        await navigation_service.on_path_saved(path)
+        await invalidate_tags(PATHS, path_tag(path_id), building_list_tag(PATHS, path.building_id))
+        await change_log.record_changes(path.building_id, change_log.PATH, upserts=[path.path_id], floor_ids=path.floors)
 
         # Remove path_id from related floors' paths arrays
         floors_updated = 0
@@ -174,48 +174,31 @@
 #         )
 
 
-from fastapi import HTTPException, Path as FastAPIPath, status, Query
-from fastapi.responses import JSONResponse
+from fastapi import HTTPException, Path as FastAPIPath, status, Query, Request
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import logging
 import time
 import hashlib
 import asyncio
+import functools
 
-from src.datamodel.database.domain.DigitalSignage import Path, Location, VerticalConnector, Floor, NodeKind
+from src.datamodel.database.domain.DigitalSignage import Building, Path, Location, VerticalConnector, Floor, NodeKind
 from src.datamodel.datavalidation.apiconfig import ApiConfig
-from src.common.redis_utils import get_cache_fast, set_cache_fast, get_compressed_cache, set_cache_background
+from src.common.cache import TwoTierCache, CachedBody, building_tag, floor_tag, location_tag, path_tag
+from src.services.cache_warmer import cache_warmer
 
 logger = logging.getLogger(__name__)
 
-# Ultra-fast in-memory cache for paths (most frequently accessed)
-_PATH_MEMORY_CACHE: Dict[str, Dict] = {}
-_PATH_CACHE_ACCESS_ORDER = []
+# Memory + Redis cache for path details; unknown path ids are cached as misses
 MAX_PATH_MEMORY_CACHE = 50  # Smaller cache for detailed data
-
-def add_to_path_memory_cache(key: str, data: Dict):
-    """Ultra-fast in-memory cache for path data"""
-    global _PATH_MEMORY_CACHE, _PATH_CACHE_ACCESS_ORDER
-    
-    if key in _PATH_MEMORY_CACHE:
-        _PATH_CACHE_ACCESS_ORDER.remove(key)
-    elif len(_PATH_MEMORY_CACHE) >= MAX_PATH_MEMORY_CACHE:
-        # Remove oldest entry
-        oldest = _PATH_CACHE_ACCESS_ORDER.pop(0)
-        del _PATH_MEMORY_CACHE[oldest]
-    
-    _PATH_MEMORY_CACHE[key] = data
-    _PATH_CACHE_ACCESS_ORDER.append(key)
-
-def get_from_path_memory_cache(key: str) -> Optional[Dict]:
-    """Get from path in-memory cache"""
-    if key in _PATH_MEMORY_CACHE:
-        # Move to end (most recently used)
-        _PATH_CACHE_ACCESS_ORDER.remove(key)
-        _PATH_CACHE_ACCESS_ORDER.append(key)
-        return _PATH_MEMORY_CACHE[key]
-    return None
+path_cache = TwoTierCache(
+    "path",
+    max_entries=MAX_PATH_MEMORY_CACHE,
+    max_bytes=16 * 1024 * 1024,
+    ttl=1800,
+    negative_ttl=60,
+)
 
 def _dump_without_object_id(doc):
     """Optimized document dumping without ObjectId"""
@@ -250,7 +233,20 @@ def generate_path_cache_key(path_id: str, include_details: bool = True) -> str:
     """Generate optimized cache key for paths"""
     # Use shorter key format
     suffix = "full" if include_details else "light"
-    return f"p:{path_id[-12:]}:{suffix}"  # "p:" prefix for path
+    return f"p2:{path_id[-12:]}:{suffix}"  # "p2:" prefix for path (pre-encoded bodies)
+
+def _path_cache_tags(path_id: str, response: Optional[Dict[str, Any]]) -> List[str]:
+    """The path plus every entity its detail response embeds"""
+    tags = [path_tag(path_id)]
+    if response:
+        data = response["data"]
+        tags.append(building_tag(data["building_id"]))
+        tags.extend(location_tag(location_id) for location_id in (data["start_point_id"], data["end_point_id"]))
+        tags.extend(floor_tag(floor_id) for floor_id in data.get("floors") or [])
+    return tags
+
+def _cache_ttl(light: bool) -> int:
+    return 1800 if light else 3600  # 30min for light, 1hr for full
 
 def api_config():
     config = {
@@ -507,7 +503,19 @@ async def get_vertical_connectors_optimized(path) -> List[Dict]:
         logger.warning(f"Error getting vertical connectors: {e}")
         return []
 
+async def load_path_body(path_id: str, light: bool = False) -> Optional[CachedBody]:
+    """Response body encoded once, tagged with what it embeds; None when the path does not exist"""
+    try:
+        response = await get_path_with_details_optimized(path_id, include_full_details=not light)
+    except HTTPException as e:
+        if e.status_code == status.HTTP_404_NOT_FOUND:
+            return None
+        raise
+    response["data"] = response["data"].model_dump()
+    return CachedBody.encode(response, tags=_path_cache_tags(path_id, response))
+
 async def main(
+    request: Request,
     path_id: str = FastAPIPath(..., description="Path ID to retrieve"),
     light: bool = Query(False, description="Return minimal data for faster response"),
     no_cache: bool = Query(False, description="Skip cache for debugging"),
@@ -518,69 +526,40 @@ async def main(
     # Generate cache key
     cache_key = generate_path_cache_key(path_id, include_details=not light)
     
-    if not no_cache:
-        # Layer 1: Check in-memory cache first
-        memory_start = time.perf_counter()
-        cached_data = get_from_path_memory_cache(cache_key)
-        if cached_data:
-            memory_time = (time.perf_counter() - memory_start) * 1000
-            total_time = (time.perf_counter() - start_time) * 1000
-            logger.info(f"PATH MEMORY HIT: {path_id} | Memory: {memory_time:.1f}ms | Total: {total_time:.1f}ms")
-            
-            return JSONResponse(
-                content=cached_data,
-                headers={"X-Cache": "MEMORY", "X-Response-Time": f"{total_time:.1f}ms"}
-            )
+    db_time = None
 
-        # Layer 2: Check Redis cache
-        redis_start = time.perf_counter()
+    async def load_path():
+        nonlocal db_time
+        db_start = time.perf_counter()
         try:
-            cached_data = await get_cache_fast(cache_key)
-            
-            if cached_data:
-                redis_time = (time.perf_counter() - redis_start) * 1000
-                total_time = (time.perf_counter() - start_time) * 1000
-                
-                # Add to memory cache for next time
-                add_to_path_memory_cache(cache_key, cached_data)
-                
-                logger.info(f"PATH REDIS HIT: {path_id} | Redis: {redis_time:.1f}ms | Total: {total_time:.1f}ms")
-                
-                return JSONResponse(
-                    content=cached_data,
-                    headers={"X-Cache": "REDIS", "X-Response-Time": f"{total_time:.1f}ms"}
-                )
-        except Exception as e:
-            logger.warning(f"Redis cache failed for path {path_id}: {e}")
-
-        redis_time = (time.perf_counter() - redis_start) * 1000
-        logger.info(f"PATH CACHE MISS: {path_id} | Cache check: {redis_time:.1f}ms")
+            return await load_path_body(path_id, light)
+        finally:
+            db_time = (time.perf_counter() - db_start) * 1000
 
-    # Layer 3: Database query
     try:
-        db_start = time.perf_counter()
-        response = await get_path_with_details_optimized(path_id, include_full_details=not light)
-        db_time = (time.perf_counter() - db_start) * 1000
+        if no_cache:
+            body, cache_source = await load_path(), "MISS"
+        else:
+            # Memory -> Redis -> database, concurrent misses share one query
+            body, cache_source = await path_cache.get_or_load(
+                cache_key, load_path, ttl=_cache_ttl(light), tags=[path_tag(path_id)]
+            )
 
-        # Cache the response asynchronously (don't block)
-        if not no_cache:
-            cache_ttl = 1800 if light else 3600  # 30min for light, 1hr for full
-            set_cache_background(cache_key, response, expire=cache_ttl)
-            
-            # Add to memory cache immediately
-            add_to_path_memory_cache(cache_key, response)
+        if body is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Path with ID '{path_id}' not found",
+            )
 
         total_time = (time.perf_counter() - start_time) * 1000
-        logger.info(f"PATH DB QUERY: {path_id} | DB: {db_time:.1f}ms | Total: {total_time:.1f}ms")
-
-        return JSONResponse(
-            content=response,
-            headers={
-                "X-Cache": "MISS",
-                "X-Response-Time": f"{total_time:.1f}ms",
-                "X-DB-Time": f"{db_time:.1f}ms"
-            }
-        )
+        headers = {"X-Cache": cache_source, "X-Response-Time": f"{total_time:.1f}ms"}
+        if db_time is not None:
+            headers["X-DB-Time"] = f"{db_time:.1f}ms"
+            logger.info(f"PATH DB QUERY: {path_id} | DB: {db_time:.1f}ms | Total: {total_time:.1f}ms")
+        else:
+            logger.info(f"PATH {cache_source} HIT: {path_id} | Total: {total_time:.1f}ms")
+
+        return body.response(request, headers)
 
     except HTTPException:
         raise
@@ -595,20 +574,25 @@ async def main(
 # Utility functions for cache management
 async def warm_path_cache(path_ids: List[str]):
     """Pre-warm cache for frequently accessed paths"""
-    for path_id in path_ids[:10]:  # Limit warming
-        try:
-            cache_key = generate_path_cache_key(path_id)
-            if not get_from_path_memory_cache(cache_key):
-                logger.info(f"Warming path cache for {path_id}")
-                # You can call the main function here to warm the cache
-                # await get_path_with_details_optimized(path_id)
-        except Exception as e:
-            logger.warning(f"Failed to warm cache for path {path_id}: {e}")
+    def warm(path_id: str):
+        return path_cache.get_or_load(
+            generate_path_cache_key(path_id),
+            lambda: load_path_body(path_id),
+            ttl=_cache_ttl(False),
+            tags=[path_tag(path_id)]
+        )
+
+    await cache_warmer.run_bounded(functools.partial(warm, path_id) for path_id in path_ids)
+
+async def _warm_building(building: Building, floor_ids: List[str]):
+    # Kiosks only ever request published paths
+    paths = await Path.find(
+        {"building_id": building.building_id, "status": "active", "is_published": True}
+    ).to_list()
+    await warm_path_cache([path.path_id for path in paths])
+
+cache_warmer.register("path", _warm_building)
 
 async def get_path_cache_stats():
     """Get path cache performance statistics"""
-    return {
-        "path_memory_cache_size": len(_PATH_MEMORY_CACHE),
-        "path_cache_keys": _PATH_CACHE_ACCESS_ORDER[-5:],  # Last 5 keys
-        "path_memory_cache_max": MAX_PATH_MEMORY_CACHE
-    }
\ No newline at end of file
+    return path_cache.stats()
\ No newline at end of file
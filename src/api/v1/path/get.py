@@ -116,6 +116,7 @@
 
 
 from fastapi import HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List
 import logging
@@ -133,6 +134,8 @@ from src.common.redis_utils import (
     set_multi_cache_fast,
     set_cache_background
 )
+from src.common.cache import PATHS, location_tag, building_list_tag
+from src.common.streaming import STREAM_ITEMS, STREAM_COUNT, STREAM_BATCH_SIZE, streaming_json_response
 
 logger = logging.getLogger(__name__)
 
@@ -184,6 +187,11 @@ def _generate_cache_key(filter_query: dict, prefix: str = "paths") -> str:
     query_hash = hashlib.md5(sorted_filters.encode()).hexdigest()[:12]
     return f"{prefix}:{query_hash}"
 
+def _list_tags(filter_query: dict) -> List[str]:
+    # Path writes drop their building's path lists; only unscoped lists use the PATHS tag
+    building_id = filter_query.get("building_id")
+    return [building_list_tag(PATHS, building_id) if building_id else PATHS]
+
 async def _get_location_names_cached(location_ids: set) -> dict:
     """Get location names with multi-level caching using your Redis utils"""
     if not location_ids:
@@ -220,7 +228,10 @@ async def _get_location_names_cached(location_ids: set) -> dict:
             
             # Cache new location names using your multi-set function
             if new_cache_data:
-                await set_multi_cache_fast(new_cache_data, expire=CACHE_TTL["locations"])
+                await set_multi_cache_fast(
+                    new_cache_data, expire=CACHE_TTL["locations"],
+                    tags={key: [location_tag(key.split(":", 1)[1])] for key in new_cache_data}
+                )
                 
         except Exception as e:
             logger.error(f"Error fetching locations from database: {e}")
@@ -259,7 +270,7 @@ async def _get_paths_cached(filter_query: dict) -> List[Path]:
                     continue
             
             # Use background caching to avoid blocking
-            await set_cache_background(cache_key, path_dicts, expire=CACHE_TTL["paths"])
+            await set_cache_background(cache_key, path_dicts, expire=CACHE_TTL["paths"], tags=_list_tags(filter_query))
         
         return paths
         
@@ -267,10 +278,80 @@ async def _get_paths_cached(filter_query: dict) -> List[Path]:
         logger.error(f"Error fetching paths from database: {e}")
         return []
 
+def _endpoint_ids(paths: List[Path]) -> set:
+    """Unique start/end location IDs of `paths`"""
+    location_ids = set()
+    for p in paths:
+        if getattr(p, "start_point_id", None):
+            location_ids.add(p.start_point_id)
+        if getattr(p, "end_point_id", None):
+            location_ids.add(p.end_point_id)
+    return location_ids
+
+def _path_list_item(p: Path, location_names: dict) -> Optional[PathListItem]:
+    try:
+        return PathListItem(
+            path_id=p.path_id,
+            name=getattr(p, 'name', None),
+            building_id=p.building_id,
+            created_by=getattr(p, 'created_by', None),
+            start_point_id=p.start_point_id,
+            end_point_id=p.end_point_id,
+            start_point_name=location_names.get(p.start_point_id),
+            end_point_name=location_names.get(p.end_point_id),
+            is_published=getattr(p, 'is_published', False),
+            is_multifloor=getattr(p, 'is_multifloor', False),
+            floors=getattr(p, 'floors', []) or [],
+            connector_shared_ids=getattr(p, 'connector_shared_ids', []) or [],
+            floor_segments=getattr(p, 'floor_segments', []) or [],
+            tags=getattr(p, 'tags', []) or [],
+            datetime=p.datetime,
+            status=p.status,
+        )
+    except Exception as e:
+        logger.warning(f"Error creating PathListItem for path {getattr(p, 'path_id', 'unknown')}: {e}")
+        return None
+
+def _stream_paths(filter_query: dict, filters_applied: dict) -> StreamingResponse:
+    """
+    Same body as the cached list, encoded off the cursor. Endpoint names are
+    resolved per batch of STREAM_BATCH_SIZE paths, so only one batch of
+    documents (with their floor_segments) is held at a time.
+    """
+    async def batch_items(batch: List[Path]):
+        location_names = await _get_location_names_cached(_endpoint_ids(batch))
+        for p in batch:
+            item = _path_list_item(p, location_names)
+            if item is not None:
+                yield item.dict()
+
+    async def items():
+        batch: List[Path] = []
+        async for p in Path.find(filter_query):
+            batch.append(p)
+            if len(batch) >= STREAM_BATCH_SIZE:
+                async for item in batch_items(batch):
+                    yield item
+                batch = []
+        async for item in batch_items(batch):
+            yield item
+
+    template = {
+        "status": "success",
+        "message": "Retrieved paths",
+        "data": {
+            "paths": STREAM_ITEMS,
+            "count": STREAM_COUNT,
+            "filters_applied": filters_applied,
+        },
+    }
+    return streaming_json_response(template, items(), headers={"X-Cache": "BYPASS"})
+
 async def main(
     building_id: Optional[str] = Query(None, description="Filter by building ID"),
     created_by: Optional[str] = Query(None, description="Filter by creator"),
     is_multi_floor: Optional[bool] = Query(None, description="True for multi-floor paths, False for single-floor"),
+    stream: bool = Query(False, description="Stream paths as they are read (uncached, flat memory for large lists)"),
 ):
     try:
         # Build filter query
@@ -282,6 +363,13 @@ async def main(
         if is_multi_floor is not None:
             filter_query["is_multifloor"] = is_multi_floor
 
+        if stream:
+            return _stream_paths(filter_query, {
+                "building_id": building_id,
+                "created_by": created_by,
+                "is_multi_floor": is_multi_floor,
+            })
+
         # Generate cache key for final result
         result_cache_key = _generate_cache_key(filter_query, "paths_result")
         
@@ -289,7 +377,8 @@ async def main(
         cached_result = await get_cache_fast(result_cache_key)
         if cached_result is not None:
             logger.info(f"Returning cached result for: {result_cache_key}")
-            return cached_result
+            # Returned as a response so FastAPI skips jsonable_encoder on the (already plain) dict
+            return ORJSONResponse(cached_result, headers={"X-Cache": "HIT"})
 
         # Get paths (with caching)
         paths = await _get_paths_cached(filter_query)
@@ -309,46 +398,18 @@ async def main(
                     },
                 },
             }
-            await set_cache_background(result_cache_key, empty_result, expire=60)  # Cache empty results for 1 minute
-            return empty_result
-
-        # Extract unique location IDs
-        location_ids = set()
-        for p in paths:
-            if getattr(p, "start_point_id", None):
-                location_ids.add(p.start_point_id)
-            if getattr(p, "end_point_id", None):
-                location_ids.add(p.end_point_id)
+            await set_cache_background(result_cache_key, empty_result, expire=60, tags=_list_tags(filter_query))  # Cache empty results for 1 minute
+            return ORJSONResponse(empty_result, headers={"X-Cache": "MISS"})
 
         # Get location names (with caching)
-        location_names = await _get_location_names_cached(location_ids)
+        location_names = await _get_location_names_cached(_endpoint_ids(paths))
 
         # Build response data
         path_list: List[PathListItem] = []
         for p in paths:
-            try:
-                item = PathListItem(
-                    path_id=p.path_id,
-                    name=getattr(p, 'name', None),
-                    building_id=p.building_id,
-                    created_by=getattr(p, 'created_by', None),
-                    start_point_id=p.start_point_id,
-                    end_point_id=p.end_point_id,
-                    start_point_name=location_names.get(p.start_point_id),
-                    end_point_name=location_names.get(p.end_point_id),
-                    is_published=getattr(p, 'is_published', False),
-                    is_multifloor=getattr(p, 'is_multifloor', False),
-                    floors=getattr(p, 'floors', []) or [],
-                    connector_shared_ids=getattr(p, 'connector_shared_ids', []) or [],
-                    floor_segments=getattr(p, 'floor_segments', []) or [],
-                    tags=getattr(p, 'tags', []) or [],
-                    datetime=p.datetime,
-                    status=p.status,
-                )
+            item = _path_list_item(p, location_names)
+            if item is not None:
                 path_list.append(item)
-            except Exception as e:
-                logger.warning(f"Error creating PathListItem for path {getattr(p, 'path_id', 'unknown')}: {e}")
-                continue
 
         # Build final response
         result = {
@@ -366,10 +427,12 @@ async def main(
         }
 
         # Cache the final result in background using your background cache function
-        await set_cache_background(result_cache_key, result, expire=CACHE_TTL["result"])
+        # Results embed endpoint location names, so writes to those locations drop them too
+        tags = _list_tags(filter_query) + [location_tag(location_id) for location_id in _endpoint_ids(paths)]
+        await set_cache_background(result_cache_key, result, expire=CACHE_TTL["result"], tags=tags)
 
         logger.info(f"Successfully retrieved {len(path_list)} paths with filters: {filter_query}")
-        return result
+        return ORJSONResponse(result, headers={"X-Cache": "MISS"})
 
     except Exception as e:
         logger.exception(f"Error retrieving paths: {str(e)}")
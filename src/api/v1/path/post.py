@@ -1,6 +1,6 @@
 from fastapi import HTTPException, status
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import time
 import logging
 
@@ -15,6 +15,9 @@ from src.datamodel.database.domain.DigitalSignage import (
     NodeKind,
 )
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.navigation_service import navigation_service
+from src.common.cache import invalidate_tags, PATHS, path_tag, building_list_tag
+from src.services import change_log
 
 logger = logging.getLogger(__name__)
 
@@ -102,11 +105,11 @@ async def _ensure_building_exists(building_id: str):
 async def _ensure_floors_exist(floor_ids: List[str]):
     if not floor_ids:
         return
-    missing: List[str] = []
-    for fid in set(floor_ids):
-        f = await Floor.find_one({"floor_id": fid, "status": "active"})
-        if not f:
-            missing.append(fid)
+    wanted = set(floor_ids)
+    found = await Floor.get_motor_collection().find(
+        {"floor_id": {"$in": list(wanted)}, "status": "active"}, {"floor_id": 1, "_id": 0}
+    ).to_list(length=None)
+    missing = sorted(wanted - {f["floor_id"] for f in found})
     if missing:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -114,41 +117,60 @@ async def _ensure_floors_exist(floor_ids: List[str]):
         )
 
 
-async def _validate_and_enrich_points(seg: FloorSegment) -> FloorSegment:
-    """Validate referenced entities for a segment's points. Enrich vertical connectors' shared_id if missing."""
+async def _resolve_point_refs(segments: List[FloorSegment]) -> Tuple[Dict[str, dict], Dict[str, dict]]:
+    """All locations and vertical connectors the segments reference, one query per collection, keyed by ID"""
+    location_ids = {p.ref_id for s in segments for p in s.points if p.kind == NodeKind.LOCATION and p.ref_id}
+    connector_ids = {p.ref_id for s in segments for p in s.points if p.kind == NodeKind.VERTICAL_CONNECTOR and p.ref_id}
+    locations: Dict[str, dict] = {}
+    connectors: Dict[str, dict] = {}
+    if location_ids:
+        found = await Location.get_motor_collection().find(
+            {"location_id": {"$in": list(location_ids)}, "status": "active"},
+            {"location_id": 1, "floor_id": 1, "_id": 0},
+        ).to_list(length=None)
+        locations = {loc["location_id"]: loc for loc in found}
+    if connector_ids:
+        found = await VerticalConnector.get_motor_collection().find(
+            {"connector_id": {"$in": list(connector_ids)}, "status": "active"},
+            {"connector_id": 1, "floor_id": 1, "shared_id": 1, "_id": 0},
+        ).to_list(length=None)
+        connectors = {conn["connector_id"]: conn for conn in found}
+    return locations, connectors
+
+
+def _validate_and_enrich_points(seg: FloorSegment, locations: Dict[str, dict],
+                                connectors: Dict[str, dict]) -> FloorSegment:
+    """Validate a segment's points against the resolved references. Enrich vertical connectors' shared_id if missing."""
     enriched_points: List[PathPoint] = []
     for p in seg.points:
         if p.kind == NodeKind.LOCATION:
             if not p.ref_id:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Location point requires ref_id")
-            loc = await Location.find_one({"location_id": p.ref_id, "status": "active"})
+            loc = locations.get(p.ref_id)
             if not loc:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Location with ID '{p.ref_id}' not found",
                 )
             # Optionally validate the location's floor matches segment floor
-            if loc.floor_id != seg.floor_id:
-                logger.warning(f"Location {loc.location_id} belongs to floor {loc.floor_id}, but used on segment floor {seg.floor_id}")
+            if loc.get("floor_id") != seg.floor_id:
+                logger.warning(f"Location {p.ref_id} belongs to floor {loc.get('floor_id')}, but used on segment floor {seg.floor_id}")
 
         elif p.kind == NodeKind.VERTICAL_CONNECTOR:
             if not p.ref_id:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Vertical connector point requires ref_id")
-            conn = await VerticalConnector.find_one({
-                "connector_id": p.ref_id,
-                "status": "active",
-            })
+            conn = connectors.get(p.ref_id)
             if not conn:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Vertical connector with ID '{p.ref_id}' not found",
                 )
             # Best-effort: ensure it's present on this floor
-            if conn.floor_id != seg.floor_id:
-                logger.warning(f"Vertical connector {conn.connector_id} belongs to floor {conn.floor_id}, used on floor {seg.floor_id}")
+            if conn.get("floor_id") != seg.floor_id:
+                logger.warning(f"Vertical connector {p.ref_id} belongs to floor {conn.get('floor_id')}, used on floor {seg.floor_id}")
             # Enrich shared_id if not provided
             if not p.shared_id:
-                p.shared_id = conn.shared_id
+                p.shared_id = conn.get("shared_id")
 
         elif p.kind == NodeKind.WAYPOINT:
             if p.x is None or p.y is None:
@@ -171,10 +193,11 @@ async def main(path_data: PathCreateRequest):
         await _ensure_building_exists(path_data.building_id)
         await _ensure_floors_exist([s.floor_id for s in path_data.floor_segments])
 
-        # Validate and enrich points per segment
+        # Validate and enrich points per segment against one lookup of every referenced location/connector
+        locations, connectors = await _resolve_point_refs(path_data.floor_segments)
         validated_segments: List[FloorSegment] = []
         for seg in sorted(path_data.floor_segments, key=lambda s: s.sequence):
-            validated = await _validate_and_enrich_points(seg)
+            validated = _validate_and_enrich_points(seg, locations, connectors)
             validated_segments.append(validated)
 
         # Create the Path document
@@ -198,15 +221,17 @@ async def main(path_data: PathCreateRequest):
         # Save to database
         await new_path.insert()
 
+        # Patch the resident navigation graph
+        await navigation_service.on_path_saved(new_path)
+        await invalidate_tags(PATHS, path_tag(new_path.path_id), building_list_tag(PATHS, new_path.building_id))
+        await change_log.record_changes(new_path.building_id, change_log.PATH, upserts=[new_path.path_id], floor_ids=new_path.floors)
+
         # Update each floor's paths list
-        unique_floors = set(new_path.floors)
-        for fid in unique_floors:
-            floor = await Floor.find_one({"floor_id": fid, "status": "active"})
-            if floor:
-                if new_path.path_id not in (floor.paths or []):
-                    floor.paths.append(new_path.path_id)
-                floor.update_on = time.time()
-                await floor.save()
+        if new_path.floors:
+            await Floor.get_motor_collection().update_many(
+                {"floor_id": {"$in": list(set(new_path.floors))}, "status": "active"},
+                {"$addToSet": {"paths": new_path.path_id}, "$set": {"update_on": time.time()}},
+            )
 
         logger.info(f"Path created successfully: {new_path.path_id} | multi-floor={new_path.is_multifloor}")
 
@@ -5,6 +5,10 @@ import logging
 
 from src.datamodel.database.domain.DigitalSignage import Path
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.navigation_service import navigation_service
+from src.common.cache import invalidate_tags, PATHS, path_tag, building_list_tag
+from src.services import change_log
+from src.services.cache_warmer import cache_warmer
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +46,11 @@ async def main(
         path.update_on = time.time()
 
         await path.save()
+        await navigation_service.on_path_saved(path)
+        await invalidate_tags(PATHS, path_tag(path_id), building_list_tag(PATHS, path.building_id))
+        await change_log.record_changes(path.building_id, change_log.PATH, upserts=[path.path_id], floor_ids=path.floors)
+        # Kiosks pick up the publish right away; refill the building's caches before they do
+        cache_warmer.schedule(path.building_id)
 
         return {
             "status": "success",
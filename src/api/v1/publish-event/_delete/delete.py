@@ -12,6 +12,7 @@ from sqlalchemy.exc import IntegrityError
 from src.core.database.dbs.getdb import postresql as db
 from sqlalchemy.orm import Session
 from src.datamodel.database.domain.DigitalSignage import Event
+from src.services.push_hub import notify_content
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.services.permit.permit_service import PermitService
 from sqlalchemy import select
@@ -42,6 +43,7 @@ async def delete_event_in_db(id: str):
             raise HTTPException(status_code=404, detail="Event not found")
 
         await event.delete()
+        await notify_content("event", id, "delete")
 
         return {"message": "Event deleted successfully", "event_id": id}
     except Exception as e:
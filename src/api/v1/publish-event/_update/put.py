@@ -7,6 +7,7 @@ import logging
 from typing import Dict
 from typing import Optional
 from src.datamodel.database.domain.DigitalSignage import Event
+from src.services.push_hub import notify_content
 from src.datamodel.datavalidation.apiconfig import ApiConfig
 from src.core.authentication.authentication import get_current_user, get_token_payload
 from src.datamodel.database.userauth.AuthenticationTables import  User
@@ -135,6 +136,7 @@ async def update_event_in_db(
 
         # Save updates
         await existing_event.save()
+        await notify_content("event", existing_event.event_id, "update")
         return {"message": "Event updated successfully", "event_id": entity_uuid}
 
     except HTTPException:
@@ -4,6 +4,7 @@ from typing import Optional, Dict, Any
 import uuid, base64, logging, json
 from src.datamodel.database.userauth.AuthenticationTables import User
 from src.datamodel.database.domain.DigitalSignage import Event
+from src.services.push_hub import notify_content
 from src.core.authentication.authentication import get_current_user
 from b2sdk.v2 import InMemoryAccountInfo, B2Api
 import os
@@ -125,6 +126,7 @@ async def create_event_in_db(
         )
 
         await new_event.insert()
+        await notify_content("event", event_id, "create")
         return {"message": "Event created successfully", "event_id": event_id, "title": name}
 
     except Exception as e:
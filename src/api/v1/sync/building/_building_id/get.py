@@ -0,0 +1,53 @@
+from fastapi import HTTPException, Path, Query, status
+import logging
+
+from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.change_log import changes_since
+
+logger = logging.getLogger(__name__)
+
+
+def api_config():
+    config = {
+        "path": "",
+        "status_code": 200,
+        "tags": ["Sync"],
+        "summary": "Building Changes Since a Version",
+        "response_model": dict,
+        "description": (
+            "Delta sync for kiosks: locations, floors, paths and vertical connectors of a building changed "
+            "after version `since`, as upserts (current documents) and tombstones (IDs). since=0 always answers "
+            "`reset`; when `reset` is true, re-sync in full and continue from `current_version`; "
+            "when `has_more` is true, call again with since=`version`."
+        ),
+        "response_description": "Upserts and tombstones since the given version",
+        "deprecated": False,
+    }
+    return ApiConfig(**config)
+
+
+async def main(
+    building_id: str = Path(..., description="Building to sync"),
+    since: int = Query(0, ge=0, description="Last version the client has applied"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum change log entries per call"),
+):
+    try:
+        changes = await changes_since(building_id, since, limit)
+
+        return {
+            "status": "success",
+            "message": (
+                "Full re-sync required" if changes["reset"]
+                else f"Changes {since} -> {changes['version']} of {changes['current_version']}"
+            ),
+            "data": changes,
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error reading changes for building {building_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to read building changes: {str(e)}",
+        )
@@ -4,6 +4,9 @@ import time
 import logging
 from src.datamodel.database.domain.DigitalSignage import VerticalConnector, Floor
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.navigation_service import navigation_service
+from src.common.cache import invalidate_tags, floor_tag
+from src.services import change_log
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +46,11 @@ async def main(
         existing_connector.update_on = time.time()
         
         await existing_connector.save()
+        await navigation_service.on_connector_saved(existing_connector)
+        await invalidate_tags(floor_tag(existing_connector.floor_id))
+        await change_log.record_floor_changes(
+            change_log.VERTICAL_CONNECTOR, upserts=[(existing_connector.connector_id, existing_connector.floor_id)]
+        )
         
         # Remove connector from floor's vertical_connectors list
         try:
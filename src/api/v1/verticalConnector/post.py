@@ -5,6 +5,9 @@ import time
 import logging
 from src.datamodel.database.domain.DigitalSignage import VerticalConnector, ShapeType, ConnectorType, Floor
 from src.datamodel.datavalidation.apiconfig import ApiConfig
+from src.services.navigation_service import navigation_service
+from src.common.cache import invalidate_tags, floor_tag
+from src.services import change_log
 
 logger = logging.getLogger(__name__)
 
@@ -145,6 +148,13 @@ async def main(connector_data: VerticalConnectorCreateRequest):
 
         # Save to database
         await new_connector.insert()
+
+        # Patch the resident navigation graph
+        await navigation_service.on_connector_saved(new_connector)
+        await invalidate_tags(floor_tag(new_connector.floor_id))
+        await change_log.record_floor_changes(
+            change_log.VERTICAL_CONNECTOR, upserts=[(new_connector.connector_id, new_connector.floor_id)]
+        )
         
         # Update floor's vertical_connectors list
         if new_connector.connector_id not in floor.vertical_connectors:
@@ -0,0 +1,667 @@
+import asyncio
+import gzip
+import hashlib
+import logging
+import struct
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple, Union
+
+import orjson
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.common.redis_utils import (
+    get_cache_fast, set_cache_background, set_tagged_cache_fast, delete_cache_fast, invalidate_tags_fast,
+    publish_fast, subscribe_forever, acquire_lock_fast, release_lock_fast
+)
+
+logger = logging.getLogger(__name__)
+
+# Where a value came from; handlers echo it in the X-Cache header
+SOURCE_MEMORY = "MEMORY"
+SOURCE_REDIS = "REDIS"
+SOURCE_MISS = "MISS"
+SOURCE_STALE = "STALE"
+
+# Redis payloads are wrapped so tags (and "loader found nothing") travel with the value
+_VALUE_FIELD = "__cache_value__"
+_TAGS_FIELD = "__cache_tags__"
+_NEGATIVE_FIELD = "__cache_negative__"
+# Epoch seconds until which the value is fresh; after that it may only be served stale
+_FRESH_FIELD = "__cache_fresh_until__"
+
+# Cross-process single-flight: "lock:<key>" is held by the worker running the loader
+_LOCK_PREFIX = "lock:"
+_LOCK_POLL_INTERVAL = 0.05
+
+# Invalidations are broadcast here so every worker drops its memory-tier copies
+INVALIDATION_CHANNEL = "cache:invalidate"
+_WORKER_ID = uuid.uuid4().hex
+
+# Tags name what a cached value was built from, so a write can drop exactly
+# the entries it affects. Lists are tagged with the building / floor they are
+# scoped to, or with an entity or building list tag; the bare collection tags
+# only cover lists that span every tenant (such as the unfiltered path list).
+BUILDINGS = "buildings"
+FLOORS = "floors"
+LOCATIONS = "locations"
+PATHS = "paths"
+
+
+def building_tag(building_id: str) -> str:
+    return f"building:{building_id}"
+
+
+def floor_tag(floor_id: str) -> str:
+    return f"floor:{floor_id}"
+
+
+def location_tag(location_id: str) -> str:
+    return f"location:{location_id}"
+
+
+def path_tag(path_id: str) -> str:
+    return f"path:{path_id}"
+
+
+def query_key(prefix: str, *params: Any) -> str:
+    """
+    Cache key of one query: a digest of every parameter in full, so queries that
+    differ in any parameter (e.g. category "restroom" vs "restaurant") never share an entry
+    """
+    digest = hashlib.blake2b(repr(params).encode(), digest_size=16).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+def entity_list_tag(collection: str, entity_uuid: Optional[str]) -> str:
+    """Lists of `collection` across one entity, e.g. entity_list_tag(FLOORS, entity_uuid)"""
+    return f"{collection}:entity:{entity_uuid}"
+
+
+def building_list_tag(collection: str, building_id: Optional[str]) -> str:
+    """Lists of `collection` within one building that its building tag does not cover (paths)"""
+    return f"{collection}:building:{building_id}"
+
+# Tags given as a list, or computed from the loaded value (None for a negative result)
+Tags = Union[Iterable[str], Callable[[Any], Iterable[str]]]
+
+# Bodies at least this large also keep a gzip copy, served to clients that accept it
+BODY_GZIP_MIN_BYTES = 1024
+
+
+class CachedBody:
+    """
+    A JSON response encoded once: body bytes, a strong ETag, a gzip copy for
+    large bodies and any headers that describe it. A cache hit is written to
+    the client as is, without decoding and re-encoding.
+
+    Redis holds it as one raw frame: a length-prefixed JSON header, then the
+    gzip copy when there is one (else the body).
+    """
+
+    __slots__ = ("body", "etag", "gzipped", "headers", "tags")
+
+    def __init__(self, body: bytes, etag: str, gzipped: Optional[bytes] = None,
+                 headers: Optional[Dict[str, str]] = None, tags: Tuple[str, ...] = ()):
+        self.body = body
+        self.etag = etag
+        self.gzipped = gzipped
+        self.headers = headers or {}
+        self.tags = tags
+
+    @classmethod
+    def encode(cls, value: Any, headers: Optional[Dict[str, str]] = None,
+               tags: Iterable[str] = ()) -> "CachedBody":
+        """`tags` are added to whatever the cache call passes, for tags only known once loaded"""
+        body = orjson.dumps(value, default=str)
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        gzipped = gzip.compress(body, compresslevel=6) if len(body) >= BODY_GZIP_MIN_BYTES else None
+        return cls(body, etag, gzipped, headers, tuple(tags))
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzipped or b"")
+
+    def pack(self, header: Dict[str, Any]) -> bytes:
+        header = {**header, "etag": self.etag, "headers": self.headers, "gzip": self.gzipped is not None}
+        header_bytes = orjson.dumps(header)
+        return struct.pack(">I", len(header_bytes)) + header_bytes + (self.gzipped or self.body)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> Tuple[Dict[str, Any], "CachedBody"]:
+        (header_len,) = struct.unpack(">I", data[:4])
+        header = orjson.loads(data[4:4 + header_len])
+        payload = data[4 + header_len:]
+        if header["gzip"]:
+            body = cls(gzip.decompress(payload), header["etag"], payload, header["headers"])
+        else:
+            body = cls(payload, header["etag"], None, header["headers"])
+        return header, body
+
+    @property
+    def gzip_etag(self) -> str:
+        """Strong tags differ per byte-for-byte representation, so the gzip copy has its own"""
+        return self.etag[:-1] + '-gz"'
+
+    def _serves_gzip(self, request: Optional[Request]) -> bool:
+        return (self.gzipped is not None and request is not None
+                and "gzip" in request.headers.get("accept-encoding", ""))
+
+    def matches(self, request: Optional[Request]) -> bool:
+        """True when the client's If-None-Match already names this body, in either encoding"""
+        if request is None:
+            return False
+        if_none_match = request.headers.get("if-none-match")
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: a proxy that re-encoded the body may have marked our tag W/
+        tags = (self.etag, self.gzip_etag)
+        return any(tag.strip().removeprefix("W/") in tags for tag in if_none_match.split(","))
+
+    def response(self, request: Optional[Request] = None, headers: Optional[Dict[str, str]] = None,
+                 status_code: int = 200) -> Response:
+        """
+        The body, or an empty 304 when the request's If-None-Match matches, so a
+        poll of unchanged data costs one header exchange.
+        """
+        serves_gzip = self._serves_gzip(request)
+        headers = {**self.headers, **(headers or {}), "ETag": self.gzip_etag if serves_gzip else self.etag}
+        if self.gzipped is not None:
+            headers["Vary"] = "Accept-Encoding"
+        if status_code == 200 and self.matches(request):
+            return Response(status_code=304, headers=headers)
+        content = self.body
+        if serves_gzip:
+            headers["Content-Encoding"] = "gzip"
+            content = self.gzipped
+        return Response(content=content, status_code=status_code, headers=headers, media_type="application/json")
+
+
+class _Entry:
+    __slots__ = ("value", "fresh_until", "expires_at", "size", "negative", "tags")
+
+    def __init__(self, value: Any, fresh_until: float, expires_at: float, size: int,
+                 negative: bool = False, tags: Tuple[str, ...] = ()):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.expires_at = expires_at
+        self.size = size
+        self.negative = negative
+        self.tags = tags
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate memory cost of a value: its JSON size, which is what Redis stores too"""
+    if isinstance(value, CachedBody):
+        return value.size
+    try:
+        return len(orjson.dumps(value, default=str))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class TwoTierCache:
+    """
+    In-process LRU in front of Redis (`redis_utils`).
+
+    - memory tier: OrderedDict with O(1) hits and evictions, per-entry TTL and
+      a bound on both entry count and estimated bytes
+    - redis tier: shared between workers, filled on every set
+    - get_or_load: single-flight, concurrent misses on one key run the loader
+      once per process, and a short Redis lock makes other workers wait for
+      that result instead of loading it again
+    - stale-while-revalidate: with `stale_ttl`, an expired value keeps being
+      served for that long while one background task refreshes it
+    - negative caching: a loader returning None is remembered for `negative_ttl`
+    - tags: entries indexed by entity in both tiers, see `invalidate_tags()`
+    - pre-encoded bodies: a `CachedBody` value skips JSON encoding on every hit
+    - coherence: deletes and tag invalidations reach the memory tier of every
+      worker over Redis pub/sub, see `start_invalidation_listener()`
+    - hit / miss / eviction counters, see `stats()` and `cache_stats()`
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 1000,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl: int = 600,
+        negative_ttl: int = 60,
+        use_redis: bool = True,
+        stale_ttl: int = 0,
+        lock_ttl: float = 5.0,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.use_redis = use_redis
+        self.stale_ttl = stale_ttl
+        # How long a worker may hold the load lock; 0 disables cross-process locking
+        self.lock_ttl = lock_ttl
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._tag_index: Dict[str, Set[str]] = {}
+        # Invalidations seen while loads are running, as clock ticks per tag / key; a
+        # load does not store a value whose key or tags were invalidated after it started
+        self._clock = 0
+        self._loading = 0
+        self._tags_invalidated: Dict[str, int] = {}
+        self._keys_invalidated: Dict[str, int] = {}
+        self._cleared_at = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._metrics = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "negative_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "loads": 0,
+            "load_errors": 0,
+            "coalesced": 0,
+            "lock_waits": 0,
+            "refreshes": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+        _CACHES[name] = self
+
+    # -----------------------------
+    # Memory tier
+    # -----------------------------
+
+    def _memory_get(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self._metrics["expirations"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _memory_set(self, key: str, value: Any, ttl: float, negative: bool = False,
+                    tags: Tuple[str, ...] = ()) -> None:
+        """`ttl` is the fresh period; non-negative entries then stay servable for `stale_ttl`"""
+        size = _estimate_size(value)
+        fresh_until = time.monotonic() + ttl
+        expires_at = fresh_until + (0 if negative else self.stale_ttl)
+        self._remove(key)
+        if size > self.max_bytes or expires_at <= time.monotonic():
+            return
+        self._entries[key] = _Entry(value, fresh_until, expires_at, size, negative, tags)
+        self._bytes += size
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._metrics["evictions"] += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            for tag in entry.tags:
+                keys = self._tag_index.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tag_index[tag]
+
+    def _invalidate_local(self, tags: Iterable[str]) -> int:
+        tags = tuple(tags)
+        self._note_invalidation(self._tags_invalidated, tags)
+        removed = 0
+        for tag in tags:
+            for key in list(self._tag_index.get(tag, ())):
+                self._remove(key)
+                removed += 1
+        self._metrics["invalidations"] += removed
+        return removed
+
+    def _note_invalidation(self, invalidated: Dict[str, int], names: Iterable[str]) -> None:
+        # Only running loads compare against it, so nothing is kept while none are
+        if self._loading:
+            self._clock += 1
+            for name in names:
+                invalidated[name] = self._clock
+
+    def _invalidated_since(self, started: int, key: str, tags: Iterable[str]) -> bool:
+        if self._cleared_at > started or self._keys_invalidated.get(key, 0) > started:
+            return True
+        return any(self._tags_invalidated.get(tag, 0) > started for tag in tags)
+
+    # -----------------------------
+    # Redis tier
+    # -----------------------------
+
+    async def _redis_get(self, key: str) -> Optional[Tuple[Any, bool, bool]]:
+        """(value, negative, fresh) from Redis, copied into the memory tier; None when absent"""
+        payload = await get_cache_fast(key)
+        if isinstance(payload, bytes):
+            try:
+                payload, value = CachedBody.unpack(payload)
+            except Exception as e:
+                logger.warning(f"Unreadable cached body for {self.name}:{key}: {e}")
+                return None
+        elif not isinstance(payload, dict) or _TAGS_FIELD not in payload:
+            return None
+        elif payload.get(_NEGATIVE_FIELD):
+            self._memory_set(key, None, self.negative_ttl, negative=True, tags=tuple(payload[_TAGS_FIELD]))
+            return None, True, True
+        else:
+            value = payload.get(_VALUE_FIELD)
+        tags = tuple(payload[_TAGS_FIELD])
+        # Written before fresh timestamps existed: fresh for a full ttl
+        fresh_for = min(payload.get(_FRESH_FIELD, time.time() + self.ttl) - time.time(), self.ttl)
+        self._memory_set(key, value, fresh_for, tags=tags)
+        return value, False, fresh_for > 0
+
+    async def _acquire(self, key: str) -> Optional[str]:
+        """Load-lock token, or None while another worker is loading `key`"""
+        if not (self.use_redis and self.lock_ttl):
+            return ""
+        return await acquire_lock_fast(_LOCK_PREFIX + key, self.lock_ttl)
+
+    async def _release(self, key: str, token: str) -> None:
+        if token:
+            await release_lock_fast(_LOCK_PREFIX + key, token)
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+
+    async def lookup(self, key: str, allow_stale: bool = False) -> Tuple[bool, Any, str]:
+        """
+        (found, value, source). A remembered negative result is found with value None.
+
+        With `allow_stale`, a value past its ttl but within `stale_ttl` is found
+        with source SOURCE_STALE, unless Redis already has a fresher one.
+        """
+        entry = self._memory_get(key)
+        if entry is not None and entry.fresh_until > time.monotonic():
+            self._metrics["negative_hits" if entry.negative else "memory_hits"] += 1
+            return True, entry.value, SOURCE_MEMORY
+
+        if self.use_redis:
+            hit = await self._redis_get(key)
+            if hit is not None:
+                value, negative, fresh = hit
+                if fresh:
+                    self._metrics["negative_hits" if negative else "redis_hits"] += 1
+                    return True, value, SOURCE_REDIS
+                if allow_stale:
+                    self._metrics["stale_hits"] += 1
+                    return True, value, SOURCE_STALE
+                entry = None
+
+        if entry is not None and allow_stale:
+            self._metrics["stale_hits"] += 1
+            return True, entry.value, SOURCE_STALE
+
+        self._metrics["misses"] += 1
+        return False, None, SOURCE_MISS
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        found, value, _ = await self.lookup(key)
+        return value if found and value is not None else default
+
+    @staticmethod
+    def _resolve_tags(value: Any, tags: Optional[Tags]) -> Tuple[str, ...]:
+        if callable(tags):
+            tags = tags(value)
+        tags = tuple(tags or ())
+        if isinstance(value, CachedBody):
+            tags += tuple(tag for tag in value.tags if tag not in tags)
+        return tags
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Optional[Tags] = None,
+                  wait: bool = False) -> None:
+        """
+        Store in both tiers; None is stored as a negative result. The Redis write
+        runs in the background unless `wait`.
+        """
+        tags = self._resolve_tags(value, tags)
+        store = set_tagged_cache_fast if wait else set_cache_background
+        negative = value is None
+        ttl = ttl or (self.negative_ttl if negative else self.ttl)
+        self._memory_set(key, value, ttl, negative=negative, tags=tags)
+        if self.use_redis:
+            payload = {_TAGS_FIELD: list(tags)}
+            expire = ttl
+            if negative:
+                payload[_NEGATIVE_FIELD] = True
+            else:
+                payload[_FRESH_FIELD] = time.time() + ttl
+                expire += self.stale_ttl
+                if isinstance(value, CachedBody):
+                    await store(key, value.pack(payload), expire=expire, tags=tags, raw=True)
+                    return
+                payload[_VALUE_FIELD] = value
+            await store(key, payload, expire=expire, tags=tags)
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        tags: Optional[Tags] = None,
+    ) -> Tuple[Any, str]:
+        """
+        Cached value or the loader's result, plus where it came from.
+
+        Concurrent calls for the same missing key share one loader run, and
+        while another worker holds the load lock this one waits for its result.
+        A stale value is returned as is and refreshed in the background.
+        """
+        found, value, source = await self.lookup(key, allow_stale=self.stale_ttl > 0)
+        if found:
+            if source == SOURCE_STALE:
+                self._refresh_in_background(key, loader, ttl, tags)
+            return value, source
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._metrics["coalesced"] += 1
+            return await asyncio.shield(pending), SOURCE_MISS
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value, source = await self._load_locked(key, loader, ttl, tags)
+            future.set_result(value)
+            return value, source
+        except BaseException as e:
+            self._metrics["load_errors"] += 1
+            future.set_exception(e)
+            # Waiters re-raise it; retrieve it here so an unwaited future does not warn
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load_locked(self, key: str, loader: Callable[[], Awaitable[Any]],
+                           ttl: Optional[int], tags: Optional[Tags]) -> Tuple[Any, str]:
+        token = await self._acquire(key)
+        if token is None:
+            self._metrics["lock_waits"] += 1
+            deadline = time.monotonic() + self.lock_ttl
+            while token is None and time.monotonic() < deadline:
+                await asyncio.sleep(_LOCK_POLL_INTERVAL)
+                hit = await self._redis_get(key)
+                if hit is not None and hit[2]:
+                    return hit[0], SOURCE_REDIS
+                # The holder finished without storing anything (or died): load it ourselves
+                token = await self._acquire(key)
+        try:
+            return await self._load(key, loader, ttl, tags), SOURCE_MISS
+        finally:
+            await self._release(key, token)
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]],
+                    ttl: Optional[int], tags: Optional[Tags]) -> Any:
+        self._metrics["loads"] += 1
+        self._loading += 1
+        started = self._clock
+        try:
+            value = await loader()
+            tags = self._resolve_tags(value, tags)
+            if self._invalidated_since(started, key, tags):
+                return value
+            # Awaited, so the tagged write cannot land after an invalidation issued
+            # once it returns; one that overlapped it is caught by the check below
+            await self.set(key, value, ttl if value is not None else None, tags, wait=True)
+            if self._invalidated_since(started, key, tags):
+                self._remove(key)
+                if self.use_redis:
+                    await delete_cache_fast(key)
+            return value
+        finally:
+            self._loading -= 1
+            if not self._loading:
+                self._tags_invalidated.clear()
+                self._keys_invalidated.clear()
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Awaitable[Any]],
+                               ttl: Optional[int], tags: Optional[Tags]) -> None:
+        if key in self._refreshing or key in self._inflight:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(key, loader, ttl, tags))
+        # The loop only keeps weak references to tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: str, loader: Callable[[], Awaitable[Any]],
+                       ttl: Optional[int], tags: Optional[Tags]) -> None:
+        try:
+            token = await self._acquire(key)
+            if token is None:
+                # Another worker is already refreshing it
+                return
+            try:
+                await self._load(key, loader, ttl, tags)
+                self._metrics["refreshes"] += 1
+            finally:
+                await self._release(key, token)
+        except Exception as e:
+            self._metrics["load_errors"] += 1
+            logger.warning(f"Background refresh of {self.name}:{key} failed: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    async def delete(self, *keys: str) -> None:
+        """Drop keys from both tiers, in every worker"""
+        if not keys:
+            return
+        self._delete_local(keys)
+        if self.use_redis:
+            await delete_cache_fast(*keys)
+        await publish_fast(INVALIDATION_CHANNEL, {"origin": _WORKER_ID, "cache": self.name, "keys": list(keys)})
+
+    def _delete_local(self, keys: Iterable[str]) -> None:
+        keys = tuple(keys)
+        self._note_invalidation(self._keys_invalidated, keys)
+        for key in keys:
+            self._remove(key)
+
+    def clear(self) -> None:
+        if self._loading:
+            self._clock += 1
+            self._cleared_at = self._clock
+        self._entries.clear()
+        self._tag_index.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        hits = (self._metrics["memory_hits"] + self._metrics["redis_hits"]
+                + self._metrics["negative_hits"] + self._metrics["stale_hits"])
+        lookups = hits + self._metrics["misses"]
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": hits / lookups * 100 if lookups else 0.0,
+            **self._metrics,
+        }
+
+
+_CACHES: Dict[str, TwoTierCache] = {}
+
+
+async def invalidate_tags(*tags: str) -> int:
+    """
+    Drop every entry tagged with any of `tags`: from each cache's memory tier in
+    this process, and from Redis (values of every worker) in one round trip.
+    """
+    tags = tuple(tag for tag in tags if tag)
+    if not tags:
+        return 0
+    for cache in _CACHES.values():
+        cache._invalidate_local(tags)
+    deleted = await invalidate_tags_fast(tags)
+    await publish_fast(INVALIDATION_CHANNEL, {"origin": _WORKER_ID, "tags": list(tags)})
+    logger.info(f"Invalidated {deleted} cached keys for tags {list(tags)}")
+    return deleted
+
+
+async def _on_invalidation(message: Dict[str, Any]) -> None:
+    """Apply another worker's invalidation to this process's memory tiers"""
+    if message.get("origin") == _WORKER_ID:
+        return
+    tags = message.get("tags")
+    if tags:
+        for cache in _CACHES.values():
+            cache._invalidate_local(tags)
+    keys = message.get("keys")
+    cache = _CACHES.get(message.get("cache"))
+    if keys and cache is not None:
+        cache._delete_local(keys)
+
+
+def _on_bus_subscribed() -> None:
+    # Invalidations published while unsubscribed were missed; start from empty memory tiers
+    for cache in _CACHES.values():
+        cache.clear()
+
+
+_listener_task: Optional[asyncio.Task] = None
+
+
+def start_invalidation_listener() -> None:
+    """Subscribe this worker to cache invalidations (call once from the app lifespan)"""
+    global _listener_task
+    if _listener_task is None or _listener_task.done():
+        _listener_task = asyncio.create_task(
+            subscribe_forever(INVALIDATION_CHANNEL, _on_invalidation, on_subscribe=_on_bus_subscribed)
+        )
+
+
+async def stop_invalidation_listener() -> None:
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Metrics of every cache created in this process"""
+    return {name: cache.stats() for name, cache in _CACHES.items()}
@@ -5,7 +5,7 @@ import gzip
 import zlib
 import asyncio
 import time
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, Iterable
 import redis.asyncio as redis
 from redis.exceptions import RedisError
 import struct
@@ -33,11 +33,16 @@ redis_client = redis.from_url(
 LIGHT_COMPRESSION_THRESHOLD = 512   # 512 bytes
 HEAVY_COMPRESSION_THRESHOLD = 2048  # 2KB
 
+# Tag index: "tag:<tag>" is a set of the cache keys tagged with it
+TAG_KEY_PREFIX = "tag:"
+TAG_INDEX_TTL = 86400  # outlives every cached entry; refreshed on each write
+
 # Serialization formats
 FORMATS = {
     'json': 1,
     'json_gz': 2,
     'json_zlib': 3,
+    'raw': 4,        # caller-encoded bytes, returned as is
 }
 
 def _ultra_fast_serialize(data: Any, compress: bool = True) -> bytes:
@@ -85,6 +90,8 @@ def _ultra_fast_deserialize(data: bytes) -> Any:
             # gzip compressed
             decompressed = gzip.decompress(payload)
             return orjson.loads(decompressed)
+        elif format_id == FORMATS['raw']:
+            return payload
         else:
             # Fallback - try direct orjson parsing
             return orjson.loads(payload)
@@ -142,6 +149,63 @@ async def set_compressed_cache(key: str, value: Any, expire: int = 600) -> bool:
         logger.warning(f"Compressed cache SET error: {e}")
         return False
 
+async def delete_cache_fast(*keys: str) -> int:
+    """Delete keys; returns how many existed"""
+    if not keys:
+        return 0
+    try:
+        return await asyncio.wait_for(redis_client.delete(*keys), timeout=1.0)
+    except Exception as e:
+        logger.warning(f"Redis DEL error for {len(keys)} keys: {e}")
+        return 0
+
+# Short-lived locks (SET NX PX), released only by the holder's token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+async def acquire_lock_fast(key: str, ttl: float) -> Optional[str]:
+    """
+    Take a lock for `ttl` seconds; returns its token, or None while someone else holds it.
+    If Redis is unreachable the lock counts as acquired, so callers go ahead unlocked.
+    """
+    token = os.urandom(8).hex()
+    try:
+        acquired = await asyncio.wait_for(
+            redis_client.set(key, token, nx=True, px=int(ttl * 1000)), timeout=1.0
+        )
+        return token if acquired else None
+    except Exception as e:
+        logger.warning(f"Redis lock error for {key}: {e}")
+        return token
+
+async def release_lock_fast(key: str, token: str) -> None:
+    try:
+        await asyncio.wait_for(redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, key, token), timeout=1.0)
+    except Exception as e:
+        logger.warning(f"Redis unlock error for {key}: {e}")
+
+# Counters (stored as plain integers, not serialized payloads)
+async def incr_counter_fast(key: str) -> Optional[int]:
+    """Atomically increment a counter; None when Redis is unavailable"""
+    try:
+        return await asyncio.wait_for(redis_client.incr(key), timeout=1.0)
+    except Exception as e:
+        logger.warning(f"Redis INCR error for {key}: {e}")
+        return None
+
+async def get_counter_fast(key: str) -> Optional[int]:
+    """Read a counter (0 when unset); None when Redis is unavailable"""
+    try:
+        value = await asyncio.wait_for(redis_client.get(key), timeout=1.0)
+        return int(value) if value is not None else 0
+    except Exception as e:
+        logger.warning(f"Redis counter GET error for {key}: {e}")
+        return None
+
 # Batch operations for multiple keys
 async def get_multi_cache_fast(keys: list) -> Dict[str, Any]:
     """Get multiple cache values in one Redis call"""
@@ -165,8 +229,9 @@ async def get_multi_cache_fast(keys: list) -> Dict[str, Any]:
         logger.error(f"Multi-get error: {e}")
         return {}
 
-async def set_multi_cache_fast(data: Dict[str, Any], expire: int = 600) -> bool:
-    """Set multiple cache values using pipeline"""
+async def set_multi_cache_fast(data: Dict[str, Any], expire: int = 600,
+                               tags: Optional[Dict[str, Iterable[str]]] = None) -> bool:
+    """Set multiple cache values using pipeline; `tags` maps a key to its invalidation tags"""
     if not data:
         return True
         
@@ -177,6 +242,8 @@ async def set_multi_cache_fast(data: Dict[str, Any], expire: int = 600) -> bool:
             try:
                 serialized = _ultra_fast_serialize(value)
                 pipe.set(key, serialized, ex=expire)
+                if tags and key in tags:
+                    _queue_tag_index(pipe, key, tags[key])
             except Exception as e:
                 logger.warning(f"Failed to serialize {key}: {e}")
                 
@@ -187,15 +254,206 @@ async def set_multi_cache_fast(data: Dict[str, Any], expire: int = 600) -> bool:
         return False
 
 # Background cache operations (non-blocking)
-async def set_cache_background(key: str, value: Any, expire: int = 600):
-    """Set cache in background without blocking"""
+async def set_cache_background(key: str, value: Any, expire: int = 600,
+                               tags: Optional[Iterable[str]] = None, raw: bool = False):
+    """
+    Set cache in background without blocking; `tags` lets invalidate_tags_fast drop it later.
+    With `raw`, `value` is already-encoded bytes, stored without serialization.
+    """
     try:
-        data = _ultra_fast_serialize(value)
         # Fire and forget
-        asyncio.create_task(redis_client.set(key, data, ex=expire))
+        asyncio.create_task(_tagged_set(key, value, expire, tags, raw))
     except Exception as e:
         logger.warning(f"Background cache set failed for {key}: {e}")
 
+async def set_tagged_cache_fast(key: str, value: Any, expire: int = 600,
+                                tags: Optional[Iterable[str]] = None, raw: bool = False) -> bool:
+    """set_cache_background, but returns once the value and its tag index are written"""
+    try:
+        await asyncio.wait_for(_tagged_set(key, value, expire, tags, raw), timeout=1.0)
+        return True
+    except Exception as e:
+        logger.warning(f"Redis SET error for {key}: {e}")
+        return False
+
+def _tagged_set(key: str, value: Any, expire: int, tags: Optional[Iterable[str]], raw: bool):
+    """Awaitable writing `key` (and its tag index entries) in one round trip"""
+    data = struct.pack('B', FORMATS['raw']) + value if raw else _ultra_fast_serialize(value)
+    if not tags:
+        return redis_client.set(key, data, ex=expire)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.set(key, data, ex=expire)
+    _queue_tag_index(pipe, key, tags)
+    return pipe.execute()
+
+# Tag-based invalidation
+def _queue_tag_index(pipe, key: str, tags: Iterable[str]) -> None:
+    """Add `key` to the index set of each tag on a pipeline"""
+    for tag in tags:
+        tag_key = TAG_KEY_PREFIX + tag
+        pipe.sadd(tag_key, key)
+        pipe.expire(tag_key, TAG_INDEX_TTL)
+
+# Deletes every key indexed under the given tag sets, then the sets themselves
+_INVALIDATE_TAGS_SCRIPT = """
+local deleted = 0
+for _, tag_key in ipairs(KEYS) do
+    local members = redis.call('SMEMBERS', tag_key)
+    for i = 1, #members, 500 do
+        deleted = deleted + redis.call('DEL', unpack(members, i, math.min(i + 499, #members)))
+    end
+    redis.call('DEL', tag_key)
+end
+return deleted
+"""
+
+async def invalidate_tags_fast(tags: Iterable[str]) -> int:
+    """Delete every cache key tagged with any of `tags` in one round trip; returns keys deleted"""
+    tag_keys = [TAG_KEY_PREFIX + tag for tag in set(tags)]
+    if not tag_keys:
+        return 0
+    try:
+        return await asyncio.wait_for(
+            redis_client.eval(_INVALIDATE_TAGS_SCRIPT, len(tag_keys), *tag_keys),
+            timeout=2.0
+        )
+    except Exception as e:
+        logger.warning(f"Redis tag invalidation error for {tag_keys}: {e}")
+        return 0
+
+# Pub/sub (payloads are plain orjson, not the compressed cache format)
+async def publish_fast(channel: str, message: Any) -> bool:
+    """Publish a JSON message; False when Redis is unavailable"""
+    try:
+        await asyncio.wait_for(redis_client.publish(channel, orjson.dumps(message)), timeout=1.0)
+        return True
+    except Exception as e:
+        logger.warning(f"Redis PUBLISH error on {channel}: {e}")
+        return False
+
+async def subscribe_forever(channel: str, handler, on_subscribe=None, retry_delay: float = 1.0):
+    """
+    Feed every message on `channel` to `await handler(message)` until cancelled.
+    Resubscribes after connection errors; `on_subscribe()` runs after each
+    (re)subscription, since messages sent in between are lost.
+    """
+    while True:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(channel)
+            if on_subscribe:
+                on_subscribe()
+            while True:
+                # Short polls keep the idle connection clear of the client's socket_timeout
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None or message.get("type") != "message":
+                    continue
+                try:
+                    await handler(orjson.loads(message["data"]))
+                except Exception as e:
+                    logger.warning(f"Error handling message on {channel}: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Redis subscription to {channel} lost: {e}")
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+        await asyncio.sleep(retry_delay)
+
+# Lists (payloads are plain orjson, like pub/sub)
+async def push_list_fast(key: str, message: Any, max_length: Optional[int] = None,
+                         expire: Optional[int] = None, left: bool = False) -> bool:
+    """
+    Append a JSON message to a list (prepend with `left`), keeping at most
+    `max_length` of the newest entries; False when Redis is unavailable
+    """
+    try:
+        data = orjson.dumps(message)
+        pipe = redis_client.pipeline(transaction=False)
+        if left:
+            pipe.lpush(key, data)
+            if max_length:
+                pipe.ltrim(key, 0, max_length - 1)
+        else:
+            pipe.rpush(key, data)
+            if max_length:
+                pipe.ltrim(key, -max_length, -1)
+        if expire:
+            pipe.expire(key, expire)
+        await asyncio.wait_for(pipe.execute(), timeout=1.0)
+        return True
+    except Exception as e:
+        logger.warning(f"Redis list push error for {key}: {e}")
+        return False
+
+async def pop_list_fast(key: str, timeout: Optional[float] = 1.0, destination: Optional[str] = None) -> Any:
+    """
+    Take the first message of a list, waiting up to `timeout` seconds (keep it
+    under the client's socket_timeout; None returns at once); None when the
+    list stays empty or Redis is unavailable.
+
+    With `destination` the message is atomically moved to the end of that
+    list rather than removed (BLMOVE), so a consumer that dies before
+    finishing with it leaves it there to be recovered.
+    """
+    try:
+        if timeout is None:
+            command = redis_client.lmove(key, destination, "LEFT", "RIGHT") if destination else redis_client.lpop(key)
+            item = await asyncio.wait_for(command, timeout=1.0)
+        elif destination:
+            item = await redis_client.blmove(key, destination, timeout, "LEFT", "RIGHT")
+        else:
+            popped = await redis_client.blpop([key], timeout=timeout)
+            item = popped[1] if popped else None
+    except Exception as e:
+        logger.warning(f"Redis list pop error for {key}: {e}")
+        await asyncio.sleep(timeout or 0)
+        return None
+    if item is None:
+        return None
+    try:
+        return orjson.loads(item)
+    except Exception as e:
+        logger.warning(f"Dropped undecodable message from {key}: {e}")
+        return None
+
+async def get_list_fast(key: str, start: int = 0, end: int = -1) -> list:
+    """Messages of a list between `start` and `end` (inclusive); empty when Redis is unavailable"""
+    try:
+        items = await asyncio.wait_for(redis_client.lrange(key, start, end), timeout=1.0)
+        return [orjson.loads(item) for item in items]
+    except Exception as e:
+        logger.warning(f"Redis list read error for {key}: {e}")
+        return []
+
+# Sets of plain strings
+async def add_set_members_fast(key: str, *members: str) -> bool:
+    """Add members to a set; False when Redis is unavailable"""
+    try:
+        await asyncio.wait_for(redis_client.sadd(key, *members), timeout=1.0)
+        return True
+    except Exception as e:
+        logger.warning(f"Redis SADD error for {key}: {e}")
+        return False
+
+async def remove_set_members_fast(key: str, *members: str) -> None:
+    try:
+        await asyncio.wait_for(redis_client.srem(key, *members), timeout=1.0)
+    except Exception as e:
+        logger.warning(f"Redis SREM error for {key}: {e}")
+
+async def get_set_members_fast(key: str) -> list:
+    """Members of a set; empty when Redis is unavailable"""
+    try:
+        members = await asyncio.wait_for(redis_client.smembers(key), timeout=1.0)
+        return [member.decode() for member in members]
+    except Exception as e:
+        logger.warning(f"Redis SMEMBERS error for {key}: {e}")
+        return []
+
 # Cache statistics
 async def get_redis_stats() -> Dict[str, Any]:
     """Get Redis performance statistics"""
@@ -0,0 +1,51 @@
+import logging
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Optional
+
+import orjson
+from starlette.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+# Placeholders in a response template: where the streamed list goes, and the item count
+STREAM_ITEMS = "\x00stream:items\x00"
+STREAM_COUNT = "\x00stream:count\x00"
+
+_ITEMS_TOKEN = orjson.dumps(STREAM_ITEMS)
+_COUNT_TOKEN = orjson.dumps(STREAM_COUNT)
+
+# Items encoded per chunk written to the socket
+STREAM_BATCH_SIZE = 200
+
+
+async def stream_json(template: Dict[str, Any], items: AsyncIterable[Any],
+                      batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[bytes]:
+    """
+    Encode `template` with the STREAM_ITEMS placeholder replaced by a JSON array
+    of `items`, one item at a time, so memory does not grow with the result.
+    STREAM_COUNT placed after the list is filled in with the number of items.
+
+    The status line is already sent when items are read: an error midway ends
+    the stream early, leaving a truncated (invalid) document.
+    """
+    prefix, suffix = orjson.dumps(template).split(_ITEMS_TOKEN, 1)
+    yield prefix + b"["
+    count = 0
+    batch = []
+    try:
+        async for item in items:
+            batch.append(orjson.dumps(item, default=str))
+            count += 1
+            if len(batch) >= batch_size:
+                yield (b"," if count > len(batch) else b"") + b",".join(batch)
+                batch = []
+    except Exception as e:
+        logger.exception(f"Stream aborted after {count} items: {e}")
+        return
+    if batch:
+        yield (b"," if count > len(batch) else b"") + b",".join(batch)
+    yield b"]" + suffix.replace(_COUNT_TOKEN, str(count).encode())
+
+
+def streaming_json_response(template: Dict[str, Any], items: AsyncIterable[Any],
+                            headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    return StreamingResponse(stream_json(template, items), media_type="application/json", headers=headers)
@@ -2,7 +2,7 @@ import os
 from beanie import init_beanie
 from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient
-from src.datamodel.database.domain.DigitalSignage import Location, Floor, Building, VerticalConnector, Path, Event ,EmergencyService,EmergencyAlert,EmergencyExit,NonEmergencyContact,EmergencyInstruction,Doctor,Department,HospitalService,DailyAnnouncement,HospitalInformation
+from src.datamodel.database.domain.DigitalSignage import Location, Floor, Building, VerticalConnector, Path, Event ,EmergencyService,EmergencyAlert,EmergencyExit,NonEmergencyContact,EmergencyInstruction,Doctor,Department,HospitalService,DailyAnnouncement,HospitalInformation,ChangeCounter,ChangeLogEntry
 import logging
 # Load environment variables
 load_dotenv()
@@ -47,7 +47,7 @@ async def init_db():
 
         await init_beanie(
             database=client[MONGO_DATABASE_NAME],
-            document_models=[Location, Floor, Building, VerticalConnector, Path, Event, EmergencyService,EmergencyAlert,EmergencyExit,NonEmergencyContact,EmergencyInstruction,Doctor,Department,HospitalService,DailyAnnouncement,HospitalInformation],
+            document_models=[Location, Floor, Building, VerticalConnector, Path, Event, EmergencyService,EmergencyAlert,EmergencyExit,NonEmergencyContact,EmergencyInstruction,Doctor,Department,HospitalService,DailyAnnouncement,HospitalInformation,ChangeCounter,ChangeLogEntry],
         )
         logger.info("MongoDB initialized successfully")
     except Exception as err:
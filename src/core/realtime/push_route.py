@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+import asyncio
+import logging
+import orjson
+
+from src.services.push_hub import push_hub, ALL, building_topic, floor_topic
+
+logger = logging.getLogger(__name__)
+
+push_route = APIRouter()
+
+
+def _topics(building_id: Optional[str], floor_ids: Optional[List[str]]) -> List[str]:
+    """Topics of one display: shared content, plus its building and floors"""
+    topics = [ALL]
+    if building_id:
+        topics.append(building_topic(building_id))
+    topics.extend(floor_topic(floor_id) for floor_id in floor_ids or () if floor_id)
+    return topics
+
+
+async def _drain(websocket: WebSocket) -> None:
+    """Read (and ignore) client frames until the socket closes"""
+    while True:
+        await websocket.receive_text()
+
+
+def _sse_event(message: dict) -> bytes:
+    return b"event: " + str(message.get("type", "message")).encode() + b"\ndata: " + orjson.dumps(message) + b"\n\n"
+
+
+@push_route.websocket("/v1/push/ws")
+async def push_websocket(
+    websocket: WebSocket,
+    building_id: Optional[str] = Query(None, description="Building whose content changes to receive"),
+    floor_id: Optional[List[str]] = Query(None, description="Floors whose content changes to receive"),
+):
+    """
+    Content updates for one display as JSON messages: "change" (with the
+    building's change log version, see /v1/sync/building/{building_id}),
+    "event", "announcement", "resync" (catch up through delta sync) and "ping".
+    """
+    await websocket.accept()
+    subscriber = push_hub.subscribe(_topics(building_id, floor_id))
+    receiver = asyncio.create_task(_drain(websocket))
+    try:
+        await websocket.send_json({"type": "subscribed", "topics": list(subscriber.topics)})
+        while True:
+            next_message = asyncio.create_task(subscriber.get())
+            await asyncio.wait({next_message, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver.done():
+                next_message.cancel()
+                break
+            message = next_message.result()
+            await websocket.send_json(message if message is not None else {"type": "ping"})
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.warning(f"Push WebSocket closed: {e}")
+    finally:
+        receiver.cancel()
+        push_hub.unsubscribe(subscriber)
+
+
+@push_route.get("/v1/push/sse", summary="Content updates (Server-Sent Events)", tags=["Push"])
+async def push_sse(
+    request: Request,
+    building_id: Optional[str] = Query(None, description="Building whose content changes to receive"),
+    floor_id: Optional[List[str]] = Query(None, description="Floors whose content changes to receive"),
+):
+    """The WebSocket stream as Server-Sent Events, for displays behind proxies that block WebSockets"""
+    topics = _topics(building_id, floor_id)
+
+    async def events():
+        subscriber = push_hub.subscribe(topics)
+        try:
+            yield _sse_event({"type": "subscribed", "topics": list(subscriber.topics)})
+            while not await request.is_disconnected():
+                message = await subscriber.get()
+                yield _sse_event(message) if message is not None else b": keepalive\n\n"
+        finally:
+            push_hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
@@ -5,6 +5,7 @@ import functools
 from typing import Any
 from inspect import iscoroutinefunction
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import DirectoryPath
 import logging
 import traceback
@@ -24,7 +25,8 @@ class RouteBuilder:
             None
         """
         self.dir_path = dir_path
-        self.router = APIRouter()
+        # orjson encodes dict/list responses several times faster than the stdlib json
+        self.router = APIRouter(default_response_class=ORJSONResponse)
         self.module_dict = {}
         self._load_modules()
 
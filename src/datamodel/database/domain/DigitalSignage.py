@@ -1,4 +1,5 @@
 from beanie import Document, Indexed
+from pymongo import IndexModel, ASCENDING
 from pydantic import Field, BaseModel,EmailStr
 from typing import Optional, Dict, List, Any
 from enum import Enum
@@ -278,6 +279,91 @@ class Path(Document):
             "is_published"                           # publishing filters
         ]
 
+    # Utility: call this before save/update to keep denormalized fields consistent.
+    def recompute_denorm(self) -> None:
+        # Floors seen across all segments
+        fset = {seg.floor_id for seg in (self.floor_segments or [])}
+        self.floors = sorted(fset)
+        self.is_multifloor = len(self.floors) > 1
+
+        # Collect shared_ids from vertical connectors used in points
+        shared_ids = []
+        for seg in self.floor_segments or []:
+            for p in seg.points or []:
+                if p.kind == NodeKind.VERTICAL_CONNECTOR and p.shared_id:
+                    shared_ids.append(p.shared_id)
+        self.connector_shared_ids = sorted(set(shared_ids))
+
+
+# -----------------------------
+# Change Log (delta sync)
+# -----------------------------
+
+# Entries older than this are dropped; kiosks further behind do a full re-sync
+CHANGE_LOG_RETENTION_SECONDS = 30 * 24 * 3600
+
+
+class ChangeOp(str, Enum):
+    UPSERT = "upsert"   # created or updated (a soft delete is an update)
+    DELETE = "delete"   # hard deleted
+
+
+class ChangeCounter(Document):
+    building_id: str = Field(..., description="Building the counter belongs to")
+    version: int = Field(default=0, description="Version of the building's latest change")
+
+    class Settings:
+        name = "change_counters"
+        indexes = [
+            IndexModel([("building_id", ASCENDING)], unique=True),
+        ]
+
+
+class ChangeLogEntry(Document):
+    building_id: str = Field(..., description="Building the changed entity belongs to")
+    version: int = Field(..., description="Per-building change version, consecutive from 1")
+    entity_type: str = Field(..., description="location, floor, path or vertical_connector")
+    entity_id: str = Field(..., description="ID of the changed entity")
+    op: ChangeOp = Field(..., description="Kind of change")
+    created_at: datetime = Field(default_factory=datetime.utcnow, description="When the change was recorded")
+
+    class Settings:
+        name = "change_log"
+        indexes = [
+            IndexModel([("building_id", ASCENDING), ("version", ASCENDING)], unique=True),
+            IndexModel([("created_at", ASCENDING)], expireAfterSeconds=CHANGE_LOG_RETENTION_SECONDS),
+        ]
+
+
+# -----------------------------
+# Navigation Models
+# -----------------------------
+
+class RouteAlgorithm(str, Enum):
+    DIJKSTRA = "dijkstra"
+    ASTAR = "astar"                    # A* with a straight-line distance heuristic
+    BIDIRECTIONAL = "bidirectional"    # Bidirectional A*, for long cross-building trips
+    PRECOMPUTED = "precomputed"        # Looked up in the building's route table (A* when it has none)
+
+
+class NavigationRequest(BaseModel):
+    source_location_id: str = Field(..., description="Location the route starts from")
+    destination_location_id: str = Field(..., description="Location the route ends at")
+    preferred_connector_type: Optional[str] = Field(None, description="Preferred vertical connector type (elevator, stairs, escalator)")
+    building_id: Optional[str] = Field(None, description="Building of both locations; skips the location lookup when provided")
+    algorithm: RouteAlgorithm = Field(RouteAlgorithm.ASTAR, description="Search algorithm used to find the route")
+    accessible: bool = Field(False, description="Only use step-free connectors (elevators, ramps)")
+
+
+class MultiFloorRoute(BaseModel):
+    total_floors: int = Field(..., description="Number of distinct floors the route touches")
+    route_segments: List[Dict[str, Any]] = Field(default_factory=list, description="Per-floor walking segments")
+    vertical_transitions: List[Dict[str, Any]] = Field(default_factory=list, description="Connector hops between floors")
+    estimated_time: int = Field(..., description="Estimated travel time in minutes")
+    algorithm: Optional[RouteAlgorithm] = Field(None, description="Search algorithm that produced the route")
+    expanded_nodes: int = Field(0, description="Graph nodes settled by the search")
+    precomputed: bool = Field(False, description="Served from the building's precomputed route table")
+
 
 class EmergencyService(Document):
     emergency_service_uuid: UUID   # <--- Use UUID not str
@@ -409,18 +495,3 @@ class HospitalInformation(Document):
 
     class Settings:
         name = "hospital_information"  # MongoDB collection name
-
-    # Utility: call this before save/update to keep denormalized fields consistent.
-    def recompute_denorm(self) -> None:
-        # Floors seen across all segments
-        fset = {seg.floor_id for seg in (self.floor_segments or [])}
-        self.floors = sorted(fset)
-        self.is_multifloor = len(self.floors) > 1
-
-        # Collect shared_ids from vertical connectors used in points
-        shared_ids = []
-        for seg in self.floor_segments or []:
-            for p in seg.points or []:
-                if p.kind == NodeKind.VERTICAL_CONNECTOR and p.shared_id:
-                    shared_ids.append(p.shared_id)
-        self.connector_shared_ids = sorted(set(shared_ids))
@@ -0,0 +1,650 @@
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from src.datamodel.database.domain.DigitalSignage import (
+    Building, Floor, Location, Path, VerticalConnector, NodeKind, ShapeType
+)
+from src.common.cache import (
+    invalidate_tags, BUILDINGS, FLOORS, LOCATIONS, PATHS, building_tag, floor_tag, entity_list_tag,
+    building_list_tag
+)
+from src.common.streaming import STREAM_BATCH_SIZE
+from src.services.navigation_service import navigation_service
+from src.services.cache_warmer import cache_warmer
+from src.services import change_log
+import orjson
+import tempfile
+import time
+import uuid
+import zipfile
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_VERSION = 1
+# Name of the NDJSON member inside a ZIP bundle (an import reads every *.ndjson member, in name order)
+BUNDLE_MEMBER = "building.ndjson"
+# Documents per insert_many
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_RECORDS = int(os.getenv("BUILDING_IMPORT_MAX_RECORDS", "50000"))
+IMPORT_MAX_BYTES = int(os.getenv("BUILDING_IMPORT_MAX_BYTES", str(64 * 1024 * 1024)))
+# Validation stops reporting after this many problems
+IMPORT_MAX_ERRORS = 100
+# ZIP bundles are spooled to disk past this size, since their index is at the end
+ZIP_SPOOL_BYTES = 8 * 1024 * 1024
+
+# Record types, in the order an export writes them and an import resolves them
+HEADER = "bundle"
+BUILDING = "building"
+FLOOR = "floor"
+VERTICAL_CONNECTOR = "vertical_connector"
+LOCATION = "location"
+PATH = "path"
+RECORD_TYPES = (BUILDING, FLOOR, VERTICAL_CONNECTOR, LOCATION, PATH)
+
+# Fields an import always sets itself
+_SERVER_FIELDS = ("status", "datetime", "updated_by", "update_on")
+_ZIP_MAGIC = b"PK\x03\x04"
+
+
+class BundleError(Exception):
+    """A bundle that cannot be imported; `errors` lists every problem found"""
+
+    def __init__(self, errors: List[str]):
+        super().__init__(f"Bundle rejected with {len(errors)} errors")
+        self.errors = errors
+
+
+# -----------------------------
+# Export
+# -----------------------------
+
+def _line(record_type: str, data: Dict[str, Any]) -> bytes:
+    return orjson.dumps({"type": record_type, "data": data}, default=str) + b"\n"
+
+
+async def export_ndjson(building: Building, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[bytes]:
+    """
+    A building's active floors, vertical connectors, locations and paths as
+    NDJSON, one {"type", "data"} record per line. Documents are read as raw
+    projections and written in batches, so memory stays flat however large
+    the venue.
+    """
+    building_id = building.building_id
+    yield orjson.dumps({
+        "type": HEADER, "version": BUNDLE_VERSION, "building_id": building_id, "exported_at": time.time(),
+    }) + b"\n"
+    yield _line(BUILDING, building.model_dump(mode="json", exclude={"id", "revision_id"}))
+
+    projection = {"_id": 0, "revision_id": 0}
+    floor_ids: List[str] = []
+    batch: List[bytes] = []
+    cursor = Floor.get_motor_collection().find({"building_id": building_id, "status": "active"}, projection)
+    async for floor in cursor.sort("floor_number", 1):
+        floor_ids.append(floor["floor_id"])
+        batch.append(_line(FLOOR, floor))
+    if batch:
+        yield b"".join(batch)
+
+    sources = (
+        (VERTICAL_CONNECTOR, VerticalConnector, {"floor_id": {"$in": floor_ids}, "status": "active"}),
+        (LOCATION, Location, {"floor_id": {"$in": floor_ids}, "status": "active"}),
+        (PATH, Path, {"building_id": building_id, "status": "active"}),
+    )
+    for record_type, model, query in sources:
+        batch = []
+        async for document in model.get_motor_collection().find(query, projection):
+            batch.append(_line(record_type, document))
+            if len(batch) >= batch_size:
+                yield b"".join(batch)
+                batch = []
+        if batch:
+            yield b"".join(batch)
+
+
+class _ChunkSink:
+    """Write-only, unseekable file for zipfile; the export hands on whatever was written"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def export_zip(building: Building) -> AsyncIterator[bytes]:
+    """export_ndjson deflated into a single-member ZIP, streamed as it is compressed"""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open(BUNDLE_MEMBER, "w", force_zip64=True) as member:
+            async for chunk in export_ndjson(building):
+                member.write(chunk)
+                data = sink.drain()
+                if data:
+                    yield data
+    yield sink.drain()
+
+
+# -----------------------------
+# Import: reading
+# -----------------------------
+
+class _RecordParser:
+    """Parses bundle lines as they are split, so only the decoded records are held"""
+
+    def __init__(self):
+        self.records: List[Tuple[int, Dict[str, Any]]] = []
+        self.errors: List[str] = []
+        self.count = 0
+
+    def add(self, number: int, line: bytes) -> None:
+        if not line.strip():
+            return
+        self.count += 1
+        if self.count > IMPORT_MAX_RECORDS:
+            raise BundleError([f"Bundle has more than the limit of {IMPORT_MAX_RECORDS} records"])
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            self._error(f"line {number}: invalid JSON ({e})")
+            return
+        if not isinstance(record, dict) or record.get("type") not in (HEADER, *RECORD_TYPES):
+            self._error(f"line {number}: expected an object with a type of {', '.join(RECORD_TYPES)}")
+            return
+        if record["type"] != HEADER and not isinstance(record.get("data"), dict):
+            self._error(f"line {number}: {record['type']} record has no data object")
+            return
+        self.records.append((number, record))
+
+    def _error(self, message: str) -> None:
+        self.errors.append(message)
+        if len(self.errors) >= IMPORT_MAX_ERRORS:
+            raise BundleError(self.errors)
+
+
+def _split_lines(buffer: bytes, line_number: int, parser: _RecordParser) -> Tuple[bytes, int]:
+    *lines, rest = buffer.split(b"\n")
+    for line in lines:
+        line_number += 1
+        parser.add(line_number, line)
+    return rest, line_number
+
+
+async def read_bundle(chunks: AsyncIterable[bytes]) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Parse an NDJSON bundle, or a ZIP of NDJSON members, from a request body
+    stream; returns (line number, record) pairs. NDJSON lines are decoded as
+    they arrive, so only the partial last line of a chunk is kept as bytes;
+    a ZIP is spooled first, since its index is at the end. The decoded
+    records are all held until the import has been validated.
+    """
+    parser = _RecordParser()
+    size = 0
+    buffer = b""
+    line_number = 0
+    spool = None
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            size += len(chunk)
+            if size > IMPORT_MAX_BYTES:
+                raise BundleError([f"Bundle is larger than {IMPORT_MAX_BYTES} bytes"])
+            if spool is None and size == len(chunk) and chunk.startswith(_ZIP_MAGIC):
+                spool = tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_BYTES)
+            if spool is not None:
+                spool.write(chunk)
+                continue
+            buffer, line_number = _split_lines(buffer + chunk, line_number, parser)
+        if spool is None:
+            _split_lines(buffer + b"\n", line_number, parser)
+        else:
+            spool.seek(0)
+            try:
+                with zipfile.ZipFile(spool) as archive:
+                    members = sorted(name for name in archive.namelist() if name.endswith(".ndjson"))
+                    if not members:
+                        raise BundleError(["ZIP bundle has no .ndjson member"])
+                    line_number = 0
+                    for name in members:
+                        with archive.open(name) as member:
+                            for line in member:
+                                line_number += 1
+                                parser.add(line_number, line)
+            except zipfile.BadZipFile as e:
+                raise BundleError([f"Invalid ZIP bundle: {e}"])
+    finally:
+        if spool is not None:
+            spool.close()
+
+    if parser.errors:
+        raise BundleError(parser.errors)
+    return parser.records
+
+
+# -----------------------------
+# Import: validation
+# -----------------------------
+
+class ImportPlan:
+    """Validated documents of a bundle, ready to insert into one building"""
+
+    def __init__(self, building_id: str):
+        self.building_id = building_id
+        # Set when the import creates the building
+        self.building: Optional[Building] = None
+        self.floors: List[Floor] = []
+        self.connectors: List[VerticalConnector] = []
+        self.locations: List[Location] = []
+        self.paths: List[Path] = []
+        # Existing floors that gain documents: floor_id -> {"locations" | "vertical_connectors" | "paths": ids}
+        self.existing_floor_additions: Dict[str, Dict[str, List[str]]] = {}
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "buildings": 1 if self.building else 0,
+            "floors": len(self.floors),
+            "vertical_connectors": len(self.connectors),
+            "locations": len(self.locations),
+            "paths": len(self.paths),
+        }
+
+
+def _describe(e: Exception) -> str:
+    if isinstance(e, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+        )
+    return str(e)
+
+
+def _shape_error(data: Dict[str, Any]) -> Optional[str]:
+    # The same rules as the single-document create endpoints
+    if data.get("shape") == ShapeType.RECTANGLE.value and (not data.get("width") or not data.get("height")):
+        return "width and height are required for rectangle shape"
+    if data.get("shape") == ShapeType.CIRCLE.value and not data.get("radius"):
+        return "radius is required for circle shape"
+    return None
+
+
+async def _find(model, query: Dict[str, Any], fields: Iterable[str]) -> List[Dict[str, Any]]:
+    projection = {field: 1 for field in fields}
+    projection["_id"] = 0
+    return await model.get_motor_collection().find(query, projection).to_list(length=None)
+
+
+async def plan_import(records: List[Tuple[int, Dict[str, Any]]], target: Optional[Building] = None,
+                      name: Optional[str] = None, keep_ids: bool = False,
+                      entity_uuid: Optional[str] = None, user_uuid: Optional[str] = None) -> ImportPlan:
+    """
+    Validate a bundle against itself and the target building with a fixed
+    number of queries, whatever its size: references, names and shapes are
+    checked in memory. Raises BundleError listing every problem (up to
+    IMPORT_MAX_ERRORS); nothing is written.
+
+    Without `target` the bundle's building record becomes a new building
+    (renamed to `name` if given). IDs are freshly generated and every
+    reference rewritten, so a venue can be cloned next to its source; with
+    `keep_ids` they are kept, and must not exist yet.
+    """
+    errors: List[str] = []
+
+    def error(line: int, message: str) -> None:
+        if len(errors) < IMPORT_MAX_ERRORS:
+            errors.append(f"line {line}: {message}")
+
+    by_type: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {record_type: [] for record_type in RECORD_TYPES}
+    for line, record in records:
+        if record["type"] == HEADER:
+            if (record.get("version") or 0) > BUNDLE_VERSION:
+                error(line, f"bundle version {record.get('version')} is newer than supported ({BUNDLE_VERSION})")
+            continue
+        by_type[record["type"]].append((line, record["data"]))
+
+    id_maps: Dict[str, Dict[str, str]] = {record_type: {} for record_type in RECORD_TYPES}
+
+    def assign_id(record_type: str, old_id: Optional[str]) -> str:
+        new_id = old_id if keep_ids and old_id else str(uuid.uuid4())
+        if old_id:
+            id_maps[record_type][old_id] = new_id
+        return new_id
+
+    now = time.time()
+    server_fields = {"status": "active", "datetime": now, "updated_by": None, "update_on": None}
+
+    # Building
+    if len(by_type[BUILDING]) > 1:
+        error(by_type[BUILDING][1][0], "a bundle describes a single building")
+    if target is not None:
+        plan = ImportPlan(target.building_id)
+        for _, data in by_type[BUILDING][:1]:
+            if data.get("building_id"):
+                id_maps[BUILDING][data["building_id"]] = target.building_id
+    elif by_type[BUILDING] or name:
+        line, data = by_type[BUILDING][0] if by_type[BUILDING] else (0, {})
+        building_id = assign_id(BUILDING, data.get("building_id"))
+        plan = ImportPlan(building_id)
+        try:
+            plan.building = Building(**{
+                **data, **server_fields,
+                "building_id": building_id,
+                "name": name or data.get("name"),
+                "floors": [],
+                "entity_uuid": entity_uuid,
+            })
+        except Exception as e:
+            error(line, f"invalid building: {_describe(e)}")
+    else:
+        raise BundleError(["The bundle has no building record; pass a building name or a target building"])
+
+    # What the target building already holds
+    existing_floors: Dict[str, Floor] = {}
+    if target is not None:
+        for floor in await Floor.find({"building_id": target.building_id, "status": "active"}).to_list():
+            existing_floors[floor.floor_id] = floor
+    if keep_ids:
+        for record_type, model, id_field in (
+            (FLOOR, Floor, "floor_id"), (VERTICAL_CONNECTOR, VerticalConnector, "connector_id"),
+            (LOCATION, Location, "location_id"), (PATH, Path, "path_id"),
+        ):
+            ids = [data[id_field] for _, data in by_type[record_type] if data.get(id_field)]
+            if ids:
+                for document in await _find(model, {id_field: {"$in": ids}}, (id_field,)):
+                    errors.append(f"{record_type} '{document[id_field]}' already exists")
+        if plan.building is not None and await Building.find_one({"building_id": plan.building_id}):
+            errors.append(f"building '{plan.building_id}' already exists")
+
+    # Floors
+    floor_names = {floor.name for floor in existing_floors.values()}
+    floor_numbers = {floor.floor_number for floor in existing_floors.values()}
+    new_floors: Dict[str, Floor] = {}
+    for line, data in by_type[FLOOR]:
+        floor_id = assign_id(FLOOR, data.get("floor_id"))
+        try:
+            floor = Floor(**{
+                **data, **server_fields,
+                "floor_id": floor_id,
+                "building_id": plan.building_id,
+                "locations": [],
+                "vertical_connectors": [],
+                "paths": [],
+                "entity_uuid": entity_uuid,
+            })
+        except Exception as e:
+            error(line, f"invalid floor: {_describe(e)}")
+            continue
+        if floor.name in floor_names:
+            error(line, f"floor name '{floor.name}' is used twice in this building")
+        if floor.floor_number in floor_numbers:
+            error(line, f"floor number {floor.floor_number} is used twice in this building")
+        floor_names.add(floor.name)
+        floor_numbers.add(floor.floor_number)
+        new_floors[floor_id] = floor
+        plan.floors.append(floor)
+
+    def resolve_floor(line: int, old_floor_id: Optional[str]) -> Optional[str]:
+        floor_id = id_maps[FLOOR].get(old_floor_id)
+        if floor_id is None and old_floor_id in existing_floors:
+            floor_id = old_floor_id
+        if floor_id is None:
+            error(line, f"floor '{old_floor_id}' is neither in the bundle nor in the target building")
+        return floor_id
+
+    def add_to_floor(floor_id: str, field: str, entity_id: str) -> None:
+        if floor_id in new_floors:
+            getattr(new_floors[floor_id], field).append(entity_id)
+        else:
+            plan.existing_floor_additions.setdefault(floor_id, {}).setdefault(field, []).append(entity_id)
+
+    # Names already taken on existing floors, for the per-floor uniqueness rule
+    taken: Dict[str, Set[Tuple[str, str]]] = {VERTICAL_CONNECTOR: set(), LOCATION: set()}
+    if existing_floors:
+        for record_type, model in ((VERTICAL_CONNECTOR, VerticalConnector), (LOCATION, Location)):
+            documents = await _find(
+                model, {"floor_id": {"$in": list(existing_floors)}, "status": "active"}, ("name", "floor_id")
+            )
+            taken[record_type] = {(document["floor_id"], document["name"]) for document in documents}
+
+    # Vertical connectors and locations
+    new_connectors: Dict[str, VerticalConnector] = {}
+    new_locations: Dict[str, Location] = {}
+    for record_type, model, id_field, floor_field, label, created in (
+        (VERTICAL_CONNECTOR, VerticalConnector, "connector_id", "vertical_connectors", "vertical connector",
+         new_connectors),
+        (LOCATION, Location, "location_id", "locations", "location", new_locations),
+    ):
+        for line, data in by_type[record_type]:
+            entity_id = assign_id(record_type, data.get(id_field))
+            floor_id = resolve_floor(line, data.get("floor_id"))
+            shape_error = _shape_error(data)
+            if shape_error:
+                error(line, f"invalid {label}: {shape_error}")
+            if floor_id is None or shape_error:
+                continue
+            try:
+                document = model(**{
+                    **data, **server_fields, id_field: entity_id, "floor_id": floor_id, "created_by": user_uuid,
+                })
+            except Exception as e:
+                error(line, f"invalid {label}: {_describe(e)}")
+                continue
+            if (floor_id, document.name) in taken[record_type]:
+                error(line, f"{label} name '{document.name}' is used twice on floor '{floor_id}'")
+            taken[record_type].add((floor_id, document.name))
+            created[entity_id] = document
+            add_to_floor(floor_id, floor_field, entity_id)
+    plan.connectors = list(new_connectors.values())
+    plan.locations = list(new_locations.values())
+
+    # Points of paths that reference documents outside the bundle, resolved in one query per type
+    outside: Dict[str, Set[str]] = {NodeKind.LOCATION.value: set(), NodeKind.VERTICAL_CONNECTOR.value: set()}
+    for _, data in by_type[PATH]:
+        for segment in data.get("floor_segments") or ():
+            for point in (segment.get("points") if isinstance(segment, dict) else None) or ():
+                if not isinstance(point, dict):
+                    continue
+                kind, ref_id = point.get("kind"), point.get("ref_id")
+                if kind == NodeKind.LOCATION.value and ref_id and ref_id not in id_maps[LOCATION]:
+                    outside[kind].add(ref_id)
+                elif kind == NodeKind.VERTICAL_CONNECTOR.value and ref_id and ref_id not in id_maps[VERTICAL_CONNECTOR]:
+                    outside[kind].add(ref_id)
+    existing_refs: Dict[str, Dict[str, Dict[str, Any]]] = {kind: {} for kind in outside}
+    if existing_floors:
+        for kind, model, id_field, fields in (
+            (NodeKind.LOCATION.value, Location, "location_id", ("location_id", "floor_id")),
+            (NodeKind.VERTICAL_CONNECTOR.value, VerticalConnector, "connector_id",
+             ("connector_id", "floor_id", "shared_id")),
+        ):
+            if outside[kind]:
+                documents = await _find(model, {
+                    id_field: {"$in": list(outside[kind])},
+                    "floor_id": {"$in": list(existing_floors)},
+                    "status": "active",
+                }, fields)
+                existing_refs[kind] = {document[id_field]: document for document in documents}
+
+    # Paths
+    for line, data in by_type[PATH]:
+        path_id = assign_id(PATH, data.get("path_id"))
+        try:
+            path = Path(**{
+                **data, **server_fields,
+                "path_id": path_id,
+                "building_id": plan.building_id,
+                "created_by": user_uuid,
+            })
+        except Exception as e:
+            error(line, f"invalid path: {_describe(e)}")
+            continue
+        if not path.floor_segments or any(len(segment.points or []) < 2 for segment in path.floor_segments):
+            error(line, "a path needs at least one floor segment of at least 2 points")
+            continue
+        valid = True
+        for segment in path.floor_segments:
+            floor_id = resolve_floor(line, segment.floor_id)
+            if floor_id is None:
+                valid = False
+                continue
+            segment.floor_id = floor_id
+            for point in segment.points:
+                if point.kind == NodeKind.WAYPOINT:
+                    if point.x is None or point.y is None:
+                        error(line, "waypoint requires x and y coordinates")
+                        valid = False
+                    continue
+                if not point.ref_id:
+                    error(line, f"{point.kind.value} point requires ref_id")
+                    valid = False
+                    continue
+                if point.kind == NodeKind.LOCATION:
+                    ref_id = id_maps[LOCATION].get(point.ref_id)
+                    if ref_id not in new_locations and point.ref_id not in existing_refs[point.kind.value]:
+                        error(line, f"location '{point.ref_id}' not found")
+                        valid = False
+                        continue
+                    point.ref_id = ref_id or point.ref_id
+                elif point.kind == NodeKind.VERTICAL_CONNECTOR:
+                    ref_id = id_maps[VERTICAL_CONNECTOR].get(point.ref_id)
+                    connector = new_connectors.get(ref_id) or existing_refs[point.kind.value].get(point.ref_id)
+                    if connector is None:
+                        error(line, f"vertical connector '{point.ref_id}' not found")
+                        valid = False
+                        continue
+                    point.ref_id = ref_id or point.ref_id
+                    if not point.shared_id:
+                        point.shared_id = connector.shared_id if ref_id else connector.get("shared_id")
+        if not valid:
+            continue
+        path.floor_segments.sort(key=lambda segment: segment.sequence)
+        # Endpoints may name any node; rewrite those that were renumbered
+        for field in ("start_point_id", "end_point_id"):
+            old_id = getattr(path, field)
+            setattr(path, field, id_maps[LOCATION].get(old_id) or id_maps[VERTICAL_CONNECTOR].get(old_id) or old_id)
+        path.recompute_denorm()
+        for floor_id in path.floors:
+            add_to_floor(floor_id, "paths", path_id)
+        plan.paths.append(path)
+
+    if errors:
+        raise BundleError(errors)
+    if plan.building is not None:
+        plan.building.floors = [floor.floor_id for floor in plan.floors]
+    return plan
+
+
+# -----------------------------
+# Import: writing
+# -----------------------------
+
+async def execute_import(plan: ImportPlan) -> Dict[str, Any]:
+    """
+    Insert a validated plan in batches of IMPORT_BATCH_SIZE and link new
+    documents to existing floors and the building. On failure, those links
+    are pulled and what was inserted is removed again before the error is
+    raised.
+    """
+    start = time.perf_counter()
+    inserted: List[Tuple[Any, str, List[str]]] = []
+    building_linked = floors_linked = False
+    try:
+        if plan.building is not None:
+            await plan.building.insert()
+            inserted.append((Building, "building_id", [plan.building_id]))
+        for model, id_field, documents in (
+            (Floor, "floor_id", plan.floors),
+            (VerticalConnector, "connector_id", plan.connectors),
+            (Location, "location_id", plan.locations),
+            (Path, "path_id", plan.paths),
+        ):
+            for i in range(0, len(documents), IMPORT_BATCH_SIZE):
+                batch = documents[i:i + IMPORT_BATCH_SIZE]
+                await model.insert_many(batch)
+                inserted.append((model, id_field, [getattr(document, id_field) for document in batch]))
+
+        now = time.time()
+        if plan.building is None and plan.floors:
+            building_linked = True
+            await Building.get_motor_collection().update_one(
+                {"building_id": plan.building_id},
+                {"$addToSet": {"floors": {"$each": [floor.floor_id for floor in plan.floors]}},
+                 "$set": {"update_on": now}},
+            )
+        if plan.existing_floor_additions:
+            floors_linked = True
+            await Floor.get_motor_collection().bulk_write([
+                UpdateOne({"floor_id": floor_id}, {
+                    "$addToSet": {field: {"$each": ids} for field, ids in additions.items()},
+                    "$set": {"update_on": now},
+                })
+                for floor_id, additions in plan.existing_floor_additions.items()
+            ], ordered=False)
+    except Exception:
+        await _unlink_import(plan, building_linked, floors_linked)
+        for model, id_field, ids in reversed(inserted):
+            try:
+                await model.get_motor_collection().delete_many({id_field: {"$in": ids}})
+            except Exception as cleanup_error:
+                logger.error(f"Failed to roll back imported {model.__name__} documents: {cleanup_error}")
+        raise
+
+    await _publish_import(plan)
+    counts = plan.counts()
+    logger.info(
+        f"Imported into building {plan.building_id}: {counts} in {(time.perf_counter() - start) * 1000:.1f}ms"
+    )
+    return {"building_id": plan.building_id, "imported": counts}
+
+
+async def _unlink_import(plan: ImportPlan, building_linked: bool, floors_linked: bool) -> None:
+    """
+    Undo the $addToSet links of a failed import. The ids are all new to the
+    import, so pulling them cannot remove anything that was there before.
+    """
+    try:
+        if floors_linked:
+            await Floor.get_motor_collection().bulk_write([
+                UpdateOne({"floor_id": floor_id}, {
+                    "$pull": {field: {"$in": ids} for field, ids in additions.items()},
+                })
+                for floor_id, additions in plan.existing_floor_additions.items()
+            ], ordered=False)
+        if building_linked:
+            await Building.get_motor_collection().update_one(
+                {"building_id": plan.building_id},
+                {"$pull": {"floors": {"$in": [floor.floor_id for floor in plan.floors]}}},
+            )
+    except Exception as cleanup_error:
+        logger.error(f"Failed to unlink the import from building {plan.building_id}: {cleanup_error}")
+
+
+async def _publish_import(plan: ImportPlan) -> None:
+    floor_ids = [floor.floor_id for floor in plan.floors] + list(plan.existing_floor_additions)
+    entity_uuids = {floor.entity_uuid for floor in plan.floors if floor.entity_uuid}
+    await invalidate_tags(
+        building_tag(plan.building_id),
+        entity_list_tag(BUILDINGS, plan.building.entity_uuid) if plan.building else None,
+        *(entity_list_tag(FLOORS, entity_uuid) for entity_uuid in entity_uuids),
+        LOCATIONS if plan.locations else None,
+        PATHS if plan.paths else None,
+        building_list_tag(PATHS, plan.building_id) if plan.paths else None,
+        *(floor_tag(floor_id) for floor_id in floor_ids),
+    )
+    await navigation_service.on_building_changed(plan.building_id)
+    for entity_type, ids in (
+        (change_log.FLOOR, [floor.floor_id for floor in plan.floors]),
+        (change_log.VERTICAL_CONNECTOR, [connector.connector_id for connector in plan.connectors]),
+        (change_log.LOCATION, [location.location_id for location in plan.locations]),
+        (change_log.PATH, [path.path_id for path in plan.paths]),
+    ):
+        await change_log.record_changes(plan.building_id, entity_type, upserts=ids, floor_ids=floor_ids)
+    cache_warmer.schedule(plan.building_id)
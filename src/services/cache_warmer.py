@@ -0,0 +1,122 @@
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from src.datamodel.database.domain.DigitalSignage import Building, Floor
+import asyncio
+import os
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cache loads running at once across a whole warmup, so a cold boot does not flood the database
+WARMUP_CONCURRENCY = int(os.getenv("CACHE_WARMUP_CONCURRENCY", "4"))
+# Warm every active building when a worker starts
+WARMUP_ON_STARTUP = os.getenv("CACHE_WARMUP_ON_STARTUP", "true").lower() == "true"
+
+# Called once per active building with the ids of its active floors
+Warmer = Callable[[Building, List[str]], Awaitable[Any]]
+
+
+class CacheWarmer:
+    """
+    Fills the read caches ahead of traffic: at startup for every active
+    building, and for one building after its content is published.
+
+    Endpoint modules register what to warm (`register`); a warmer spreads its
+    cache loads over `run_bounded`, which caps concurrent loads process-wide.
+    """
+
+    def __init__(self, concurrency: int = WARMUP_CONCURRENCY):
+        self._warmers: Dict[str, Warmer] = {}
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        # building_id (or "*" for a full warmup) -> running warmup
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Warmups requested while one was running; they run again once it finishes
+        self._rerun: Set[str] = set()
+
+    def register(self, name: str, warmer: Warmer) -> None:
+        self._warmers[name] = warmer
+
+    async def run_bounded(self, loads: Iterable[Callable[[], Awaitable[Any]]]) -> int:
+        """Run cache loads under the shared concurrency limit; returns how many succeeded"""
+        async def run(load: Callable[[], Awaitable[Any]]) -> bool:
+            async with self._semaphore:
+                try:
+                    await load()
+                    return True
+                except Exception as e:
+                    logger.warning(f"Cache warm load failed: {e}")
+                    return False
+
+        results = await asyncio.gather(*(run(load) for load in loads))
+        return sum(results)
+
+    async def warm_building(self, building: Building) -> None:
+        floors = await Floor.find({"building_id": building.building_id, "status": "active"}).to_list()
+        floor_ids = [floor.floor_id for floor in floors]
+
+        async def run(name: str, warmer: Warmer) -> None:
+            try:
+                await warmer(building, floor_ids)
+            except Exception as e:
+                logger.warning(f"Cache warmer '{name}' failed for building {building.building_id}: {e}")
+
+        await asyncio.gather(*(run(name, warmer) for name, warmer in self._warmers.items()))
+
+    async def warm_all(self) -> None:
+        """Warm every active building"""
+        start = time.perf_counter()
+        buildings = await Building.find({"status": "active"}).to_list()
+        await asyncio.gather(*(self.warm_building(building) for building in buildings))
+        logger.info(
+            f"Cache warmup: {len(buildings)} buildings, {len(self._warmers)} warmers "
+            f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+    async def warm_building_id(self, building_id: str) -> None:
+        building = await Building.find_one({"building_id": building_id, "status": "active"})
+        if building:
+            await self.warm_building(building)
+
+    def schedule(self, building_id: Optional[str] = None) -> None:
+        """Warm one building (or all) in the background"""
+        key = building_id or "*"
+        task = self._tasks.get(key)
+        if task is not None and not task.done():
+            # Loads that straddled the write are not cached, so go round once more
+            self._rerun.add(key)
+            return
+        self._tasks[key] = asyncio.create_task(self._run(building_id))
+
+    async def _run(self, building_id: Optional[str]) -> None:
+        key = building_id or "*"
+        try:
+            while True:
+                self._rerun.discard(key)
+                if building_id:
+                    await self.warm_building_id(building_id)
+                else:
+                    await self.warm_all()
+                if key not in self._rerun:
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache warmup '{key}' failed: {e}")
+        finally:
+            self._tasks.pop(key, None)
+
+    def start(self) -> None:
+        """Warm every active building in the background (call once from the app lifespan)"""
+        if WARMUP_ON_STARTUP:
+            self.schedule()
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._rerun.clear()
+
+
+cache_warmer = CacheWarmer()
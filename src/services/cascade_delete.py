@@ -0,0 +1,270 @@
+from typing import Any, Dict, Iterable, List, Optional, Set
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.datamodel.database.domain.DigitalSignage import Building, Floor, Location, Path, VerticalConnector
+from src.datamodel.database.userauth.AuthenticationTables import Entity, User, UserEntityRoleMap
+from src.common.cache import (
+    invalidate_tags, BUILDINGS, FLOORS, LOCATIONS, PATHS, building_tag, floor_tag, location_tag, path_tag,
+    entity_list_tag, building_list_tag
+)
+from src.services.navigation_service import navigation_service
+from src.services import change_log
+from src.services.job_queue import job_queue
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Status a soft delete leaves behind, matching each entity's own delete endpoint
+DELETED = "deleted"
+INACTIVE = "inactive"
+
+
+class CascadeResult:
+    """IDs a cascade removed, grouped by the building they belonged to"""
+
+    def __init__(self):
+        self.building_ids: List[str] = []
+        self.floor_ids: Dict[Optional[str], List[str]] = {}
+        self.location_ids: Dict[Optional[str], List[str]] = {}
+        self.connector_ids: Dict[Optional[str], List[str]] = {}
+        self.path_ids: Dict[Optional[str], List[str]] = {}
+        # Buildings whose `floors` list was pruned
+        self.buildings_updated: List[str] = []
+        # Floors of every removed connector and path, for display notifications
+        self.touched_floor_ids: Dict[Optional[str], Set[str]] = {}
+        # Entities whose building / floor lists lost members
+        self.entity_uuids: Set[str] = set()
+
+    @staticmethod
+    def count(ids_by_building: Dict[Optional[str], List[str]]) -> int:
+        return sum(len(ids) for ids in ids_by_building.values())
+
+    @staticmethod
+    def all_ids(ids_by_building: Dict[Optional[str], List[str]]) -> List[str]:
+        return [entity_id for ids in ids_by_building.values() for entity_id in ids]
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts and IDs for a response or a job result"""
+        return {
+            "deleted_buildings": self.building_ids,
+            "deleted_floors": self.all_ids(self.floor_ids),
+            "affected_floors": self.count(self.floor_ids),
+            "affected_locations": self.count(self.location_ids),
+            "affected_connectors": self.count(self.connector_ids),
+            "affected_paths": self.count(self.path_ids),
+            "buildings_updated": self.buildings_updated,
+        }
+
+    def buildings_touched(self) -> List[str]:
+        building_ids = dict.fromkeys(self.building_ids)
+        for ids_by_building in (self.floor_ids, self.location_ids, self.connector_ids, self.path_ids):
+            building_ids.update(dict.fromkeys(b for b in ids_by_building if b))
+        return list(building_ids)
+
+
+async def _find(model, query: Dict[str, Any], fields: Iterable[str]) -> List[Dict[str, Any]]:
+    # Only the fields the cascade needs, without hydrating documents
+    projection = {field: 1 for field in fields}
+    projection["_id"] = 0
+    return await model.get_motor_collection().find(query, projection).to_list(length=None)
+
+
+async def _remove(model, id_field: str, ids: List[str], hard_delete: bool,
+                  soft_status: str, updated_by: Optional[str], now: float) -> None:
+    """One delete_many (hard) or update_many (soft) for all `ids`"""
+    if not ids:
+        return
+    query = {id_field: {"$in": ids}}
+    collection = model.get_motor_collection()
+    if hard_delete:
+        await collection.delete_many(query)
+    else:
+        await collection.update_many(
+            query, {"$set": {"status": soft_status, "updated_by": updated_by, "update_on": now}}
+        )
+
+
+async def delete_floors(floors: List[Floor], hard_delete: bool, cascade: bool = True,
+                        updated_by: Optional[str] = None, result: Optional[CascadeResult] = None,
+                        prune_buildings: bool = True) -> CascadeResult:
+    """
+    Delete `floors` and, with `cascade`, their locations, vertical connectors
+    and the paths crossing them, with one set-based query per collection
+    whatever the number of documents.
+
+    Soft deletes mark locations and floors "deleted" and connectors and paths
+    "inactive", as their own delete endpoints do. Hard deletes also pull the
+    floors from their building's `floors` unless `prune_buildings` is False
+    (the buildings themselves are going).
+    """
+    result = result if result is not None else CascadeResult()
+    if not floors:
+        return result
+    now = time.time()
+    building_of = {floor.floor_id: floor.building_id for floor in floors}
+    floor_ids = list(building_of)
+    result.entity_uuids.update(floor.entity_uuid for floor in floors if floor.entity_uuid)
+
+    if cascade:
+        # Locations that point at the floors, or that the floors still list
+        listed_on = {location_id: floor.floor_id for floor in floors for location_id in floor.locations or ()}
+        locations = await _find(Location, {
+            "$or": [{"floor_id": {"$in": floor_ids}}, {"location_id": {"$in": list(listed_on)}}],
+            "status": "active",
+        }, ("location_id", "floor_id"))
+        for location in locations:
+            floor_id = location.get("floor_id")
+            if floor_id not in building_of:
+                floor_id = listed_on.get(location["location_id"])
+            result.location_ids.setdefault(building_of.get(floor_id), []).append(location["location_id"])
+        await _remove(Location, "location_id", [location["location_id"] for location in locations],
+                      hard_delete, DELETED, updated_by, now)
+
+        connectors = await _find(VerticalConnector, {"floor_id": {"$in": floor_ids}, "status": "active"},
+                                 ("connector_id", "floor_id"))
+        for connector in connectors:
+            building_id = building_of.get(connector["floor_id"])
+            result.connector_ids.setdefault(building_id, []).append(connector["connector_id"])
+            result.touched_floor_ids.setdefault(building_id, set()).add(connector["floor_id"])
+        await _remove(VerticalConnector, "connector_id", [connector["connector_id"] for connector in connectors],
+                      hard_delete, INACTIVE, updated_by, now)
+
+        # A path that crosses a removed floor can no longer be walked, even if it also serves other floors
+        paths = await _find(Path, {"floors": {"$in": floor_ids}, "status": "active"},
+                            ("path_id", "building_id", "floors"))
+        path_ids = [path["path_id"] for path in paths]
+        for path in paths:
+            result.path_ids.setdefault(path.get("building_id"), []).append(path["path_id"])
+            result.touched_floor_ids.setdefault(path.get("building_id"), set()).update(path.get("floors") or ())
+        await _remove(Path, "path_id", path_ids, hard_delete, INACTIVE, updated_by, now)
+        if path_ids:
+            await Floor.get_motor_collection().update_many(
+                {"paths": {"$in": path_ids}, "floor_id": {"$nin": floor_ids}},
+                {"$pull": {"paths": {"$in": path_ids}}, "$set": {"update_on": now}},
+            )
+
+    if hard_delete and prune_buildings:
+        building_ids = [building_id for building_id in dict.fromkeys(building_of.values()) if building_id]
+        if building_ids:
+            query = {"building_id": {"$in": building_ids}, "floors": {"$in": floor_ids}}
+            listing = await _find(Building, query, ("building_id",))
+            if listing:
+                await Building.get_motor_collection().update_many(query, {
+                    "$pull": {"floors": {"$in": floor_ids}},
+                    "$set": {"updated_by": updated_by, "update_on": now},
+                })
+                result.buildings_updated.extend(building["building_id"] for building in listing)
+
+    await _remove(Floor, "floor_id", floor_ids, hard_delete, DELETED, updated_by, now)
+    for floor_id, building_id in building_of.items():
+        result.floor_ids.setdefault(building_id, []).append(floor_id)
+    return result
+
+
+async def delete_buildings(buildings: List[Building], hard_delete: bool, cascade: bool = True,
+                           updated_by: Optional[str] = None) -> CascadeResult:
+    """Delete `buildings` and, with `cascade`, their active floors and everything on them"""
+    result = CascadeResult()
+    if not buildings:
+        return result
+    if cascade:
+        with_floors = [building.building_id for building in buildings if building.floors]
+        if with_floors:
+            floors = await Floor.find({"building_id": {"$in": with_floors}, "status": "active"}).to_list()
+            await delete_floors(floors, hard_delete, True, updated_by, result, prune_buildings=False)
+    result.building_ids = [building.building_id for building in buildings]
+    result.entity_uuids.update(building.entity_uuid for building in buildings if building.entity_uuid)
+    await _remove(Building, "building_id", result.building_ids, hard_delete, DELETED, updated_by, time.time())
+    return result
+
+
+async def publish_deletes(result: CascadeResult, hard_delete: bool) -> None:
+    """
+    Rebuild navigation, invalidate caches and record the change log for
+    everything a cascade removed. Soft deletes are logged as upserts: the
+    delta endpoint resolves documents that are no longer active to tombstones.
+    """
+    tags: List[Optional[str]] = []
+    if result.building_ids:
+        tags += [entity_list_tag(BUILDINGS, entity_uuid) for entity_uuid in result.entity_uuids]
+        tags += [building_tag(building_id) for building_id in result.building_ids]
+    if result.floor_ids:
+        tags += [entity_list_tag(FLOORS, entity_uuid) for entity_uuid in result.entity_uuids]
+        tags += [floor_tag(floor_id) for floor_id in result.all_ids(result.floor_ids)]
+    if result.location_ids:
+        tags += [LOCATIONS, *(location_tag(location_id) for location_id in result.all_ids(result.location_ids))]
+    if result.path_ids:
+        tags += [PATHS, *(path_tag(path_id) for path_id in result.all_ids(result.path_ids))]
+        tags += [building_list_tag(PATHS, building_id) for building_id in result.path_ids]
+    touched = result.buildings_touched()
+    tags += [building_tag(building_id) for building_id in touched]
+    tags += [floor_tag(floor_id) for floor_ids in result.touched_floor_ids.values() for floor_id in floor_ids]
+    await invalidate_tags(*tags)
+
+    for building_id in touched:
+        await navigation_service.on_building_changed(building_id)
+        floor_ids = sorted(result.touched_floor_ids.get(building_id, ()))
+        for entity_type, ids_by_building in (
+            (change_log.LOCATION, result.location_ids),
+            (change_log.VERTICAL_CONNECTOR, result.connector_ids),
+            (change_log.PATH, result.path_ids),
+            (change_log.FLOOR, result.floor_ids),
+        ):
+            ids = ids_by_building.get(building_id)
+            if not ids:
+                continue
+            if hard_delete:
+                await change_log.record_changes(building_id, entity_type, deletes=ids, floor_ids=floor_ids)
+            else:
+                await change_log.record_changes(building_id, entity_type, upserts=ids, floor_ids=floor_ids)
+
+
+async def _delete_floors_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    floor_ids = payload["floor_ids"]
+    floors = await Floor.find({"floor_id": {"$in": floor_ids}}).to_list()
+    result = await delete_floors(floors, payload["hard_delete"], payload["cascade"], payload.get("updated_by"))
+    await publish_deletes(result, payload["hard_delete"])
+    found = {floor.floor_id for floor in floors}
+    return {**result.summary(), "failed_deletions": [floor_id for floor_id in floor_ids if floor_id not in found]}
+
+
+async def _delete_buildings_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    building_ids = payload["building_ids"]
+    buildings = await Building.find({"building_id": {"$in": building_ids}}).to_list()
+    result = await delete_buildings(buildings, payload["hard_delete"], payload["cascade"], payload.get("updated_by"))
+    await publish_deletes(result, payload["hard_delete"])
+    found = {building.building_id for building in buildings}
+    return {
+        **result.summary(),
+        "failed_deletions": [building_id for building_id in building_ids if building_id not in found],
+    }
+
+
+# Payload: {"floor_ids" | "building_ids": [...], "hard_delete": bool, "cascade": bool, "updated_by": str | None}
+DELETE_FLOORS_JOB = "floors.delete"
+DELETE_BUILDINGS_JOB = "buildings.delete"
+job_queue.register(DELETE_FLOORS_JOB, _delete_floors_job)
+job_queue.register(DELETE_BUILDINGS_JOB, _delete_buildings_job)
+
+
+async def delete_entity_members(db: AsyncSession, entity_uuid: str) -> Dict[str, int]:
+    """
+    Remove an entity's role mappings, the users no longer mapped to any other
+    entity, and the entity itself, in one transaction of set-based statements.
+    The caller commits.
+    """
+    member_uuids = select(UserEntityRoleMap.user_uuid).where(UserEntityRoleMap.entity_uuid == entity_uuid)
+    linked_elsewhere = select(UserEntityRoleMap.user_uuid).where(UserEntityRoleMap.entity_uuid != entity_uuid)
+    # Orphans are resolved before the mappings go, while membership is still visible
+    orphan_uuids = (await db.execute(
+        select(User.user_uuid).where(User.user_uuid.in_(member_uuids), User.user_uuid.not_in(linked_elsewhere))
+    )).scalars().all()
+
+    role_maps = await db.execute(delete(UserEntityRoleMap).where(UserEntityRoleMap.entity_uuid == entity_uuid))
+    users_deleted = 0
+    if orphan_uuids:
+        users = await db.execute(delete(User).where(User.user_uuid.in_(orphan_uuids)))
+        users_deleted = users.rowcount
+    await db.execute(delete(Entity).where(Entity.entity_uuid == entity_uuid))
+    return {"role_maps_deleted": role_maps.rowcount, "users_deleted": users_deleted}
@@ -0,0 +1,206 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pymongo import ReturnDocument
+from src.datamodel.database.domain.DigitalSignage import (
+    Location, Floor, Path, VerticalConnector, ChangeCounter, ChangeLogEntry, ChangeOp
+)
+from src.services.push_hub import notify_change
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Entity types recorded in the change log, with their document model and ID field
+LOCATION = "location"
+FLOOR = "floor"
+PATH = "path"
+VERTICAL_CONNECTOR = "vertical_connector"
+
+# A missing version may be a concurrent writer's insert still in flight; it is waited for this long once
+CHANGE_GAP_GRACE_SECONDS = 0.5
+
+ENTITY_MODELS = {
+    LOCATION: (Location, "location_id"),
+    FLOOR: (Floor, "floor_id"),
+    PATH: (Path, "path_id"),
+    VERTICAL_CONNECTOR: (VerticalConnector, "connector_id"),
+}
+
+
+async def record_changes(building_id: Optional[str], entity_type: str,
+                         upserts: Iterable[str] = (), deletes: Iterable[str] = (),
+                         floor_ids: Iterable[str] = ()) -> Optional[int]:
+    """
+    Append changes of one building to its change log and push the new version
+    to the building's displays (and those of `floor_ids`); returns the new
+    version, or None when nothing was recorded.
+
+    The version range is reserved with a single $inc, so concurrent writers
+    never share a version and a building's versions stay consecutive. A
+    failure is logged, not raised: the write itself already succeeded, and
+    kiosks that miss a version fall back to a full re-sync.
+    """
+    changes: List[Tuple[str, ChangeOp]] = (
+        [(entity_id, ChangeOp.UPSERT) for entity_id in dict.fromkeys(upserts) if entity_id]
+        + [(entity_id, ChangeOp.DELETE) for entity_id in dict.fromkeys(deletes) if entity_id]
+    )
+    if not building_id or not changes:
+        return None
+    if entity_type == FLOOR:
+        floor_ids = [*floor_ids, *(entity_id for entity_id, _ in changes)]
+    version = None
+    try:
+        counter = await ChangeCounter.get_motor_collection().find_one_and_update(
+            {"building_id": building_id},
+            {"$inc": {"version": len(changes)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        version = counter["version"]
+        first = version - len(changes) + 1
+        await ChangeLogEntry.insert_many([
+            ChangeLogEntry(building_id=building_id, version=first + i, entity_type=entity_type,
+                           entity_id=entity_id, op=op)
+            for i, (entity_id, op) in enumerate(changes)
+        ])
+    except Exception as e:
+        logger.error(f"Failed to record {len(changes)} {entity_type} changes for building {building_id}: {e}")
+        version = None
+    # Sent without a version when recording failed: displays then re-sync through the delta endpoint
+    await notify_change(building_id, entity_type, version, floor_ids)
+    return version
+
+
+async def record_floor_changes(entity_type: str, upserts: Iterable[Tuple[str, Optional[str]]] = (),
+                               deletes: Iterable[Tuple[str, Optional[str]]] = ()) -> None:
+    """
+    record_changes for entities that only know their floor (locations, vertical
+    connectors): `upserts` and `deletes` are (entity_id, floor_id) pairs.
+    """
+    upserts, deletes = list(upserts), list(deletes)
+    floor_ids = {floor_id for _, floor_id in upserts + deletes if floor_id}
+    if not floor_ids:
+        return
+    try:
+        floors = await Floor.find({"floor_id": {"$in": list(floor_ids)}}).to_list()
+    except Exception as e:
+        logger.error(f"Failed to resolve buildings for {entity_type} changes: {e}")
+        return
+    building_of = {floor.floor_id: floor.building_id for floor in floors}
+
+    by_building: Dict[str, Tuple[List[str], List[str], List[str]]] = {}
+    for changes, index in ((upserts, 0), (deletes, 1)):
+        for entity_id, floor_id in changes:
+            building_id = building_of.get(floor_id)
+            if building_id:
+                building_changes = by_building.setdefault(building_id, ([], [], []))
+                building_changes[index].append(entity_id)
+                building_changes[2].append(floor_id)
+    for building_id, (building_upserts, building_deletes, building_floors) in by_building.items():
+        await record_changes(building_id, entity_type, building_upserts, building_deletes, building_floors)
+
+
+async def current_version(building_id: str) -> int:
+    counter = await ChangeCounter.find_one({"building_id": building_id})
+    return counter.version if counter else 0
+
+
+def _consecutive(entries: List[ChangeLogEntry], since: int) -> List[ChangeLogEntry]:
+    """The leading entries whose versions follow on from `since` without a gap"""
+    for i, entry in enumerate(entries):
+        if entry.version != since + 1 + i:
+            return entries[:i]
+    return entries
+
+
+async def _entries_after(building_id: str, since: int, limit: int) -> Tuple[List[ChangeLogEntry], bool]:
+    """Log entries after `since` up to the first missing version, and whether one was missing"""
+    entries = await ChangeLogEntry.find(
+        {"building_id": building_id, "version": {"$gt": since}}
+    ).sort("version").limit(limit).to_list()
+    prefix = _consecutive(entries, since)
+    return prefix, not entries or len(prefix) < len(entries)
+
+
+async def changes_since(building_id: str, since: int, limit: int) -> Dict[str, Any]:
+    """
+    Net changes of a building after version `since`, at most `limit` log
+    entries at a time.
+
+    Each changed entity is listed once: as an upsert with its current document
+    when it is still active in this building, otherwise as a tombstone (hard
+    or soft deleted, or moved to another building). `reset` means the client
+    must re-sync in full and continue from `current_version`: always for
+    since=0, since content older than the log was never recorded in it, and
+    when `since` is older than the retained log (or newer than the building's
+    version).
+
+    A version is reserved before its entry is inserted, so a missing version
+    is waited for once (CHANGE_GAP_GRACE_SECONDS). Changes stop before a
+    version that is still missing, with `has_more` set; when the very next
+    version is still missing (trimmed, or its insert failed) it is a reset.
+    """
+    current = await current_version(building_id)
+    result: Dict[str, Any] = {
+        "building_id": building_id,
+        "since": since,
+        "version": since,
+        "current_version": current,
+        "reset": False,
+        "has_more": False,
+        "upserts": {},
+        "deletes": {},
+    }
+    if since == 0 or since > current:
+        result.update(reset=True, version=current)
+        return result
+    if since == current:
+        return result
+
+    entries, gap = await _entries_after(building_id, since, limit)
+    if gap:
+        await asyncio.sleep(CHANGE_GAP_GRACE_SECONDS)
+        entries, gap = await _entries_after(building_id, since, limit)
+    if not entries:
+        result.update(reset=True, version=current)
+        return result
+
+    # The last change of an entity wins
+    latest: Dict[Tuple[str, str], ChangeOp] = {}
+    for entry in entries:
+        latest[(entry.entity_type, entry.entity_id)] = entry.op
+    result["version"] = entries[-1].version
+    result["has_more"] = gap or result["version"] < current
+
+    upserts: Dict[str, Dict[str, Any]] = {}
+    deletes: Dict[str, List[str]] = {}
+    pending: Dict[str, List[str]] = {}
+    for (entity_type, entity_id), op in latest.items():
+        if op == ChangeOp.DELETE or entity_type not in ENTITY_MODELS:
+            deletes.setdefault(entity_type, []).append(entity_id)
+        else:
+            pending.setdefault(entity_type, []).append(entity_id)
+
+    floor_ids = None
+    if pending.get(LOCATION) or pending.get(VERTICAL_CONNECTOR):
+        floors = await Floor.find({"building_id": building_id}).to_list()
+        floor_ids = {floor.floor_id for floor in floors}
+
+    for entity_type, entity_ids in pending.items():
+        model, id_field = ENTITY_MODELS[entity_type]
+        docs = await model.find({id_field: {"$in": entity_ids}}).to_list()
+        found = {}
+        for doc in docs:
+            if entity_type in (LOCATION, VERTICAL_CONNECTOR):
+                in_building = doc.floor_id in floor_ids
+            else:
+                in_building = doc.building_id == building_id
+            if in_building and doc.status == "active":
+                found[getattr(doc, id_field)] = doc.dict(exclude={"id", "revision_id"})
+        upserts[entity_type] = list(found.values())
+        missing = [entity_id for entity_id in entity_ids if entity_id not in found]
+        if missing:
+            deletes.setdefault(entity_type, []).extend(missing)
+
+    result["upserts"] = {entity_type: docs for entity_type, docs in upserts.items() if docs}
+    result["deletes"] = deletes
+    return result
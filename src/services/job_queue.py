@@ -0,0 +1,291 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi.responses import ORJSONResponse
+from src.common.redis_utils import (
+    get_cache_fast, get_multi_cache_fast, set_cache_fast, delete_cache_fast, push_list_fast, pop_list_fast,
+    get_list_fast, add_set_members_fast, remove_set_members_fast, get_set_members_fast
+)
+import asyncio
+import os
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Jobs each app process runs at once
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# "redis" shares one queue between app processes (uvicorn --workers N); "memory" keeps jobs in this process
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND") or (
+    "redis" if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 else "memory"
+)
+# How long a job's status and result stay readable
+JOB_RESULT_TTL_SECONDS = int(os.getenv("JOB_RESULT_TTL_SECONDS", "86400"))
+# Recent jobs listed per entity
+JOB_HISTORY_SIZE = 100
+# A process that stops renewing its lease this long is presumed dead, and its workers' jobs are recovered
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "30"))
+
+JOB_QUEUE_KEY = "jobs:queue"
+# Ids of the workers of every process using the shared queue
+JOB_WORKERS_KEY = "jobs:workers"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Runs one job from its payload; the return value (JSON-serializable) becomes the job's result
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+def _job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def _history_key(entity_uuid: str) -> str:
+    return f"jobs:entity:{entity_uuid}"
+
+
+def _processing_key(worker_id: str) -> str:
+    return f"jobs:processing:{worker_id}"
+
+
+def _lease_key(process_id: str) -> str:
+    return f"jobs:lease:{process_id}"
+
+
+class JobQueue:
+    """
+    Runs long admin operations (cascade deletes, organization deletes, floor
+    plan uploads) outside the request: the endpoint submits a job and returns
+    its id at once, and a pool of worker tasks runs it and records its status
+    and result for /v1/job/{job_id}.
+
+    Job types are registered by name (`register`) when their module is
+    imported, so any app process can run a job from its JSON payload. With the
+    "redis" backend the queue is a Redis list shared by every process;
+    otherwise, or when Redis is down, or for `local` jobs whose payload cannot
+    leave the process, jobs wait on an in-process asyncio queue.
+
+    A worker takes a shared job by moving it onto its own processing list and
+    drops it from there once the job has finished, so a job is never only in
+    the memory of a process that can crash. Each process renews a lease in
+    Redis; when a lease lapses, the other processes requeue the jobs its
+    workers had taken but not started and mark the one each was running as
+    failed. Jobs are not retried, since a cascade delete or an upload that
+    stopped halfway may not be safe to run again.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, backend: str = JOB_QUEUE_BACKEND):
+        self._handlers: Dict[str, JobHandler] = {}
+        self._worker_count = max(1, workers)
+        self._backend = backend
+        self._local: asyncio.Queue = asyncio.Queue()
+        # Jobs this process submitted or ran, for status reads when Redis is unavailable
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._process_id = uuid.uuid4().hex[:12]
+        self._workers: Dict[int, asyncio.Task] = {}
+        self._heartbeat: Optional[asyncio.Task] = None
+        self.succeeded = 0
+        self.failed = 0
+        self.requeued = 0
+        self.abandoned = 0
+
+    def register(self, job_type: str, handler: JobHandler) -> None:
+        self._handlers[job_type] = handler
+
+    async def submit(self, job_type: str, payload: Dict[str, Any], entity_uuid: Optional[str] = None,
+                     created_by: Optional[str] = None, local: bool = False) -> Dict[str, Any]:
+        """Queue a job and return its status document (with `job_id`)"""
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type '{job_type}'")
+        job = {
+            "job_id": str(uuid.uuid4()),
+            "type": job_type,
+            "status": QUEUED,
+            "entity_uuid": entity_uuid,
+            "created_by": created_by,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+        }
+        await self._save(job)
+        if entity_uuid:
+            await push_list_fast(_history_key(entity_uuid), job["job_id"], max_length=JOB_HISTORY_SIZE,
+                                 expire=JOB_RESULT_TTL_SECONDS, left=True)
+        shared = self._backend == "redis" and not local
+        if not shared or not await push_list_fast(JOB_QUEUE_KEY, {"job": job, "payload": payload}):
+            # Redis is down: this process runs the job
+            self._local.put_nowait((job, payload))
+        logger.info(f"Queued job {job['job_id']} ({job_type})")
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        # Another process may be running it, so the shared copy wins
+        job = await get_cache_fast(_job_key(job_id))
+        return job or self._jobs.get(job_id)
+
+    async def recent(self, entity_uuid: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """An entity's most recent jobs, newest first"""
+        job_ids = await get_list_fast(_history_key(entity_uuid), 0, limit - 1)
+        if job_ids:
+            found = await get_multi_cache_fast([_job_key(job_id) for job_id in job_ids])
+            jobs = [found.get(_job_key(job_id)) or self._jobs.get(job_id) for job_id in job_ids]
+            return [job for job in jobs if job]
+        jobs = [job for job in self._jobs.values() if job["entity_uuid"] == entity_uuid]
+        return sorted(jobs, key=lambda job: job["created_at"], reverse=True)[:limit]
+
+    async def _save(self, job: Dict[str, Any]) -> None:
+        self._jobs[job["job_id"]] = job
+        self._prune()
+        await set_cache_fast(_job_key(job["job_id"]), job, expire=JOB_RESULT_TTL_SECONDS)
+
+    def _prune(self) -> None:
+        expired = time.time() - JOB_RESULT_TTL_SECONDS
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job["finished_at"] and job["finished_at"] < expired]:
+            del self._jobs[job_id]
+
+    def _worker_id(self, n: int) -> str:
+        return f"{self._process_id}:{n}"
+
+    async def _next(self, worker_id: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        if self._backend != "redis":
+            return await self._local.get()
+        try:
+            return self._local.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        # Stays on the worker's processing list until it has run
+        message = await pop_list_fast(JOB_QUEUE_KEY, timeout=1.0, destination=_processing_key(worker_id))
+        if not message:
+            return None
+        return message["job"], message.get("payload") or {}
+
+    async def _run(self, job: Dict[str, Any], payload: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        job.update(status=RUNNING, started_at=time.time())
+        await self._save(job)
+        try:
+            handler = self._handlers.get(job["type"])
+            if handler is None:
+                raise ValueError(f"Unknown job type '{job['type']}'")
+            job.update(status=SUCCEEDED, result=await handler(payload))
+            self.succeeded += 1
+        except asyncio.CancelledError:
+            job.update(status=FAILED, error="Interrupted by shutdown", finished_at=time.time())
+            await self._save(job)
+            raise
+        except Exception as e:
+            logger.exception(f"Job {job['job_id']} ({job['type']}) failed: {e}")
+            job.update(status=FAILED, error=str(e))
+            self.failed += 1
+        job["finished_at"] = time.time()
+        await self._save(job)
+        logger.info(
+            f"Job {job['job_id']} ({job['type']}) {job['status']} in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+    async def _work(self, worker_id: str) -> None:
+        while True:
+            try:
+                item = await self._next(worker_id)
+                if item is not None:
+                    try:
+                        await self._run(*item)
+                    finally:
+                        if self._backend == "redis":
+                            await delete_cache_fast(_processing_key(worker_id))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Job worker error: {e}")
+                await asyncio.sleep(1.0)
+
+    async def _keep_lease(self) -> None:
+        worker_ids = [self._worker_id(n) for n in range(self._worker_count)]
+        while True:
+            try:
+                await set_cache_fast(_lease_key(self._process_id), time.time(), expire=JOB_LEASE_SECONDS)
+                await add_set_members_fast(JOB_WORKERS_KEY, *worker_ids)
+                await self._recover_abandoned()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Job lease renewal error: {e}")
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+
+    async def _recover_abandoned(self) -> None:
+        worker_ids = await get_set_members_fast(JOB_WORKERS_KEY)
+        process_ids = {worker_id.rsplit(":", 1)[0] for worker_id in worker_ids}
+        leases = await get_multi_cache_fast([_lease_key(process_id) for process_id in process_ids])
+        # Our own lease was just renewed: without it the read failed, and every process would look dead
+        if _lease_key(self._process_id) not in leases:
+            return
+        for worker_id in worker_ids:
+            if _lease_key(worker_id.rsplit(":", 1)[0]) not in leases:
+                await self._recover(worker_id)
+
+    async def _recover(self, worker_id: str) -> None:
+        """Requeue the jobs a stopped worker had taken but not started, and fail the one it was running"""
+        while True:
+            message = await pop_list_fast(_processing_key(worker_id), timeout=None)
+            if not message:
+                break
+            job = await get_cache_fast(_job_key(message["job"]["job_id"])) or message["job"]
+            if job["status"] == QUEUED:
+                await push_list_fast(JOB_QUEUE_KEY, message, left=True)
+                self.requeued += 1
+                logger.info(f"Requeued job {job['job_id']} ({job['type']}) of stopped worker {worker_id}")
+            elif job["status"] == RUNNING:
+                job.update(status=FAILED, error="Abandoned: the worker running it stopped", finished_at=time.time())
+                await set_cache_fast(_job_key(job["job_id"]), job, expire=JOB_RESULT_TTL_SECONDS)
+                self.abandoned += 1
+                logger.warning(f"Job {job['job_id']} ({job['type']}) abandoned by stopped worker {worker_id}")
+        await remove_set_members_fast(JOB_WORKERS_KEY, worker_id)
+
+    def start(self) -> None:
+        """Start this process's workers (call once from the app lifespan)"""
+        for n in range(self._worker_count):
+            if n not in self._workers or self._workers[n].done():
+                self._workers[n] = asyncio.create_task(self._work(self._worker_id(n)))
+        if self._backend == "redis" and (self._heartbeat is None or self._heartbeat.done()):
+            self._heartbeat = asyncio.create_task(self._keep_lease())
+
+    async def stop(self) -> None:
+        tasks = [*self._workers.values(), *([self._heartbeat] if self._heartbeat else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = {}
+        self._heartbeat = None
+        if self._backend == "redis":
+            # A job moved onto a processing list just as its worker was cancelled goes back on the queue
+            for n in range(self._worker_count):
+                await self._recover(self._worker_id(n))
+            await delete_cache_fast(_lease_key(self._process_id))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self._backend,
+            "workers": len(self._workers),
+            "queued_locally": self._local.qsize(),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "requeued": self.requeued,
+            "abandoned": self.abandoned,
+        }
+
+
+job_queue = JobQueue()
+
+
+def accepted_response(job: Dict[str, Any], message: str) -> ORJSONResponse:
+    """202 Accepted for an operation handed to the job queue, pointing at its status"""
+    return ORJSONResponse(
+        status_code=202,
+        content={"status": "accepted", "message": message, "data": job},
+        headers={"Location": f"/v1/job/{job['job_id']}"},
+    )
@@ -0,0 +1,154 @@
+"""
+Benchmark of the route search engines on synthetic building graphs.
+
+Builds multi-floor corridor grids of roughly the requested node counts,
+with elevators and stairs linking the floors, and compares plain Dijkstra
+against A*, ALT (A* with landmarks) and bidirectional ALT on the same
+random queries.
+
+    python -m src.services.navigation_benchmark --nodes 10000 50000 100000
+"""
+import argparse
+import math
+import random
+import time
+from typing import Dict, List, Optional
+
+from src.services.navigation_graph import BuildingGraph, NavigationNode, build_landmarks
+
+WALK_COST = 0.5
+CONNECTOR_MINUTES = {"elevator": 1.0, "stairs": 2.0}
+FLOORS = 5
+GRID_SPACING = 10.0
+
+
+def _transfer_cost(a: NavigationNode, b: NavigationNode) -> Optional[float]:
+    return CONNECTOR_MINUTES.get(a.connector_type, 2.0)
+
+
+def build_synthetic_graph(node_count: int, seed: int = 7) -> BuildingGraph:
+    """A FLOORS-storey grid of corridors with ~10% of the corridors missing"""
+    rng = random.Random(seed)
+    side = max(2, int(math.sqrt(node_count / FLOORS)))
+    graph = BuildingGraph("benchmark", {f"floor-{f}": f for f in range(FLOORS)})
+
+    for f in range(FLOORS):
+        floor_id = f"floor-{f}"
+        for i in range(side):
+            for j in range(side):
+                graph.upsert_node(NavigationNode(
+                    f"{f}:{i}:{j}", "waypoint", floor_id,
+                    i * GRID_SPACING + rng.random(), j * GRID_SPACING + rng.random(),
+                ))
+        for i in range(side):
+            for j in range(side):
+                for di, dj in ((1, 0), (0, 1)):
+                    if i + di >= side or j + dj >= side or rng.random() < 0.1:
+                        continue
+                    a, b = f"{f}:{i}:{j}", f"{f}:{i + di}:{j + dj}"
+                    graph.upsert_path(f"{a}-{b}", None, a, b, [(floor_id, [(a, None, None), (b, None, None)])])
+
+        # A bank of elevators and stairwells spread over the floor plate
+        step = max(1, side // 4)
+        for k, (i, j) in enumerate((i, j) for i in range(0, side, step) for j in range(0, side, step)):
+            connector_type = "elevator" if k % 2 == 0 else "stairs"
+            connector_id = f"c{k}:{f}"
+            graph.upsert_node(NavigationNode(
+                connector_id, "vertical_connector", floor_id,
+                i * GRID_SPACING + 3, j * GRID_SPACING + 3,
+                connector_type=connector_type, shared_id=f"c{k}",
+            ))
+            anchor = f"{f}:{i}:{j}"
+            graph.upsert_path(
+                f"{connector_id}-{anchor}", None, connector_id, anchor,
+                [(floor_id, [(connector_id, None, None), (anchor, None, None)])],
+            )
+    return graph
+
+
+def _euclidean(scale: float):
+    def heuristic(node: NavigationNode, goal: NavigationNode) -> float:
+        return scale * math.hypot(node.x - goal.x, node.y - goal.y)
+    return heuristic
+
+
+def _combined(*heuristics):
+    def heuristic(node: NavigationNode, goal: NavigationNode) -> float:
+        return max(h(node, goal) for h in heuristics)
+    return heuristic
+
+
+def run(node_count: int, queries: int, landmark_count: int) -> Dict[str, Dict[str, float]]:
+    build_start = time.perf_counter()
+    graph = build_synthetic_graph(node_count)
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    preprocess_start = time.perf_counter()
+    builder = build_landmarks(graph, landmark_count, WALK_COST, _transfer_cost)
+    while True:
+        try:
+            next(builder)
+        except StopIteration as done:
+            landmarks = done.value
+            break
+    preprocess_ms = (time.perf_counter() - preprocess_start) * 1000
+
+    euclidean = _euclidean(graph.heuristic_scale(WALK_COST, _transfer_cost))
+    alt = _combined(euclidean, landmarks.heuristic)
+    engines = {
+        "dijkstra": dict(),
+        "astar": dict(heuristic=euclidean),
+        "alt": dict(heuristic=alt),
+        "bidirectional_alt": dict(heuristic=alt, bidirectional=True),
+    }
+
+    rng = random.Random(11)
+    node_ids: List[str] = [n.node_id for n in graph.nodes]
+    pairs = [(rng.choice(node_ids), rng.choice(node_ids)) for _ in range(queries)]
+
+    print(
+        f"\n{len(graph.nodes)} nodes, {len(graph.paths)} paths "
+        f"(built in {build_ms:.0f}ms, {len(landmarks.landmarks)} landmarks in {preprocess_ms:.0f}ms)"
+    )
+    results: Dict[str, Dict[str, float]] = {}
+    reference: List[Optional[float]] = []
+    for name, options in engines.items():
+        expanded = 0
+        costs: List[Optional[float]] = []
+        start = time.perf_counter()
+        for source, target in pairs:
+            result = graph.shortest_path(source, target, walk_cost=WALK_COST, transfer_cost=_transfer_cost, **options)
+            costs.append(result.cost if result else None)
+            expanded += result.expanded if result else 0
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if not reference:
+            reference = costs
+        mismatches = sum(
+            1 for a, b in zip(reference, costs)
+            if (a is None) != (b is None) or (a is not None and abs(a - b) > 1e-6)
+        )
+        results[name] = {
+            "ms_per_query": elapsed_ms / queries,
+            "expanded_per_query": expanded / queries,
+            "mismatches": mismatches,
+        }
+        print(
+            f"  {name:<18} {elapsed_ms / queries:9.2f} ms/query "
+            f"{expanded / queries:11.0f} nodes expanded  {mismatches} cost mismatches"
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare navigation search engines on synthetic graphs")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--landmarks", type=int, default=16)
+    args = parser.parse_args()
+    for node_count in args.nodes:
+        run(node_count, args.queries, args.landmarks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,878 @@
+"""
+Resident, per-building navigation graph.
+
+A BuildingGraph keeps node coordinates, adjacency and precomputed edge weights
+in process memory so that route queries never go back to MongoDB. Graphs are
+loaded once per building by NavigationService and then patched in place by
+the Path / Location / VerticalConnector write handlers.
+
+This module has no database dependencies on purpose: it only works on plain
+ids, coordinates and point specs handed over by the service.
+"""
+import heapq
+import math
+from array import array
+from typing import Dict, List, Optional, Tuple, Any, Iterable, Set, Callable
+
+
+# (ref_id, x, y) as stored on a PathPoint; ref_id is None for waypoints
+PointSpec = Tuple[Optional[str], Optional[float], Optional[float]]
+# (floor_id, [point specs]) in segment order
+SegmentSpec = Tuple[str, List[PointSpec]]
+# (from connector, to connector) -> cost of the hop, or None when the hop is not allowed
+TransferCost = Callable[["NavigationNode", "NavigationNode"], Optional[float]]
+
+# (node, goal) -> lower bound of the remaining cost from node to goal
+Heuristic = Callable[["NavigationNode", "NavigationNode"], float]
+
+# Connector types that serve any floor in a single ride; the others are walked floor by floor
+SINGLE_RIDE_CONNECTORS = {"elevator"}
+
+
+class NavigationNode:
+    """A routable point of a building: a location, a connector or a path waypoint."""
+
+    __slots__ = (
+        "node_id", "kind", "floor_id", "x", "y", "name",
+        "category", "connector_type", "shared_id", "active",
+    )
+
+    def __init__(
+        self,
+        node_id: str,
+        kind: str,
+        floor_id: Optional[str],
+        x: float,
+        y: float,
+        name: Optional[str] = None,
+        category: Optional[str] = None,
+        connector_type: Optional[str] = None,
+        shared_id: Optional[str] = None,
+    ):
+        self.node_id = node_id
+        self.kind = kind
+        self.floor_id = floor_id
+        self.x = float(x)
+        self.y = float(y)
+        self.name = name
+        self.category = category
+        self.connector_type = connector_type
+        self.shared_id = shared_id
+        self.active = True
+
+
+def waypoint_id(floor_id: str, x: float, y: float) -> str:
+    """Node id of a coordinate-only PathPoint; paths crossing at the same spot share it"""
+    return f"waypoint:{floor_id}:{float(x):g}:{float(y):g}"
+
+
+class PathEdge:
+    """
+    A published Path exploded into walking legs between its consecutive points.
+
+    Every referenced location / connector and every waypoint of the path's
+    floor segments is a node, so routes can join or leave a path at any of
+    its points instead of only at its two ends.
+    """
+
+    __slots__ = ("path_id", "name", "source", "target", "segment_specs", "legs", "refs", "waypoints")
+
+    def __init__(self, path_id: str, name: Optional[str], source: str, target: str, segment_specs: List[SegmentSpec]):
+        self.path_id = path_id
+        self.name = name
+        self.source = source
+        self.target = target
+        self.segment_specs = segment_specs
+        # Resolved legs: (node index, node index) pairs between consecutive points on one floor
+        self.legs: List[Tuple[int, int]] = []
+        self.refs: Set[str] = {ref for _, points in segment_specs for ref, _, _ in points if ref}
+        self.waypoints: Set[str] = {
+            waypoint_id(floor_id, x, y)
+            for floor_id, points in segment_specs
+            for ref, x, y in points
+            if not ref and x is not None and y is not None
+        }
+
+
+class SearchResult:
+    """Outcome of a route search: total cost, node sequence and number of settled nodes."""
+
+    __slots__ = ("cost", "node_ids", "expanded")
+
+    def __init__(self, cost: float, node_ids: List[str], expanded: int):
+        self.cost = cost
+        self.node_ids = node_ids
+        self.expanded = expanded
+
+
+class BuildingGraph:
+    def __init__(self, building_id: str, floors: Optional[Dict[str, int]] = None):
+        self.building_id = building_id
+        # floor_id -> floor_number, used to order connector hops
+        self.floor_numbers: Dict[str, int] = dict(floors or {})
+        self.floor_ids: Set[str] = set(self.floor_numbers)
+        # Bumped on every mutation so derived data can tell when it is stale
+        self.version = 0
+
+        # Node storage (index based)
+        self.node_index: Dict[str, int] = {}
+        self.nodes: List[NavigationNode] = []
+
+        # adjacency[i] -> {j: weight}; always the cheapest path between i and j
+        self.adjacency: List[Dict[int, float]] = []
+        # (min(i, j), max(i, j)) -> {path_id: weight}; all paths contributing to an edge
+        self._edge_paths: Dict[Tuple[int, int], Dict[str, float]] = {}
+        # transfers[i] -> connector nodes on other floors sharing i's shared_id
+        self.transfers: List[Set[int]] = []
+        self._shared_members: Dict[str, Set[int]] = {}
+
+        self.paths: Dict[str, PathEdge] = {}
+        # node_id -> path_ids whose geometry references that node
+        self._node_paths: Dict[str, Set[str]] = {}
+
+    # -----------------------------
+    # Nodes
+    # -----------------------------
+
+    def add_floor(self, floor_id: str, floor_number: int) -> None:
+        self.floor_ids.add(floor_id)
+        self.floor_numbers[floor_id] = floor_number
+
+    def get_node(self, node_id: str) -> Optional[NavigationNode]:
+        idx = self.node_index.get(node_id)
+        if idx is None:
+            return None
+        node = self.nodes[idx]
+        return node if node.active else None
+
+    def nodes_on_floor(self, floor_id: str, kind: Optional[str] = None) -> List[NavigationNode]:
+        return [
+            n for n in self.nodes
+            if n.active and n.floor_id == floor_id and (kind is None or n.kind == kind)
+        ]
+
+    def upsert_node(self, node: NavigationNode) -> None:
+        """Add a node or patch an existing one in place; dependent path geometry is refreshed."""
+        idx = self.node_index.get(node.node_id)
+        if idx is None:
+            self.node_index[node.node_id] = len(self.nodes)
+            self.nodes.append(node)
+            self.adjacency.append({})
+            self.transfers.append(set())
+            if node.floor_id:
+                self.floor_ids.add(node.floor_id)
+            self._refresh_paths(self._node_paths.get(node.node_id, ()))
+            self._join_shared(len(self.nodes) - 1)
+            self.version += 1
+            return
+
+        existing = self.nodes[idx]
+        moved = (existing.x, existing.y, existing.floor_id) != (node.x, node.y, node.floor_id)
+        reactivated = not existing.active
+        self._leave_shared(idx)
+        existing.kind = node.kind
+        existing.floor_id = node.floor_id
+        existing.x = node.x
+        existing.y = node.y
+        existing.name = node.name
+        existing.category = node.category
+        existing.connector_type = node.connector_type
+        existing.shared_id = node.shared_id
+        existing.active = True
+        if node.floor_id:
+            self.floor_ids.add(node.floor_id)
+        if moved or reactivated:
+            self._refresh_paths(self._node_paths.get(node.node_id, ()))
+        self._join_shared(idx)
+        self.version += 1
+
+    def remove_node(self, node_id: str) -> None:
+        """Deactivate a node and drop its edges; paths through it stay known for a later re-add."""
+        idx = self.node_index.get(node_id)
+        if idx is None or not self.nodes[idx].active:
+            return
+        self.nodes[idx].active = False
+        for neighbor in list(self.adjacency[idx]):
+            self.adjacency[neighbor].pop(idx, None)
+            self._edge_paths.pop((min(idx, neighbor), max(idx, neighbor)), None)
+        self.adjacency[idx].clear()
+        self._leave_shared(idx)
+        # Paths through the node now walk straight past it
+        self._refresh_paths(self._node_paths.get(node_id, ()))
+        self.version += 1
+
+    # -----------------------------
+    # Vertical connector transfers
+    # -----------------------------
+
+    def _join_shared(self, idx: int) -> None:
+        node = self.nodes[idx]
+        if node.kind != "vertical_connector" or not node.shared_id or not node.active:
+            return
+        self._shared_members.setdefault(node.shared_id, set()).add(idx)
+        self._relink_shared(node.shared_id)
+
+    def _leave_shared(self, idx: int) -> None:
+        for shared_id, members in list(self._shared_members.items()):
+            if idx in members:
+                members.discard(idx)
+                for other in self.transfers[idx]:
+                    self.transfers[other].discard(idx)
+                self.transfers[idx].clear()
+                if members:
+                    self._relink_shared(shared_id)
+                else:
+                    del self._shared_members[shared_id]
+
+    def _relink_shared(self, shared_id: str) -> None:
+        """Connect the connectors of one shared_id across floors (one layer per floor)."""
+        members = self._shared_members.get(shared_id, set())
+        for i in members:
+            self.transfers[i].clear()
+
+        by_floor: Dict[str, List[int]] = {}
+        for i in members:
+            by_floor.setdefault(self.nodes[i].floor_id, []).append(i)
+        floors = sorted(by_floor, key=lambda f: (self.floor_numbers.get(f, 0), f))
+
+        single_ride = all(
+            (self.nodes[i].connector_type or "").lower() in SINGLE_RIDE_CONNECTORS for i in members
+        )
+        for a_pos, floor_a in enumerate(floors):
+            # Elevators reach every floor in one ride; stairs/escalators only the next floor
+            reachable = floors[a_pos + 1:] if single_ride else floors[a_pos + 1:a_pos + 2]
+            for floor_b in reachable:
+                for i in by_floor[floor_a]:
+                    for j in by_floor[floor_b]:
+                        self.transfers[i].add(j)
+                        self.transfers[j].add(i)
+
+    # -----------------------------
+    # Paths
+    # -----------------------------
+
+    def upsert_path(
+        self,
+        path_id: str,
+        name: Optional[str],
+        source: str,
+        target: str,
+        segment_specs: List[SegmentSpec],
+    ) -> None:
+        """Add or replace the legs contributed by a published path."""
+        if path_id in self.paths:
+            self._drop_path(path_id)
+        edge = PathEdge(path_id, name, source, target, segment_specs)
+        self.paths[path_id] = edge
+        for ref in edge.refs | edge.waypoints:
+            self._node_paths.setdefault(ref, set()).add(path_id)
+        for floor_id, points in segment_specs:
+            for ref, x, y in points:
+                if not ref and x is not None and y is not None:
+                    node_id = waypoint_id(floor_id, x, y)
+                    if self.get_node(node_id) is None:
+                        self._add_waypoint(NavigationNode(node_id, "waypoint", floor_id, x, y))
+        self._resolve_legs(edge)
+        self._link(edge)
+        self.version += 1
+
+    def remove_path(self, path_id: str) -> None:
+        if path_id not in self.paths:
+            return
+        self._drop_path(path_id)
+        self.version += 1
+
+    def _add_waypoint(self, node: NavigationNode) -> None:
+        idx = self.node_index.get(node.node_id)
+        if idx is None:
+            self.node_index[node.node_id] = len(self.nodes)
+            self.nodes.append(node)
+            self.adjacency.append({})
+            self.transfers.append(set())
+        else:
+            self.nodes[idx].active = True
+        if node.floor_id:
+            self.floor_ids.add(node.floor_id)
+
+    def _drop_path(self, path_id: str) -> None:
+        edge = self.paths.pop(path_id)
+        self._unlink(edge)
+        for ref in edge.refs | edge.waypoints:
+            users = self._node_paths.get(ref)
+            if users:
+                users.discard(path_id)
+                if not users:
+                    self._node_paths.pop(ref, None)
+        # Waypoints only exist through the paths drawn over them
+        for node_id in edge.waypoints:
+            if node_id not in self._node_paths:
+                self.remove_node(node_id)
+
+    def _refresh_paths(self, path_ids: Iterable[str]) -> None:
+        for path_id in list(path_ids):
+            edge = self.paths.get(path_id)
+            if edge is None:
+                continue
+            self._unlink(edge)
+            self._resolve_legs(edge)
+            self._link(edge)
+
+    def _resolve_legs(self, edge: PathEdge) -> None:
+        """Map every point to a node; points referencing unknown or inactive nodes are skipped."""
+        legs = []
+        for floor_id, specs in edge.segment_specs:
+            previous = None
+            for ref_id, x, y in specs:
+                node_id = ref_id if ref_id else (
+                    waypoint_id(floor_id, x, y) if x is not None and y is not None else None
+                )
+                idx = self.node_index.get(node_id) if node_id else None
+                if idx is None or not self.nodes[idx].active:
+                    continue
+                if previous is not None and previous != idx:
+                    legs.append((previous, idx))
+                previous = idx
+        edge.legs = legs
+
+    def _leg_weight(self, u: int, v: int) -> float:
+        a, b = self.nodes[u], self.nodes[v]
+        return math.hypot(a.x - b.x, a.y - b.y)
+
+    def _link(self, edge: PathEdge) -> None:
+        for u, v in edge.legs:
+            key = (min(u, v), max(u, v))
+            weight = self._leg_weight(u, v)
+            contributions = self._edge_paths.setdefault(key, {})
+            contributions[edge.path_id] = min(weight, contributions.get(edge.path_id, math.inf))
+            best = min(contributions.values())
+            self.adjacency[u][v] = best
+            self.adjacency[v][u] = best
+
+    def _unlink(self, edge: PathEdge) -> None:
+        for u, v in edge.legs:
+            key = (min(u, v), max(u, v))
+            contributions = self._edge_paths.get(key)
+            if not contributions or edge.path_id not in contributions:
+                continue
+            del contributions[edge.path_id]
+            if contributions:
+                best = min(contributions.values())
+                self.adjacency[u][v] = best
+                self.adjacency[v][u] = best
+            else:
+                self._edge_paths.pop(key, None)
+                self.adjacency[u].pop(v, None)
+                self.adjacency[v].pop(u, None)
+
+    def edge_path(self, u: int, v: int) -> Optional[PathEdge]:
+        """Cheapest path backing the edge between two node indices"""
+        contributions = self._edge_paths.get((min(u, v), max(u, v)))
+        if not contributions:
+            return None
+        return self.paths.get(min(contributions, key=contributions.get))
+
+    # -----------------------------
+    # Search
+    # -----------------------------
+
+    def shortest_path(
+        self,
+        source_id: str,
+        target_id: str,
+        floor_id: Optional[str] = None,
+        walk_cost: float = 1.0,
+        transfer_cost: Optional[TransferCost] = None,
+        heuristic: Optional[Heuristic] = None,
+        bidirectional: bool = False,
+    ) -> Optional[SearchResult]:
+        """
+        Shortest path over the layered building graph.
+
+        Walking edges cost `weight * walk_cost`; connector hops between floors cost
+        whatever `transfer_cost` returns (they are skipped when it is not given).
+        `floor_id` restricts the search to a single floor.
+
+        Without a `heuristic` this is plain Dijkstra; with one it is A*. The
+        heuristic must be consistent, see `heuristic_scale`. `bidirectional`
+        searches from both ends at once and works with or without a heuristic.
+        """
+        source = self.node_index.get(source_id)
+        target = self.node_index.get(target_id)
+        if source is None or target is None:
+            return None
+        if bidirectional:
+            return self._bidirectional_search(source, target, floor_id, walk_cost, transfer_cost, heuristic)
+        return self._unidirectional_search(source, target, floor_id, walk_cost, transfer_cost, heuristic)
+
+    def heuristic_scale(self, walk_cost: float = 1.0, transfer_cost: Optional[TransferCost] = None) -> float:
+        """
+        Largest factor k for which `k * straight-line distance` never overestimates.
+
+        Walking edges are at least as long as the straight line between their
+        endpoints, so `walk_cost` is safe for them. A connector hop may shift the
+        traveller sideways for less than walking would cost, so k is lowered to
+        the cheapest cost per unit of shift among all hops.
+        """
+        scale = walk_cost
+        if transfer_cost is None:
+            return scale
+        nodes = self.nodes
+        for i, neighbors in enumerate(self.transfers):
+            for j in neighbors:
+                shift = math.hypot(nodes[i].x - nodes[j].x, nodes[i].y - nodes[j].y)
+                if shift == 0:
+                    continue
+                hop = transfer_cost(nodes[i], nodes[j])
+                if hop is not None:
+                    scale = min(scale, hop / shift)
+        return max(scale, 0.0)
+
+    def _neighbors(
+        self,
+        current: int,
+        floor_id: Optional[str],
+        walk_cost: float,
+        transfer_cost: Optional[TransferCost],
+        reverse: bool = False,
+    ) -> Iterable[Tuple[int, float]]:
+        """Outgoing (neighbor, cost) pairs; `reverse` prices hops as neighbor -> current"""
+        nodes = self.nodes
+        for neighbor, weight in self.adjacency[current].items():
+            if floor_id is not None and nodes[neighbor].floor_id != floor_id:
+                continue
+            yield neighbor, weight * walk_cost
+
+        if transfer_cost is None or floor_id is not None:
+            return
+        for neighbor in self.transfers[current]:
+            if reverse:
+                hop = transfer_cost(nodes[neighbor], nodes[current])
+            else:
+                hop = transfer_cost(nodes[current], nodes[neighbor])
+            if hop is not None:
+                yield neighbor, hop
+
+    def _unidirectional_search(
+        self,
+        source: int,
+        target: int,
+        floor_id: Optional[str],
+        walk_cost: float,
+        transfer_cost: Optional[TransferCost],
+        heuristic: Optional[Heuristic],
+    ) -> Optional[SearchResult]:
+        nodes = self.nodes
+        goal = nodes[target]
+
+        def estimate(i: int) -> float:
+            return heuristic(nodes[i], goal) if heuristic else 0.0
+
+        distances = {source: 0.0}
+        previous: Dict[int, int] = {}
+        visited = set()
+        pq = [(estimate(source), source)]
+
+        while pq:
+            _, current = heapq.heappop(pq)
+            if current in visited:
+                continue
+            visited.add(current)
+            if current == target:
+                break
+
+            current_distance = distances[current]
+            for neighbor, cost in self._neighbors(current, floor_id, walk_cost, transfer_cost):
+                if neighbor in visited:
+                    continue
+                distance = current_distance + cost
+                if distance < distances.get(neighbor, math.inf):
+                    distances[neighbor] = distance
+                    previous[neighbor] = current
+                    heapq.heappush(pq, (distance + estimate(neighbor), neighbor))
+
+        if target not in visited:
+            return None
+
+        order = [target]
+        while order[-1] != source:
+            order.append(previous[order[-1]])
+        order.reverse()
+        return SearchResult(distances[target], [nodes[i].node_id for i in order], len(visited))
+
+    def _bidirectional_search(
+        self,
+        source: int,
+        target: int,
+        floor_id: Optional[str],
+        walk_cost: float,
+        transfer_cost: Optional[TransferCost],
+        heuristic: Optional[Heuristic],
+    ) -> Optional[SearchResult]:
+        """
+        Bidirectional Dijkstra / A*.
+
+        With a heuristic both searches use the averaged potential
+        (h(v, target) - h(v, source)) / 2 so their reduced costs stay
+        non-negative, and a path through v costs exactly key_f(v) + key_r(v).
+        The search stops once the two queue minimums cannot beat the best
+        meeting point found so far.
+        """
+        nodes = self.nodes
+        origin, goal = nodes[source], nodes[target]
+        potentials: Dict[int, float] = {}
+
+        def potential(i: int) -> float:
+            if heuristic is None:
+                return 0.0
+            value = potentials.get(i)
+            if value is None:
+                value = (heuristic(nodes[i], goal) - heuristic(nodes[i], origin)) / 2
+                potentials[i] = value
+            return value
+
+        # index 0 searches forward from source, index 1 backward from target
+        distances: List[Dict[int, float]] = [{source: 0.0}, {target: 0.0}]
+        previous: List[Dict[int, int]] = [{}, {}]
+        visited: List[Set[int]] = [set(), set()]
+        queues = [[(potential(source), source)], [(-potential(target), target)]]
+        sign = (1.0, -1.0)
+
+        best = math.inf
+        meeting: Optional[int] = source if source == target else None
+        if meeting is not None:
+            best = 0.0
+
+        while queues[0] and queues[1]:
+            if queues[0][0][0] + queues[1][0][0] >= best:
+                break
+
+            side = 0 if len(queues[0]) <= len(queues[1]) else 1
+            _, current = heapq.heappop(queues[side])
+            if current in visited[side]:
+                continue
+            visited[side].add(current)
+
+            current_distance = distances[side][current]
+            other_distances = distances[1 - side]
+            for neighbor, cost in self._neighbors(current, floor_id, walk_cost, transfer_cost, reverse=side == 1):
+                if neighbor in visited[side]:
+                    continue
+                distance = current_distance + cost
+                if distance < distances[side].get(neighbor, math.inf):
+                    distances[side][neighbor] = distance
+                    previous[side][neighbor] = current
+                    heapq.heappush(queues[side], (distance + sign[side] * potential(neighbor), neighbor))
+                if neighbor in other_distances and distance + other_distances[neighbor] < best:
+                    best = distance + other_distances[neighbor]
+                    meeting = neighbor
+
+        if meeting is None:
+            return None
+
+        order = [meeting]
+        while order[-1] != source:
+            order.append(previous[0][order[-1]])
+        order.reverse()
+        while order[-1] != target:
+            order.append(previous[1][order[-1]])
+        return SearchResult(best, [nodes[i].node_id for i in order], len(visited[0]) + len(visited[1]))
+
+    def shortest_path_tree(
+        self,
+        source_id: str,
+        walk_cost: float = 1.0,
+        transfer_cost: Optional[TransferCost] = None,
+        targets: Optional[Iterable[str]] = None,
+    ) -> Optional["PathTree"]:
+        """
+        Dijkstra from one node; the tree answers every query from that node.
+
+        With `targets` the search stops as soon as all of them are settled
+        (one-to-many routing); unknown targets are ignored.
+        """
+        source = self.node_index.get(source_id)
+        if source is None:
+            return None
+        remaining = None
+        if targets is not None:
+            remaining = {self.node_index[t] for t in targets if t in self.node_index}
+
+        size = len(self.nodes)
+        parents = array("i", [-1]) * size
+        costs = array("d", [math.inf]) * size
+        costs[source] = 0.0
+        parents[source] = source
+        visited = set()
+        pq = [(0.0, source)]
+
+        while pq:
+            current_distance, current = heapq.heappop(pq)
+            if current in visited:
+                continue
+            visited.add(current)
+            if remaining is not None:
+                remaining.discard(current)
+                if not remaining:
+                    break
+            for neighbor, cost in self._neighbors(current, None, walk_cost, transfer_cost):
+                distance = current_distance + cost
+                if distance < costs[neighbor]:
+                    costs[neighbor] = distance
+                    parents[neighbor] = current
+                    heapq.heappush(pq, (distance, neighbor))
+
+        return PathTree(source, parents, costs)
+
+    def nearest(
+        self,
+        source_id: str,
+        predicate: Callable[[NavigationNode], bool],
+        k: int = 1,
+        walk_cost: float = 1.0,
+        transfer_cost: Optional[TransferCost] = None,
+    ) -> List[SearchResult]:
+        """
+        The k cheapest nodes matching `predicate`, in order, from one Dijkstra.
+
+        Nodes are settled in cost order, so the search stops at the k-th match.
+        The source itself is never a match: the restroom nearest to a restroom
+        is another one.
+        """
+        source = self.node_index.get(source_id)
+        if source is None or k <= 0:
+            return []
+
+        nodes = self.nodes
+        distances = {source: 0.0}
+        previous: Dict[int, int] = {}
+        visited = set()
+        found: List[SearchResult] = []
+        pq = [(0.0, source)]
+
+        while pq:
+            current_distance, current = heapq.heappop(pq)
+            if current in visited:
+                continue
+            visited.add(current)
+
+            if current != source and predicate(nodes[current]):
+                order = [current]
+                while order[-1] != source:
+                    order.append(previous[order[-1]])
+                order.reverse()
+                found.append(SearchResult(current_distance, [nodes[i].node_id for i in order], len(visited)))
+                if len(found) >= k:
+                    break
+
+            for neighbor, cost in self._neighbors(current, None, walk_cost, transfer_cost):
+                if neighbor in visited:
+                    continue
+                distance = current_distance + cost
+                if distance < distances.get(neighbor, math.inf):
+                    distances[neighbor] = distance
+                    previous[neighbor] = current
+                    heapq.heappush(pq, (distance, neighbor))
+
+        return found
+
+    def is_transfer(self, a: str, b: str) -> bool:
+        """True when a -> b is a connector hop rather than a walked edge"""
+        u = self.node_index.get(a)
+        v = self.node_index.get(b)
+        return u is not None and v is not None and v in self.transfers[u]
+
+    def route_points(self, node_ids: List[str]) -> List[Dict[str, Any]]:
+        """Coordinates along a node sequence; every leg is a straight line between two nodes."""
+        points: List[Dict[str, Any]] = []
+        for node_id in node_ids:
+            idx = self.node_index.get(node_id)
+            if idx is None:
+                continue
+            node = self.nodes[idx]
+            if points and points[-1]["x"] == node.x and points[-1]["y"] == node.y and points[-1]["floor_id"] == node.floor_id:
+                continue
+            points.append({"x": node.x, "y": node.y, "floor_id": node.floor_id})
+        return points
+
+
+class PathTree:
+    """
+    Shortest-path tree of one source, stored as flat parent / cost arrays indexed by node.
+
+    A tree cut short by `targets` is only complete for the settled nodes; the
+    parent chain of any settled node is final.
+    """
+
+    __slots__ = ("source", "parents", "costs")
+
+    def __init__(self, source: int, parents: array, costs: array):
+        self.source = source
+        self.parents = parents
+        self.costs = costs
+
+    def walk(self, target: int) -> Optional[List[int]]:
+        """Node indices from the source to `target`, in O(path length)"""
+        if target >= len(self.parents) or self.parents[target] < 0:
+            return None
+        order = [target]
+        while order[-1] != self.source:
+            order.append(self.parents[order[-1]])
+        order.reverse()
+        return order
+
+
+class RouteTable:
+    """
+    Precomputed shortest-path trees for a fixed set of start nodes of one graph.
+
+    The table is only valid for the graph version it was built from; any
+    mutation of the graph makes `is_fresh` false until it is rebuilt.
+    """
+
+    def __init__(self, graph: BuildingGraph, version: int):
+        self.graph = graph
+        self.version = version
+        self.trees: Dict[int, PathTree] = {}
+
+    def is_fresh(self, graph: BuildingGraph) -> bool:
+        return graph is self.graph and graph.version == self.version
+
+    def add(self, tree: PathTree) -> None:
+        self.trees[tree.source] = tree
+
+    def tree(self, source_id: str) -> Optional[PathTree]:
+        source = self.graph.node_index.get(source_id)
+        return self.trees.get(source) if source is not None else None
+
+    def lookup(self, source_id: str, target_id: str) -> Optional[SearchResult]:
+        source = self.graph.node_index.get(source_id)
+        target = self.graph.node_index.get(target_id)
+        tree = self.trees.get(source) if source is not None else None
+        if tree is None or target is None:
+            return None
+        order = tree.walk(target)
+        if order is None:
+            return None
+        nodes = self.graph.nodes
+        return SearchResult(tree.costs[target], [nodes[i].node_id for i in order], 0)
+
+
+class LandmarkIndex:
+    """
+    ALT (A*, landmarks, triangle inequality) preprocessing of one graph version.
+
+    For every landmark L the index stores the cost from L to each node. By the
+    triangle inequality |d(L, goal) - d(L, node)| never exceeds d(node, goal),
+    so the largest such difference is an admissible, consistent heuristic that
+    is usually far tighter than the straight-line distance.
+
+    Trees must be computed with symmetric costs; cheaper-than-real costs (no
+    connector penalties) keep the bound valid for every query preference.
+    """
+
+    def __init__(self, graph: BuildingGraph, version: int):
+        self.graph = graph
+        self.version = version
+        self.landmarks: List[int] = []
+        self.costs: List[array] = []
+
+    def is_fresh(self, graph: BuildingGraph) -> bool:
+        return graph is self.graph and graph.version == self.version
+
+    def add(self, tree: PathTree) -> None:
+        self.landmarks.append(tree.source)
+        self.costs.append(tree.costs)
+
+    def next_landmark(self) -> Optional[str]:
+        """
+        Farthest-point selection: the reachable node whose nearest landmark is the farthest away.
+
+        Without landmarks yet, returns the first active node; the caller should
+        compute its tree, pick again and drop that seed (see `build_landmarks`).
+        """
+        nodes = self.graph.nodes
+        if not self.costs:
+            for node in nodes:
+                if node.active:
+                    return node.node_id
+            return None
+
+        best, best_cost = None, 0.0
+        for i, node in enumerate(nodes):
+            if not node.active or i in self.landmarks:
+                continue
+            nearest = min(costs[i] for costs in self.costs)
+            if best_cost < nearest < math.inf:
+                best, best_cost = i, nearest
+        return nodes[best].node_id if best is not None else None
+
+    def heuristic(self, node: NavigationNode, goal: NavigationNode) -> float:
+        index = self.graph.node_index
+        v = index.get(node.node_id)
+        t = index.get(goal.node_id)
+        if v is None or t is None:
+            return 0.0
+        bound = 0.0
+        for costs in self.costs:
+            if v >= len(costs) or t >= len(costs):
+                continue
+            to_goal, to_node = costs[t], costs[v]
+            if to_goal == math.inf or to_node == math.inf:
+                continue
+            diff = abs(to_goal - to_node)
+            if diff > bound:
+                bound = diff
+        return bound
+
+
+def symmetric_transfer_cost(transfer_cost: Optional[TransferCost]) -> Optional[TransferCost]:
+    """Hop cost that is the same in both directions (the cheaper one), for landmark trees"""
+    if transfer_cost is None:
+        return None
+
+    def cost(a: NavigationNode, b: NavigationNode) -> Optional[float]:
+        forward = transfer_cost(a, b)
+        backward = transfer_cost(b, a)
+        if forward is None:
+            return backward
+        if backward is None:
+            return forward
+        return min(forward, backward)
+
+    return cost
+
+
+def build_landmarks(
+    graph: BuildingGraph,
+    count: int,
+    walk_cost: float = 1.0,
+    transfer_cost: Optional[TransferCost] = None,
+):
+    """
+    Build a LandmarkIndex step by step.
+
+    This is a generator yielding after every shortest-path tree so async
+    callers can hand control back to the event loop; its return value
+    (StopIteration.value) is the finished index.
+    """
+    transfer_cost = symmetric_transfer_cost(transfer_cost)
+    index = LandmarkIndex(graph, graph.version)
+
+    # Seed from an arbitrary node, then restart from the farthest node found
+    seed = index.next_landmark()
+    if seed is None:
+        return index
+    index.add(graph.shortest_path_tree(seed, walk_cost, transfer_cost))
+    yield
+    first = index.next_landmark()
+    index.landmarks.clear()
+    index.costs.clear()
+    if first is None:
+        first = seed
+
+    landmark_id: Optional[str] = first
+    while landmark_id is not None and len(index.landmarks) < count:
+        index.add(graph.shortest_path_tree(landmark_id, walk_cost, transfer_cost))
+        yield
+        landmark_id = index.next_landmark()
+    return index
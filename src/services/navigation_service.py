@@ -1,385 +1,804 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple
 from src.datamodel.database.domain.DigitalSignage import (
-    Location, Floor, VerticalConnector, Path, NavigationRequest, MultiFloorRoute, PathPoint
+    Location, Floor, VerticalConnector, Path, NavigationRequest, MultiFloorRoute, PathPoint, RouteAlgorithm,
+    LocationType
 )
-import heapq
+from src.services.navigation_graph import BuildingGraph, NavigationNode, RouteTable, LandmarkIndex, build_landmarks
+from src.common.redis_utils import incr_counter_fast, get_counter_fast
+from src.common.cache import TwoTierCache
+import asyncio
 import math
-from collections import defaultdict
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Walking speed used for every time estimate (minutes per map unit)
+WALK_MINUTES_PER_UNIT = 0.5
+# Extra cost (minutes) for a connector hop that is not of the preferred type
+NON_PREFERRED_CONNECTOR_PENALTY = 5.0
+# Connector types usable on an accessible (step-free) route
+ACCESSIBLE_CONNECTORS = {"elevator", "ramp"}
+# Buildings with at most this many locations get a route table from every location, not only kiosks
+ROUTE_TABLE_ALL_PAIRS_MAX_NODES = 300
+# Seconds to wait after a graph change before rebuilding its route table, so edit bursts rebuild once
+ROUTE_TABLE_REBUILD_DELAY = 2.0
+# Route cache: Redis TTL (seconds) and in-process LRU size
+ROUTE_CACHE_TTL = 3600
+ROUTE_CACHE_MAX_ENTRIES = 2000
+# Graphs with at least this many nodes get ALT landmark preprocessing
+LANDMARK_MIN_NODES = 2000
+# Number of landmarks per building; each costs one shortest-path tree of memory
+LANDMARK_COUNT = 16
+
 
 class NavigationService:
     def __init__(self):
-        self.graph = defaultdict(list)
-        self.vertical_connectors_map = defaultdict(list)
+        # Resident per-building graphs, patched in place by the write hooks below
+        self.graphs: Dict[str, BuildingGraph] = {}
+        self._graph_locks: Dict[str, asyncio.Lock] = {}
+        # building_id -> shared graph version the resident graph reflects
+        self._synced_versions: Dict[str, int] = {}
+        # Finished routes keyed by building graph version, request and preferences
+        self.route_cache = TwoTierCache("navigation_route", max_entries=ROUTE_CACHE_MAX_ENTRIES, ttl=ROUTE_CACHE_TTL)
+        # Precomputed shortest-path trees from kiosks (or every location in small buildings)
+        self.route_tables: Dict[str, RouteTable] = {}
+        # ALT landmark costs for large buildings, used to tighten the A* heuristic
+        self.landmarks: Dict[str, LandmarkIndex] = {}
+        self._preprocess_tasks: Dict[str, asyncio.Task] = {}
     
     async def find_multi_floor_route(self, request: NavigationRequest) -> MultiFloorRoute:
         """
         Find route between locations that may span multiple floors
         """
         try:
-            # Get source and destination locations
-            source_location = await Location.find_one(Location.location_id == request.source_location_id)
-            destination_location = await Location.find_one(Location.location_id == request.destination_location_id)
-            
-            if not source_location or not destination_location:
+            building_id = request.building_id or await self._resolve_building_id(request.source_location_id)
+            if not building_id:
                 raise ValueError("Source or destination location not found")
-            
-            # Check if same floor
-            if source_location.floor_id == destination_location.floor_id:
-                return await self._find_single_floor_route(source_location, destination_location)
-            
-            # Multi-floor routing
-            return await self._find_multi_floor_route(source_location, destination_location, request.preferred_connector_type)
+
+            # Identical requests against the same graph version share one result
+            version = await self.get_graph_version(building_id)
+            computed: Optional[MultiFloorRoute] = None
+
+            async def compute() -> Dict[str, Any]:
+                nonlocal computed
+                graph = await self.get_building_graph(building_id, version)
+
+                # Get source and destination locations
+                source_location = graph.get_node(request.source_location_id)
+                destination_location = graph.get_node(request.destination_location_id)
+
+                if not source_location or not destination_location:
+                    raise ValueError("Source or destination location not found")
+
+                # One search over every floor of the building
+                computed = await self._find_multi_floor_route(
+                    graph, source_location, destination_location,
+                    request.preferred_connector_type, request.algorithm, request.accessible
+                )
+                return computed.model_dump()
+
+            if version is None:
+                await compute()
+                return computed
+
+            data, _ = await self.route_cache.get_or_load(
+                self._route_cache_key(building_id, version, request), compute
+            )
+            return computed if computed is not None else MultiFloorRoute(**data)
         
         except Exception as e:
             logger.error(f"Error finding multi-floor route: {str(e)}")
             raise
-    
-    async def _find_multi_floor_route(
-        self, 
-        source: Location, 
-        destination: Location, 
-        preferred_connector: Optional[str] = None
-    ) -> MultiFloorRoute:
-        """
-        Find route spanning multiple floors using vertical connectors
+
+    async def find_route_matrix(
+        self,
+        origin_ids: List[str],
+        destination_ids: List[str],
+        building_id: Optional[str] = None,
+        preferred_connector_type: Optional[str] = None,
+        include_geometry: bool = False,
+        accessible: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        One-to-many / many-to-many routing: one multi-target search per origin.
+
+        Origins with a precomputed route table tree (kiosks) are served from it;
+        the others run a single Dijkstra that stops once every destination is settled.
         """
-        route_segments = []
-        vertical_transitions = []
-        
+        if not origin_ids:
+            return []
         try:
-            # Step 1: Find path from source to vertical connector on source floor
-            source_connectors = await self._get_floor_connectors(source.floor_id)
-            best_source_connector = await self._find_nearest_connector(source, source_connectors, preferred_connector)
-            
-            if not best_source_connector:
-                raise ValueError("No suitable vertical connector found on source floor")
-            
-            # Step 2: Find corresponding connector on destination floor
-            dest_connectors = await self._get_connectors_by_shared_id(
-                best_source_connector.shared_id, 
-                destination.floor_id
-            )
-            
-            if not dest_connectors:
-                raise ValueError("No corresponding vertical connector found on destination floor")
-            
-            dest_connector = dest_connectors[0]
-            
-            # Step 3: Build route segments
-            # Segment 1: Source to source connector
-            source_to_connector = await self._find_path_on_floor(
-                source.floor_id, 
-                source.location_id, 
-                best_source_connector.connector_id
-            )
-            
-            if source_to_connector:
-                route_segments.append({
-                    "floor_id": source.floor_id,
-                    "segment_type": "horizontal",
-                    "path": source_to_connector,
-                    "instructions": f"Walk from {source.name} to {best_source_connector.name}",
-                    "distance": self._calculate_path_distance(source_to_connector.get("points", []))
-                })
-            
-            # Vertical transition
-            vertical_transitions.append({
-                "connector_type": best_source_connector.connector_type,
-                "connector_name": best_source_connector.name,
-                "from_floor": source.floor_id,
-                "to_floor": destination.floor_id,
-                "shared_id": best_source_connector.shared_id,
-                "instructions": f"Take {best_source_connector.connector_type} from floor {source.floor_id} to floor {destination.floor_id}",
-                "estimated_time": self._get_connector_time(best_source_connector.connector_type)
-            })
-            
-            # Segment 2: Destination connector to destination
-            connector_to_dest = await self._find_path_on_floor(
-                destination.floor_id,
-                dest_connector.connector_id,
-                destination.location_id
-            )
-            
-            if connector_to_dest:
-                route_segments.append({
-                    "floor_id": destination.floor_id,
-                    "segment_type": "horizontal", 
-                    "path": connector_to_dest,
-                    "instructions": f"Walk from {dest_connector.name} to {destination.name}",
-                    "distance": self._calculate_path_distance(connector_to_dest.get("points", []))
-                })
-            
-            # Calculate total estimated time
-            total_time = sum([segment.get("distance", 0) * 0.5 for segment in route_segments])  # 0.5 min per unit
-            total_time += sum([vt.get("estimated_time", 0) for vt in vertical_transitions])
-            
-            return MultiFloorRoute(
-                total_floors=len(set([source.floor_id, destination.floor_id])),
-                route_segments=route_segments,
-                vertical_transitions=vertical_transitions,
-                estimated_time=int(total_time)
-            )
-            
+            building_id = building_id or await self._resolve_building_id(origin_ids[0])
+            if not building_id:
+                raise ValueError("Origin location not found")
+
+            graph = await self.get_building_graph(building_id, await self.get_graph_version(building_id))
+            table = None if preferred_connector_type or accessible else self.route_tables.get(building_id)
+            if table is not None and not table.is_fresh(graph):
+                table = None
+            transfer_cost = self._transfer_cost(preferred_connector_type, accessible)
+
+            rows = []
+            for origin_id in origin_ids:
+                if graph.get_node(origin_id) is None:
+                    rows.append({"origin_id": origin_id, "found": False, "destinations": []})
+                    continue
+
+                tree = table.tree(origin_id) if table is not None else None
+                algorithm = RouteAlgorithm.PRECOMPUTED
+                if tree is None:
+                    tree = graph.shortest_path_tree(
+                        origin_id, WALK_MINUTES_PER_UNIT, transfer_cost, targets=destination_ids
+                    )
+                    algorithm = RouteAlgorithm.DIJKSTRA
+
+                destinations = []
+                for destination_id in destination_ids:
+                    order = None
+                    if graph.get_node(destination_id) is not None:
+                        order = tree.walk(graph.node_index[destination_id])
+                    if order is None:
+                        destinations.append({
+                            "destination_id": destination_id,
+                            "reachable": False,
+                            "distance": None,
+                            "estimated_time": None
+                        })
+                        continue
+
+                    node_ids = [graph.nodes[i].node_id for i in order]
+                    entry = {"destination_id": destination_id, "reachable": True}
+                    entry.update(self._route_summary(graph, node_ids))
+                    if include_geometry:
+                        route = self._build_route(graph, node_ids)
+                        route.algorithm = algorithm
+                        route.precomputed = algorithm == RouteAlgorithm.PRECOMPUTED
+                        entry["route"] = route
+                    destinations.append(entry)
+
+                rows.append({"origin_id": origin_id, "found": True, "destinations": destinations})
+                # Let other requests run between origins of a large matrix
+                await asyncio.sleep(0)
+
+            return rows
+
         except Exception as e:
-            logger.error(f"Error in multi-floor routing: {str(e)}")
+            logger.error(f"Error computing route matrix: {str(e)}")
             raise
-    
-    async def _find_single_floor_route(self, source: Location, destination: Location) -> MultiFloorRoute:
-        """
-        Find route on single floor
+
+    async def nearest_of_category(
+        self,
+        location_id: str,
+        category: str,
+        k: int = 1,
+        building_id: Optional[str] = None,
+        preferred_connector_type: Optional[str] = None,
+        accessible: bool = False,
+        include_geometry: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        The k closest locations of a category (restroom, ATM, exit, ...) by travel time.
+
+        One Dijkstra from the starting location, stopped once k matching
+        locations are settled, instead of one route per candidate.
         """
         try:
-            path = await self._find_path_on_floor(
-                source.floor_id,
-                source.location_id,
-                destination.location_id
-            )
-            
-            route_segments = []
-            if path:
-                route_segments.append({
-                    "floor_id": source.floor_id,
-                    "segment_type": "horizontal",
-                    "path": path,
-                    "instructions": f"Walk from {source.name} to {destination.name}",
-                    "distance": self._calculate_path_distance(path.get("points", []))
-                })
-            
-            total_time = sum([segment.get("distance", 0) * 0.5 for segment in route_segments])
-            
-            return MultiFloorRoute(
-                total_floors=1,
-                route_segments=route_segments,
-                vertical_transitions=[],
-                estimated_time=int(total_time)
+            building_id = building_id or await self._resolve_building_id(location_id)
+            if not building_id:
+                raise ValueError("Source location not found")
+
+            graph = await self.get_building_graph(building_id, await self.get_graph_version(building_id))
+            if graph.get_node(location_id) is None:
+                raise ValueError("Source location not found")
+
+            category = category.value if hasattr(category, "value") else category
+            results = graph.nearest(
+                location_id,
+                lambda node: node.kind == "location" and node.category == category,
+                k=k,
+                walk_cost=WALK_MINUTES_PER_UNIT,
+                transfer_cost=self._transfer_cost(preferred_connector_type, accessible),
             )
-            
+
+            nearest = []
+            for result in results:
+                node = graph.get_node(result.node_ids[-1])
+                entry = {
+                    "location_id": node.node_id,
+                    "name": node.name,
+                    "category": node.category,
+                    "floor_id": node.floor_id,
+                }
+                entry.update(self._route_summary(graph, result.node_ids))
+                if include_geometry:
+                    entry["route"] = self._build_route(graph, result.node_ids)
+                nearest.append(entry)
+            return nearest
+
         except Exception as e:
-            logger.error(f"Error in single floor routing: {str(e)}")
+            logger.error(f"Error finding nearest {category}: {str(e)}")
             raise
 
+    # -----------------------------
+    # Resident graph
+    # -----------------------------
 
-    async def _get_floor_connectors(self, floor_id: str) -> List[VerticalConnector]:
+    async def get_building_graph(self, building_id: str, version: Optional[int] = None) -> BuildingGraph:
         """
-        Get all vertical connectors on a specific floor
+        Return the resident graph for a building, loading it on first use.
+
+        When the shared graph `version` is given and this worker's graph was
+        built from an older one (a write handled by another worker), the graph
+        is reloaded.
         """
-        try:
-            connectors = await VerticalConnector.find(
-                VerticalConnector.floor_id == floor_id,
-                VerticalConnector.status == "active"
-            ).to_list()
-            return connectors
-        except Exception as e:
-            logger.error(f"Error getting floor connectors: {str(e)}")
-            return []
-    
-    async def _get_connectors_by_shared_id(self, shared_id: str, floor_id: str) -> List[VerticalConnector]:
+        if version is not None and building_id in self.graphs and self._synced_versions.get(building_id) != version:
+            logger.info(f"Navigation graph for building {building_id} is behind version {version}, reloading")
+            self.invalidate_building(building_id)
+
+        graph = self.graphs.get(building_id)
+        if graph is not None:
+            return graph
+
+        lock = self._graph_locks.setdefault(building_id, asyncio.Lock())
+        async with lock:
+            graph = self.graphs.get(building_id)
+            if graph is None:
+                # Read the version first: a write during the load makes the graph look stale, never fresh
+                loaded_version = await self.get_graph_version(building_id)
+                graph = await self._load_building_graph(building_id)
+                self.graphs[building_id] = graph
+                if loaded_version is not None:
+                    self._synced_versions[building_id] = loaded_version
+                self.schedule_preprocessing(building_id)
+        return graph
+
+    def invalidate_building(self, building_id: Optional[str]) -> None:
+        """
+        Drop a resident graph; it is reloaded on the next route query
+        """
+        if not building_id:
+            return
+        self._synced_versions.pop(building_id, None)
+        self.route_tables.pop(building_id, None)
+        self.landmarks.pop(building_id, None)
+        task = self._preprocess_tasks.pop(building_id, None)
+        if task is not None and not task.done():
+            task.cancel()
+        if self.graphs.pop(building_id, None) is not None:
+            logger.info(f"Navigation graph dropped for building {building_id}")
+
+    # -----------------------------
+    # Graph versions and route cache
+    # -----------------------------
+
+    async def get_graph_version(self, building_id: str) -> Optional[int]:
+        """
+        Shared (Redis) version of a building's navigation data; None when Redis is unavailable
+        """
+        return await get_counter_fast(f"nav:graph_version:{building_id}")
+
+    async def bump_graph_version(self, building_id: Optional[str]) -> None:
+        """
+        Mark a building's navigation data as changed; every cached route of it becomes unreachable
+        """
+        if not building_id:
+            return
+        version = await incr_counter_fast(f"nav:graph_version:{building_id}")
+        # The resident graph was patched in place, so it stays current if it was before this write
+        if version is not None and self._synced_versions.get(building_id) == version - 1:
+            self._synced_versions[building_id] = version
+
+    def _route_cache_key(self, building_id: str, version: int, request: NavigationRequest) -> str:
+        algorithm = request.algorithm.value if hasattr(request.algorithm, "value") else request.algorithm
+        preferred = (request.preferred_connector_type or "").lower()
+        return (
+            f"nav:route:{building_id}:v{version}:{request.source_location_id}:"
+            f"{request.destination_location_id}:{preferred}:{int(request.accessible)}:{algorithm}"
+        )
+
+    # -----------------------------
+    # Preprocessing: route tables and landmarks
+    # -----------------------------
+
+    def schedule_preprocessing(self, building_id: str) -> None:
         """
-        Get connectors with same shared_id on specific floor
+        (Re)build the route table and landmarks of a building in the background; a pending rebuild is restarted
         """
+        task = self._preprocess_tasks.get(building_id)
+        if task is not None and not task.done():
+            task.cancel()
+        self._preprocess_tasks[building_id] = asyncio.create_task(self._preprocess_building(building_id))
+
+    async def _preprocess_building(self, building_id: str) -> None:
         try:
-            connectors = await VerticalConnector.find(
-                VerticalConnector.shared_id == shared_id,
-                VerticalConnector.floor_id == floor_id,
-                VerticalConnector.status == "active"
-            ).to_list()
-            return connectors
+            await asyncio.sleep(ROUTE_TABLE_REBUILD_DELAY)
+            graph = self.graphs.get(building_id)
+            if graph is None:
+                return
+            await self._build_route_table(building_id, graph)
+            await self._build_landmarks(building_id, graph)
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
-            logger.error(f"Error getting connectors by shared ID: {str(e)}")
-            return []
-    
-    async def _find_nearest_connector(
-        self, 
-        location: Location, 
-        connectors: List[VerticalConnector],
-        preferred_type: Optional[str] = None
-    ) -> Optional[VerticalConnector]:
+            logger.error(f"Error preprocessing navigation graph for building {building_id}: {str(e)}")
+
+    def _is_current(self, building_id: str, graph: BuildingGraph, version: int) -> bool:
+        # A graph change meanwhile has already scheduled a new build
+        return graph.version == version and self.graphs.get(building_id) is graph
+
+    async def _build_route_table(self, building_id: str, graph: BuildingGraph) -> None:
+        """
+        Compute one shortest-path tree per kiosk, or per location when the building is small
+        """
+        build_start = time.perf_counter()
+        version = graph.version
+        locations = [n for n in graph.nodes if n.active and n.kind == "location"]
+        if len(locations) > ROUTE_TABLE_ALL_PAIRS_MAX_NODES:
+            locations = [n for n in locations if n.category == LocationType.KIOSK.value]
+        if not locations:
+            self.route_tables.pop(building_id, None)
+            return
+
+        table = RouteTable(graph, version)
+        transfer_cost = self._transfer_cost(None)
+        for location in locations:
+            await asyncio.sleep(0)
+            if not self._is_current(building_id, graph, version):
+                return
+            table.add(graph.shortest_path_tree(location.node_id, WALK_MINUTES_PER_UNIT, transfer_cost))
+
+        self.route_tables[building_id] = table
+        build_time = (time.perf_counter() - build_start) * 1000
+        logger.info(
+            f"Route table built for building {building_id}: {len(table.trees)} start points "
+            f"in {build_time:.1f}ms"
+        )
+
+    async def _build_landmarks(self, building_id: str, graph: BuildingGraph) -> None:
         """
-        Find nearest vertical connector to a location
+        ALT preprocessing for large buildings: farthest-point landmarks and their cost trees
         """
-        if not connectors:
-            return None
-        
-        # Filter by preferred type if specified
-        if preferred_type:
-            filtered_connectors = [c for c in connectors if c.connector_type == preferred_type]
-            if filtered_connectors:
-                connectors = filtered_connectors
-        
-        # Calculate distances and find nearest
-        nearest_connector = None
-        min_distance = float('inf')
-        
+        if len(graph.nodes) < LANDMARK_MIN_NODES:
+            self.landmarks.pop(building_id, None)
+            return
+
+        build_start = time.perf_counter()
+        version = graph.version
+        builder = build_landmarks(graph, LANDMARK_COUNT, WALK_MINUTES_PER_UNIT, self._transfer_cost(None))
+        while True:
+            try:
+                next(builder)
+            except StopIteration as done:
+                index = done.value
+                break
+            await asyncio.sleep(0)
+            if not self._is_current(building_id, graph, version):
+                return
+
+        self.landmarks[building_id] = index
+        build_time = (time.perf_counter() - build_start) * 1000
+        logger.info(
+            f"Landmarks built for building {building_id}: {len(index.landmarks)} landmarks "
+            f"in {build_time:.1f}ms"
+        )
+
+    async def _load_building_graph(self, building_id: str) -> BuildingGraph:
+        """
+        Load all active locations, connectors and published paths of a building in bulk
+        """
+        load_start = time.perf_counter()
+
+        floors = await Floor.find({"building_id": building_id, "status": "active"}).to_list()
+        floor_ids = [f.floor_id for f in floors]
+        graph = BuildingGraph(building_id, {f.floor_id: f.floor_number for f in floors})
+
+        locations, connectors, paths = await asyncio.gather(
+            Location.find({"floor_id": {"$in": floor_ids}, "status": "active"}).to_list(),
+            VerticalConnector.find({"floor_id": {"$in": floor_ids}, "status": "active"}).to_list(),
+            # `floors` is a multikey index: only paths drawn on this building's active floors
+            Path.find({"floors": {"$in": floor_ids}, "status": "active", "is_published": True}).to_list(),
+        )
+
+        for location in locations:
+            graph.upsert_node(self._location_node(location))
         for connector in connectors:
-            distance = self._calculate_euclidean_distance(
-                location.x, location.y,
-                connector.x, connector.y
-            )
-            
-            if distance < min_distance:
-                min_distance = distance
-                nearest_connector = connector
-        
-        return nearest_connector
-    
-    async def _find_path_on_floor(self, floor_id: str, source_id: str, destination_id: str) -> Optional[Dict[str, Any]]:
+            graph.upsert_node(self._connector_node(connector))
+        for path in paths:
+            self._apply_path(graph, path)
+
+        load_time = (time.perf_counter() - load_start) * 1000
+        logger.info(
+            f"Navigation graph loaded for building {building_id}: {len(graph.nodes)} nodes, "
+            f"{len(graph.paths)} paths in {load_time:.1f}ms"
+        )
+        return graph
+
+    def _location_node(self, location: Location) -> NavigationNode:
+        category = location.category.value if hasattr(location.category, "value") else location.category
+        return NavigationNode(
+            location.location_id, "location", location.floor_id, location.x, location.y,
+            name=location.name, category=category,
+        )
+
+    def _connector_node(self, connector: VerticalConnector) -> NavigationNode:
+        connector_type = connector.connector_type.value if hasattr(connector.connector_type, "value") else connector.connector_type
+        return NavigationNode(
+            connector.connector_id, "vertical_connector", connector.floor_id, connector.x, connector.y,
+            name=connector.name, connector_type=connector_type, shared_id=connector.shared_id,
+        )
+
+    def _apply_path(self, graph: BuildingGraph, path: Path) -> None:
         """
-        Find path between two points on the same floor
+        Hand a path's floor segments to the graph; each PathPoint becomes a node
+        (its Location / VerticalConnector, or a waypoint) joined to the next point
         """
-        try:
-            # Look for existing path
-            path = await Path.find_one({
-                "floor_id": floor_id,
-                "$or": [
-                    {"source_tag_id": source_id, "destination_tag_id": destination_id},
-                    {"source_tag_id": destination_id, "destination_tag_id": source_id}
-                ],
-                "status": "active",
-                "is_published": True
-            })
-            
-            if path:
-                return {
-                    "path_id": path.path_id,
-                    "name": path.name,
-                    "points": [{"x": p.x, "y": p.y} for p in path.points],
-                    "color": path.color,
-                    "shape": path.shape,
-                    "width": path.width,
-                    "height": path.height,
-                    "radius": path.radius
-                }
-            
-            # If no direct path found, try to find indirect path through graph traversal
-            return await self._find_indirect_path(floor_id, source_id, destination_id)
-            
-        except Exception as e:
-            logger.error(f"Error finding path on floor: {str(e)}")
+        segments = sorted(path.floor_segments or [], key=lambda s: s.sequence)
+        segment_specs = [
+            (seg.floor_id, [(p.ref_id, p.x, p.y) for p in seg.points])
+            for seg in segments
+        ]
+        graph.upsert_path(path.path_id, path.name, path.start_point_id, path.end_point_id, segment_specs)
+
+    def _graph_for_floor(self, floor_id: Optional[str]) -> Optional[BuildingGraph]:
+        for graph in self.graphs.values():
+            if floor_id in graph.floor_ids:
+                return graph
+        return None
+
+    async def _resolve_building_id(self, location_id: str) -> Optional[str]:
+        """
+        Map a location to its building, from resident graphs first and MongoDB on a cold start
+        """
+        for graph in self.graphs.values():
+            if graph.get_node(location_id) is not None:
+                return graph.building_id
+
+        location = await Location.find_one(Location.location_id == location_id)
+        if not location:
             return None
-    
-    async def _find_indirect_path(self, floor_id: str, source_id: str, destination_id: str) -> Optional[Dict[str, Any]]:
+        floor = await Floor.find_one(Floor.floor_id == location.floor_id)
+        return floor.building_id if floor else None
+
+    # -----------------------------
+    # Write hooks (called by Path / Location / VerticalConnector handlers)
+    # -----------------------------
+
+    async def on_path_saved(self, path: Path) -> None:
         """
-        Find indirect path using graph traversal (Dijkstra's algorithm)
+        Patch resident graphs after a path is created, updated, published or deleted
         """
+        changed = {path.building_id}
         try:
-            # Build graph for the floor
-            graph = await self._build_floor_graph(floor_id)
-            
-            if source_id not in graph or destination_id not in graph:
-                return None
-            
-            # Use Dijkstra's algorithm
-            distances = {node: float('inf') for node in graph}
-            distances[source_id] = 0
-            previous = {}
-            pq = [(0, source_id)]
-            visited = set()
-            
-            while pq:
-                current_distance, current_node = heapq.heappop(pq)
-                
-                if current_node in visited:
-                    continue
-                
-                visited.add(current_node)
-                
-                if current_node == destination_id:
-                    break
-                
-                for neighbor, weight in graph[current_node]:
-                    distance = current_distance + weight
-                    
-                    if distance < distances[neighbor]:
-                        distances[neighbor] = distance
-                        previous[neighbor] = current_node
-                        heapq.heappush(pq, (distance, neighbor))
-            
-            # Reconstruct path
-            if destination_id not in previous and destination_id != source_id:
-                return None
-            
-            path_nodes = []
-            current = destination_id
-            while current is not None:
-                path_nodes.append(current)
-                current = previous.get(current)
-            
-            path_nodes.reverse()
-            
-            # Convert to coordinate points
-            points = await self._convert_nodes_to_points(path_nodes)
-            
-            return {
-                "path_id": f"generated_{source_id}_{destination_id}",
-                "name": f"Route to destination",
-                "points": points,
-                "color": "#3b82f6",
-                "shape": "circle",
-                "radius": 0.01
-            }
-            
+            for building_id, graph in self.graphs.items():
+                if building_id != path.building_id and path.path_id in graph.paths:
+                    graph.remove_path(path.path_id)
+                    changed.add(building_id)
+
+            graph = self.graphs.get(path.building_id)
+            if graph is not None:
+                if path.status == "active" and path.is_published:
+                    self._apply_path(graph, path)
+                else:
+                    graph.remove_path(path.path_id)
+                self.schedule_preprocessing(path.building_id)
         except Exception as e:
-            logger.error(f"Error finding indirect path: {str(e)}")
-            return None
+            logger.error(f"Error patching navigation graph for path {path.path_id}: {str(e)}")
+            self.invalidate_building(path.building_id)
+        finally:
+            for building_id in changed:
+                await self.bump_graph_version(building_id)
 
+    async def on_location_saved(self, location: Location) -> None:
+        """
+        Patch resident graphs after a location is created, updated or deleted
+        """
+        await self._on_node_saved(location.location_id, location.floor_id, location.status,
+                                  lambda: self._location_node(location))
 
-    async def _build_floor_graph(self, floor_id: str) -> Dict[str, List[Tuple[str, float]]]:
+    async def on_locations_saved(self, locations: List[Location]) -> None:
         """
-        Build graph representation of floor with locations and connectors
+        on_location_saved for a batch (bulk updates): each building's graph version is bumped once
         """
-        graph = defaultdict(list)
-        
+        changed: Set[str] = set()
+        floors: Dict[str, Optional[Floor]] = {}
+        for location in locations:
+            changed |= await self._patch_node(location.location_id, location.floor_id, location.status,
+                                              lambda location=location: self._location_node(location), floors)
+        for building_id in changed:
+            await self.bump_graph_version(building_id)
+
+    async def on_connector_saved(self, connector: VerticalConnector) -> None:
+        """
+        Patch resident graphs after a vertical connector is created, updated or deleted
+        """
+        await self._on_node_saved(connector.connector_id, connector.floor_id, connector.status,
+                                  lambda: self._connector_node(connector))
+
+    async def on_node_removed(self, node_id: str, floor_id: Optional[str] = None) -> None:
+        """
+        Drop a hard-deleted location or connector from every resident graph
+        """
+        changed = set()
+        for graph in self.graphs.values():
+            if graph.get_node(node_id) is not None:
+                graph.remove_node(node_id)
+                self.schedule_preprocessing(graph.building_id)
+                changed.add(graph.building_id)
+
+        if not changed and floor_id:
+            floor = await Floor.find_one({"floor_id": floor_id})
+            if floor:
+                changed.add(floor.building_id)
+        for building_id in changed:
+            await self.bump_graph_version(building_id)
+
+    async def on_building_changed(self, building_id: Optional[str]) -> None:
+        """
+        Drop and re-version a building whose floors changed wholesale (e.g. a floor delete)
+        """
+        self.invalidate_building(building_id)
+        await self.bump_graph_version(building_id)
+
+    async def _on_node_saved(self, node_id: str, floor_id: str, node_status: str, build_node) -> None:
+        for building_id in await self._patch_node(node_id, floor_id, node_status, build_node):
+            await self.bump_graph_version(building_id)
+
+    async def _patch_node(self, node_id: str, floor_id: str, node_status: str, build_node,
+                          floors: Optional[Dict[str, Optional[Floor]]] = None) -> Set[str]:
+        """
+        Patch resident graphs for one saved node; returns the buildings whose graph version must be bumped.
+        `floors` memoizes floor lookups across the nodes of a batch.
+        """
+        graph = None
+        changed = set()
         try:
-            # Get all paths on the floor
-            paths = await Path.find(
-                Path.floor_id == floor_id,
-                Path.status == "active",
-                Path.is_published == True
-            ).to_list()
-            
-            for path in paths:
-                if path.source_tag_id and path.destination_tag_id:
-                    # Calculate weight based on path distance
-                    weight = self._calculate_path_distance([{"x": p.x, "y": p.y} for p in path.points])
-                    
-                    # Add bidirectional edges
-                    graph[path.source_tag_id].append((path.destination_tag_id, weight))
-                    graph[path.destination_tag_id].append((path.source_tag_id, weight))
-            
-            return dict(graph)
-            
+            graph = self._graph_for_floor(floor_id)
+            building_id = graph.building_id if graph is not None else None
+            if graph is None:
+                # Floor created after the graph was loaded, or building not resident here
+                if floors is not None and floor_id in floors:
+                    floor = floors[floor_id]
+                else:
+                    floor = await Floor.find_one({"floor_id": floor_id, "status": "active"})
+                    if floors is not None:
+                        floors[floor_id] = floor
+                building_id = floor.building_id if floor else None
+                graph = self.graphs.get(building_id) if floor else None
+                if graph is not None:
+                    graph.add_floor(floor.floor_id, floor.floor_number)
+            if building_id:
+                changed.add(building_id)
+
+            # A node moved to another building's floor leaves its old graph
+            for other in self.graphs.values():
+                if other is not graph and other.get_node(node_id) is not None:
+                    other.remove_node(node_id)
+                    changed.add(other.building_id)
+
+            if graph is None:
+                return changed
+            if node_status == "active":
+                graph.upsert_node(build_node())
+            else:
+                graph.remove_node(node_id)
+            self.schedule_preprocessing(graph.building_id)
         except Exception as e:
-            logger.error(f"Error building floor graph: {str(e)}")
-            return {}
+            logger.error(f"Error patching navigation graph for node {node_id}: {str(e)}")
+            if graph is not None:
+                self.invalidate_building(graph.building_id)
+        return changed
     
-    async def _convert_nodes_to_points(self, node_ids: List[str]) -> List[Dict[str, float]]:
+    async def _find_multi_floor_route(
+        self, 
+        graph: BuildingGraph,
+        source: NavigationNode, 
+        destination: NavigationNode, 
+        preferred_connector: Optional[str] = None,
+        algorithm: RouteAlgorithm = RouteAlgorithm.ASTAR,
+        accessible: bool = False
+    ) -> MultiFloorRoute:
         """
-        Convert node IDs to coordinate points
+        Find the optimal route across any number of floors in one search.
+
+        The building graph has one layer per floor; connectors sharing a shared_id
+        are linked between layers and cost their `_get_connector_time`. A preferred
+        connector type only makes the other types more expensive, it never
+        removes them; an accessible route only uses ACCESSIBLE_CONNECTORS.
+
+        A fresh route table answers any algorithm: its routes are the same
+        shortest paths a search would find, and come back marked PRECOMPUTED.
         """
-        points = []
-        
         try:
-            for node_id in node_ids:
-                # Try to find as location first
-                location = await Location.find_one(Location.location_id == node_id)
-                if location:
-                    points.append({"x": location.x, "y": location.y})
-                    continue
-                
-                # Try to find as vertical connector
-                connector = await VerticalConnector.find_one(VerticalConnector.connector_id == node_id)
-                if connector:
-                    points.append({"x": connector.x, "y": connector.y})
-            
-            return points
+            algorithm = RouteAlgorithm(algorithm)
+            if not preferred_connector and not accessible:
+                table = self.route_tables.get(graph.building_id)
+                if table is not None and table.is_fresh(graph):
+                    result = table.lookup(source.node_id, destination.node_id)
+                    if result is not None:
+                        route = self._build_route(graph, result.node_ids)
+                        route.precomputed = True
+                        route.algorithm = RouteAlgorithm.PRECOMPUTED
+                        return route
+            if algorithm == RouteAlgorithm.PRECOMPUTED:
+                algorithm = RouteAlgorithm.ASTAR
+
+            transfer_cost = self._transfer_cost(preferred_connector, accessible)
+            heuristic = None
+            if algorithm != RouteAlgorithm.DIJKSTRA:
+                heuristic = self._distance_heuristic(graph.heuristic_scale(WALK_MINUTES_PER_UNIT, transfer_cost))
+                landmarks = self.landmarks.get(graph.building_id)
+                if landmarks is not None and landmarks.is_fresh(graph):
+                    heuristic = self._combined_heuristic(heuristic, landmarks.heuristic)
+
+            result = graph.shortest_path(
+                source.node_id,
+                destination.node_id,
+                walk_cost=WALK_MINUTES_PER_UNIT,
+                transfer_cost=transfer_cost,
+                heuristic=heuristic,
+                bidirectional=algorithm == RouteAlgorithm.BIDIRECTIONAL,
+            )
+            if result is None:
+                raise ValueError("No route found between source and destination")
+
+            logger.debug(
+                f"{algorithm.value} route {source.node_id} -> {destination.node_id}: "
+                f"{result.expanded} nodes expanded"
+            )
+            route = self._build_route(graph, result.node_ids)
+            route.algorithm = algorithm
+            route.expanded_nodes = result.expanded
+            return route
             
         except Exception as e:
-            logger.error(f"Error converting nodes to points: {str(e)}")
+            logger.error(f"Error in multi-floor routing: {str(e)}")
+            raise
+
+    def _distance_heuristic(self, scale: float):
+        """
+        A* heuristic: straight-line distance to the goal, priced at `scale` minutes per unit
+        """
+        def heuristic(node: NavigationNode, goal: NavigationNode) -> float:
+            return scale * self._calculate_euclidean_distance(node.x, node.y, goal.x, goal.y)
+
+        return heuristic
+
+    def _combined_heuristic(self, *heuristics):
+        """
+        The largest of several admissible heuristics, which is still admissible
+        """
+        def heuristic(node: NavigationNode, goal: NavigationNode) -> float:
+            return max(h(node, goal) for h in heuristics)
+
+        return heuristic
+
+    def _transfer_cost(self, preferred_connector: Optional[str] = None, accessible: bool = False):
+        """
+        Cost function for connector hops between floors; None forbids the hop
+        """
+        preferred = preferred_connector.lower() if preferred_connector else None
+
+        def cost(from_node: NavigationNode, to_node: NavigationNode) -> Optional[float]:
+            connector_type = (from_node.connector_type or "").lower()
+            if accessible and connector_type not in ACCESSIBLE_CONNECTORS:
+                return None
+            minutes = float(self._get_connector_time(connector_type))
+            if preferred and connector_type != preferred:
+                minutes += NON_PREFERRED_CONNECTOR_PENALTY
+            return minutes
+
+        return cost
+
+    def _build_route(self, graph: BuildingGraph, node_ids: List[str]) -> MultiFloorRoute:
+        """
+        Turn a node sequence into per-floor walking segments and vertical transitions
+        """
+        route_segments = []
+        vertical_transitions = []
+
+        # Split the node sequence into walked runs separated by connector hops
+        runs: List[List[str]] = [[node_ids[0]]]
+        for a, b in zip(node_ids, node_ids[1:]):
+            if graph.is_transfer(a, b):
+                from_node = graph.get_node(a)
+                to_node = graph.get_node(b)
+                vertical_transitions.append({
+                    "connector_type": from_node.connector_type,
+                    "connector_name": from_node.name,
+                    "from_floor": from_node.floor_id,
+                    "to_floor": to_node.floor_id,
+                    "shared_id": from_node.shared_id,
+                    "instructions": f"Take {from_node.connector_type} from floor {from_node.floor_id} to floor {to_node.floor_id}",
+                    "estimated_time": self._get_connector_time(from_node.connector_type or "")
+                })
+                runs.append([b])
+            else:
+                runs[-1].append(b)
+
+        for run in runs:
+            if len(run) < 2:
+                continue
+            start_node = graph.get_node(run[0])
+            end_node = graph.get_node(run[-1])
+
+            # A walked run can still cross floors when a single path spans them
+            by_floor: List[Tuple[str, List[Dict[str, float]]]] = []
+            for point in self._convert_nodes_to_points(graph, run):
+                if not by_floor or by_floor[-1][0] != point["floor_id"]:
+                    by_floor.append((point["floor_id"], []))
+                by_floor[-1][1].append({"x": point["x"], "y": point["y"]})
+
+            for floor_id, points in by_floor:
+                route_segments.append({
+                    "floor_id": floor_id,
+                    "segment_type": "horizontal",
+                    "path": {
+                        "path_id": f"generated_{run[0]}_{run[-1]}",
+                        "name": "Route to destination",
+                        "points": points,
+                        "color": "#3b82f6",
+                        "shape": "circle",
+                        "radius": 0.01
+                    },
+                    "instructions": f"Walk from {start_node.name or start_node.node_id} to {end_node.name or end_node.node_id}",
+                    "distance": self._calculate_path_distance(points)
+                })
+
+        # Calculate total estimated time
+        total_time = sum([segment.get("distance", 0) * WALK_MINUTES_PER_UNIT for segment in route_segments])
+        total_time += sum([vt.get("estimated_time", 0) for vt in vertical_transitions])
+
+        floors = {graph.get_node(n).floor_id for n in node_ids}
+        return MultiFloorRoute(
+            total_floors=len(floors),
+            route_segments=route_segments,
+            vertical_transitions=vertical_transitions,
+            estimated_time=int(total_time)
+        )
+
+    def _route_summary(self, graph: BuildingGraph, node_ids: List[str]) -> Dict[str, Any]:
+        """
+        Walking distance, estimated time and floor count of a node sequence, without geometry
+        """
+        distance = 0.0
+        connector_time = 0
+        for a, b in zip(node_ids, node_ids[1:]):
+            from_node = graph.get_node(a)
+            to_node = graph.get_node(b)
+            if graph.is_transfer(a, b):
+                connector_time += self._get_connector_time(from_node.connector_type or "")
+            else:
+                distance += self._calculate_euclidean_distance(from_node.x, from_node.y, to_node.x, to_node.y)
+
+        return {
+            "distance": distance,
+            "estimated_time": int(distance * WALK_MINUTES_PER_UNIT + connector_time),
+            "total_floors": len({graph.get_node(n).floor_id for n in node_ids})
+        }
+
+    async def _query_floor_connectors(self, floor_ids: List[str]) -> List[VerticalConnector]:
+        """
+        Get all vertical connectors on the given floors straight from MongoDB, in one query
+        """
+        try:
+            connectors = await VerticalConnector.find({
+                "floor_id": {"$in": floor_ids},
+                "status": "active"
+            }).to_list()
+            return connectors
+        except Exception as e:
+            logger.error(f"Error getting floor connectors: {str(e)}")
             return []
+
+    def _convert_nodes_to_points(self, graph: BuildingGraph, node_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Convert node IDs to coordinate points (with floor_id).
+
+        Coordinates come from the resident graph's node index, so this never
+        touches MongoDB and its cost only grows with the route length.
+        """
+        return graph.route_points(node_ids)
     
     def _calculate_euclidean_distance(self, x1: float, y1: float, x2: float, y2: float) -> float:
         """
@@ -476,28 +895,24 @@ class NavigationService:
     
     async def get_floor_paths(self, floor_id: str) -> List[Dict[str, Any]]:
         """
-        Get all paths on a specific floor
+        Get all published paths drawn on a specific floor, with that floor's points
         """
         try:
-            paths = await Path.find(
-                Path.floor_id == floor_id,
-                Path.status == "active",
-                Path.is_published == True
-            ).to_list()
-            
+            paths = await Path.find({"floors": floor_id, "status": "active", "is_published": True}).to_list()
+
             return [
                 {
                     "path_id": path.path_id,
                     "name": path.name,
-                    "source_tag_id": path.source_tag_id,
-                    "destination_tag_id": path.destination_tag_id,
-                    "points": [{"x": p.x, "y": p.y} for p in path.points],
-                    "color": path.color,
-                    "shape": path.shape,
-                    "width": path.width,
-                    "height": path.height,
-                    "radius": path.radius,
-                    "description": path.description
+                    "start_point_id": path.start_point_id,
+                    "end_point_id": path.end_point_id,
+                    "is_multifloor": path.is_multifloor,
+                    "points": [
+                        {"kind": p.kind, "ref_id": p.ref_id, "x": p.x, "y": p.y}
+                        for seg in sorted(path.floor_segments or [], key=lambda s: s.sequence)
+                        if seg.floor_id == floor_id
+                        for p in seg.points
+                    ],
                 }
                 for path in paths
             ]
@@ -517,22 +932,19 @@ class NavigationService:
         }
         
         try:
-            # Check if source location exists
-            source_location = await Location.find_one(
-                Location.location_id == request.source_location_id,
-                Location.status == "active"
-            )
-            
+            # Both locations in one round trip
+            locations = await Location.find({
+                "location_id": {"$in": [request.source_location_id, request.destination_location_id]},
+                "status": "active"
+            }).to_list()
+            locations_by_id = {loc.location_id: loc for loc in locations}
+
+            source_location = locations_by_id.get(request.source_location_id)
             if not source_location:
                 validation_result["is_valid"] = False
                 validation_result["errors"].append("Source location not found or inactive")
             
-            # Check if destination location exists
-            destination_location = await Location.find_one(
-                Location.location_id == request.destination_location_id,
-                Location.status == "active"
-            )
-            
+            destination_location = locations_by_id.get(request.destination_location_id)
             if not destination_location:
                 validation_result["is_valid"] = False
                 validation_result["errors"].append("Destination location not found or inactive")
@@ -548,8 +960,11 @@ class NavigationService:
             # Check if locations are on different floors and connectors exist
             if source_location and destination_location:
                 if source_location.floor_id != destination_location.floor_id:
-                    source_connectors = await self._get_floor_connectors(source_location.floor_id)
-                    dest_connectors = await self._get_floor_connectors(destination_location.floor_id)
+                    connectors = await self._query_floor_connectors(
+                        [source_location.floor_id, destination_location.floor_id]
+                    )
+                    source_connectors = [c for c in connectors if c.floor_id == source_location.floor_id]
+                    dest_connectors = [c for c in connectors if c.floor_id == destination_location.floor_id]
                     
                     if not source_connectors:
                         validation_result["is_valid"] = False
@@ -0,0 +1,174 @@
+from typing import Any, Dict, Iterable, Optional, Set
+from src.common.redis_utils import publish_fast, subscribe_forever
+import asyncio
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Every worker relays messages published here to its own connected displays
+PUSH_CHANNEL = "push:updates"
+# Messages buffered per display; a display that falls further behind is told to re-sync
+PUSH_QUEUE_SIZE = int(os.getenv("PUSH_QUEUE_SIZE", "100"))
+# Seconds between keepalives on an idle connection, so proxies do not close it
+PUSH_KEEPALIVE_SECONDS = float(os.getenv("PUSH_KEEPALIVE_SECONDS", "15"))
+
+# Topic every display receives: content that is not tied to a building (events, announcements)
+ALL = "all"
+
+RESYNC = {"type": "resync"}
+
+
+def building_topic(building_id: str) -> str:
+    return f"building:{building_id}"
+
+
+def floor_topic(floor_id: str) -> str:
+    return f"floor:{floor_id}"
+
+
+class Subscriber:
+    """One connected display: its topics and a bounded queue of messages to send"""
+
+    __slots__ = ("topics", "queue")
+
+    def __init__(self, topics: Iterable[str]):
+        self.topics = tuple(dict.fromkeys(topics))
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=PUSH_QUEUE_SIZE)
+
+    def put(self, message: Dict[str, Any]) -> bool:
+        """Queue a message; on overflow the backlog is replaced by a single re-sync"""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            return False
+
+    async def get(self, timeout: float = PUSH_KEEPALIVE_SECONDS) -> Optional[Dict[str, Any]]:
+        """Next message, or None after `timeout` seconds without one"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class PushHub:
+    """
+    Pushes content updates to connected displays instead of having them poll.
+
+    Displays subscribe to topics (a building, a floor, ALL) over WebSocket or
+    SSE. Writers call `publish`; the message goes out on one Redis channel and
+    every worker hands it to its own subscribers of those topics, so a display
+    hears about a write whichever worker it is connected to.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Subscriber]] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+        self._subscribed_once = False
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+
+    def subscribe(self, topics: Iterable[str]) -> Subscriber:
+        subscriber = Subscriber(topics)
+        for topic in subscriber.topics:
+            self._subscribers.setdefault(topic, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        for topic in subscriber.topics:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    async def publish(self, topics: Iterable[str], message: Dict[str, Any]) -> None:
+        """Send `message` to every display subscribed to any of `topics`, on every worker"""
+        topics = [topic for topic in dict.fromkeys(topics) if topic]
+        if not topics:
+            return
+        self.published += 1
+        payload = {"topics": topics, "message": message}
+        if not await publish_fast(PUSH_CHANNEL, payload):
+            # Redis is down: displays on this worker still hear about the write
+            self._deliver(payload)
+
+    async def _on_message(self, payload: Dict[str, Any]) -> None:
+        self._deliver(payload)
+
+    def _deliver(self, payload: Dict[str, Any]) -> None:
+        # A display subscribed to both a building and one of its floors gets the message once
+        subscribers: Set[Subscriber] = set()
+        for topic in payload.get("topics") or ():
+            subscribers.update(self._subscribers.get(topic, ()))
+        message = payload.get("message")
+        for subscriber in subscribers:
+            if subscriber.put(message):
+                self.delivered += 1
+            else:
+                self.overflows += 1
+
+    def _on_subscribed(self) -> None:
+        # Messages published while the subscription was down are lost; have everyone catch up
+        if self._subscribed_once:
+            self._deliver({"topics": list(self._subscribers), "message": RESYNC})
+        self._subscribed_once = True
+
+    def start(self) -> None:
+        """Relay pushed messages to this worker's displays (call once from the app lifespan)"""
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(
+                subscribe_forever(PUSH_CHANNEL, self._on_message, on_subscribe=self._on_subscribed)
+            )
+
+    async def stop(self) -> None:
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        displays = set()
+        for subscribers in self._subscribers.values():
+            displays.update(subscribers)
+        return {
+            "displays": len(displays),
+            "topics": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+        }
+
+
+push_hub = PushHub()
+
+
+async def notify_change(building_id: Optional[str], entity_type: str, version: Optional[int] = None,
+                        floor_ids: Iterable[str] = ()) -> None:
+    """Tell a building's (and its floors') displays that its content changed"""
+    if not building_id:
+        return
+    floor_ids = [floor_id for floor_id in dict.fromkeys(floor_ids) if floor_id]
+    await push_hub.publish(
+        [building_topic(building_id), *(floor_topic(floor_id) for floor_id in floor_ids)],
+        {
+            "type": "change",
+            "building_id": building_id,
+            "entity_type": entity_type,
+            "version": version,
+            "floor_ids": floor_ids,
+        },
+    )
+
+
+async def notify_content(content_type: str, content_id: Optional[str] = None, action: str = "update") -> None:
+    """Tell every display that shared content (an event, an announcement) changed"""
+    await push_hub.publish([ALL], {"type": content_type, "id": content_id, "action": action})
@@ -0,0 +1,122 @@
+import asyncio
+import importlib.util
+import pathlib
+from types import SimpleNamespace
+
+import pytest
+
+from src.datamodel.database.domain.DigitalSignage import ShapeType
+from src.services import change_log
+from src.services import push_hub as push_hub_module
+
+ENDPOINT = pathlib.Path(__file__).resolve().parents[6] / "src/api/v1/location/_location_id/patch.py"
+
+
+def _load_endpoint():
+    """The endpoint module, loaded from its file as the route builder does"""
+    spec = importlib.util.spec_from_file_location("location_id_patch", ENDPOINT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _Result:
+    def __init__(self, items):
+        self.items = items
+
+    async def to_list(self, length=None):
+        return self.items
+
+
+def _floor(floor_id, building_id, locations=()):
+    async def save():
+        return None
+    return SimpleNamespace(floor_id=floor_id, building_id=building_id, locations=list(locations),
+                           updated_by=None, update_on=None, save=save)
+
+
+@pytest.fixture
+def patch_endpoint(monkeypatch):
+    """The PATCH endpoint over in-memory floors and one location, recording published pushes"""
+    endpoint = _load_endpoint()
+    floors = {
+        "floor-1": _floor("floor-1", "building-1", ["location-1"]),
+        "floor-2": _floor("floor-2", "building-1"),
+    }
+
+    async def save():
+        return None
+    location = SimpleNamespace(
+        location_id="location-1", name="Cafe", category="food", floor_id="floor-1", shape=ShapeType.CIRCLE,
+        x=1.0, y=2.0, width=None, height=None, radius=3.0, logo_url=None, color="#fff", text_color="#000",
+        is_published=True, description=None, created_by=None, datetime=1.0, updated_by=None, update_on=None,
+        status="active", save=save,
+    )
+
+    async def find_location(query):
+        # The name uniqueness check filters on "location_id": {"$ne": ...} and finds nothing
+        return location if query.get("location_id") == location.location_id else None
+
+    async def find_floor(query):
+        return floors.get(query.get("floor_id"))
+
+    def find_floors(query):
+        return _Result([floors[floor_id] for floor_id in query["floor_id"]["$in"] if floor_id in floors])
+
+    async def noop(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(endpoint, "Location", SimpleNamespace(find_one=find_location))
+    monkeypatch.setattr(endpoint, "Floor", SimpleNamespace(find_one=find_floor))
+    monkeypatch.setattr(endpoint, "navigation_service", SimpleNamespace(on_location_saved=noop))
+    monkeypatch.setattr(endpoint, "invalidate_tags", noop)
+
+    # Change log storage: one counter per building, entries discarded
+    versions = {}
+
+    async def find_one_and_update(query, update, upsert, return_document):
+        building_id = query["building_id"]
+        versions[building_id] = versions.get(building_id, 0) + update["$inc"]["version"]
+        return {"building_id": building_id, "version": versions[building_id]}
+
+    monkeypatch.setattr(change_log, "Floor", SimpleNamespace(find=find_floors))
+    monkeypatch.setattr(change_log, "ChangeCounter", SimpleNamespace(
+        get_motor_collection=lambda: SimpleNamespace(find_one_and_update=find_one_and_update)
+    ))
+    monkeypatch.setattr(change_log, "ChangeLogEntry", type("ChangeLogEntry", (SimpleNamespace,), {
+        "insert_many": staticmethod(noop)
+    }))
+
+    published = []
+
+    async def publish(topics, message):
+        published.append((list(topics), message))
+    monkeypatch.setattr(push_hub_module.push_hub, "publish", publish)
+
+    return SimpleNamespace(endpoint=endpoint, published=published, versions=versions)
+
+
+def test_patch_publishes_change(patch_endpoint):
+    endpoint = patch_endpoint.endpoint
+    asyncio.run(endpoint.main(endpoint.LocationPatchRequest(name="Coffee"), location_id="location-1"))
+
+    assert patch_endpoint.versions == {"building-1": 1}
+    assert len(patch_endpoint.published) == 1
+    topics, message = patch_endpoint.published[0]
+    assert message["type"] == "change"
+    assert message["building_id"] == "building-1"
+    assert message["entity_type"] == change_log.LOCATION
+    assert message["version"] == 1
+    assert push_hub_module.building_topic("building-1") in topics
+    assert push_hub_module.floor_topic("floor-1") in topics
+
+
+def test_patch_floor_move_notifies_both_floors(patch_endpoint):
+    endpoint = patch_endpoint.endpoint
+    asyncio.run(endpoint.main(endpoint.LocationPatchRequest(floor_id="floor-2"), location_id="location-1"))
+
+    assert len(patch_endpoint.published) == 1
+    topics, message = patch_endpoint.published[0]
+    assert message["floor_ids"] == ["floor-2", "floor-1"]
+    assert push_hub_module.floor_topic("floor-1") in topics
+    assert push_hub_module.floor_topic("floor-2") in topics
@@ -0,0 +1,86 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.datamodel.database.domain.DigitalSignage import ChangeOp
+from src.services import change_log
+
+
+class _Query:
+    def __init__(self, entries, since):
+        self.entries = sorted((entry for entry in entries if entry.version > since), key=lambda entry: entry.version)
+
+    def sort(self, field):
+        return self
+
+    def limit(self, limit):
+        self.entries = self.entries[:limit]
+        return self
+
+    async def to_list(self, length=None):
+        return self.entries
+
+
+@pytest.fixture
+def change_store(monkeypatch):
+    """One building's counter and log entries; every entry is a location tombstone"""
+    store = SimpleNamespace(version=0, entries=[], reads=0)
+
+    def find(query):
+        store.reads += 1
+        return _Query(store.entries, query["version"]["$gt"])
+
+    async def find_counter(query):
+        return SimpleNamespace(version=store.version)
+
+    def log(*versions):
+        store.entries += [
+            SimpleNamespace(version=version, entity_type=change_log.LOCATION, entity_id=f"location-{version}",
+                            op=ChangeOp.DELETE)
+            for version in versions
+        ]
+
+    store.log = log
+    monkeypatch.setattr(change_log, "ChangeLogEntry", SimpleNamespace(find=find))
+    monkeypatch.setattr(change_log, "ChangeCounter", SimpleNamespace(find_one=find_counter))
+    monkeypatch.setattr(change_log, "CHANGE_GAP_GRACE_SECONDS", 0)
+    return store
+
+
+def test_since_zero_resets(change_store):
+    change_store.version = 2
+    change_store.log(1, 2)
+    changes = asyncio.run(change_log.changes_since("building-1", 0, 100))
+
+    assert changes["reset"] and changes["version"] == 2
+
+
+def test_consecutive_changes(change_store):
+    change_store.version = 3
+    change_store.log(1, 2, 3)
+    changes = asyncio.run(change_log.changes_since("building-1", 1, 100))
+
+    assert not changes["reset"] and not changes["has_more"]
+    assert changes["version"] == 3
+    assert changes["deletes"] == {change_log.LOCATION: ["location-2", "location-3"]}
+
+
+def test_stops_before_missing_version(change_store):
+    change_store.version = 6
+    change_store.log(4, 6)
+    changes = asyncio.run(change_log.changes_since("building-1", 3, 100))
+
+    assert not changes["reset"] and changes["has_more"]
+    assert changes["version"] == 4
+    assert changes["deletes"] == {change_log.LOCATION: ["location-4"]}
+    # The hole was read again after the grace period
+    assert change_store.reads == 2
+
+
+def test_missing_next_version_resets(change_store):
+    change_store.version = 6
+    change_store.log(6)
+    changes = asyncio.run(change_log.changes_since("building-1", 4, 100))
+
+    assert changes["reset"] and changes["version"] == 6
@@ -0,0 +1,185 @@
+import math
+
+import pytest
+
+from src.services.navigation_graph import (
+    BuildingGraph, NavigationNode, RouteTable, build_landmarks, waypoint_id
+)
+
+FLOORS = {"floor-1": 1, "floor-2": 2, "floor-3": 3}
+GRID = range(0, 60, 10)
+# (location, floor, x, y)
+SHOPS = [
+    ("shop-a", "floor-1", 50, 10),
+    ("shop-b", "floor-1", 20, 40),
+    ("shop-c", "floor-2", 30, 50),
+    ("shop-d", "floor-3", 50, 50),
+    ("shop-e", "floor-3", 10, 30),
+]
+
+
+def _transfer(a, b):
+    """Elevators ride any number of floors cheaply; stairs cost per floor"""
+    floors = abs(FLOORS[a.floor_id] - FLOORS[b.floor_id])
+    return 1.0 + 0.5 * floors if a.connector_type == "elevator" else 4.0 * floors
+
+
+def _point(floor_id, x, y, refs):
+    return (refs.get((floor_id, x, y)), float(x), float(y))
+
+
+def _building():
+    """
+    Three floors of a 6x6 corridor grid, one path per grid line. The
+    elevator stands at (0, 0) and the stairs at (50, 50) of every floor;
+    shops sit on grid crossings.
+    """
+    graph = BuildingGraph("building-1", FLOORS)
+    refs = {}
+    for floor_id in FLOORS:
+        graph.upsert_node(NavigationNode(f"elevator-{floor_id}", "vertical_connector", floor_id, 0, 0,
+                                         connector_type="elevator", shared_id="elevator"))
+        graph.upsert_node(NavigationNode(f"stairs-{floor_id}", "vertical_connector", floor_id, 50, 50,
+                                         connector_type="stairs", shared_id="stairs"))
+        refs[(floor_id, 0, 0)] = f"elevator-{floor_id}"
+        refs[(floor_id, 50, 50)] = f"stairs-{floor_id}"
+    for location_id, floor_id, x, y in SHOPS:
+        graph.upsert_node(NavigationNode(location_id, "location", floor_id, x, y, category="shop"))
+        refs[(floor_id, x, y)] = location_id
+
+    for floor_id in FLOORS:
+        for line in GRID:
+            rows = [_point(floor_id, x, line, refs) for x in GRID]
+            columns = [_point(floor_id, line, y, refs) for y in GRID]
+            graph.upsert_path(f"row-{floor_id}-{line}", None, "", "", [(floor_id, rows)])
+            graph.upsert_path(f"column-{floor_id}-{line}", None, "", "", [(floor_id, columns)])
+    return graph
+
+
+def _straight_line(graph):
+    scale = graph.heuristic_scale(1.0, _transfer)
+    return lambda node, goal: scale * math.hypot(node.x - goal.x, node.y - goal.y)
+
+
+def _landmarks(graph, count):
+    steps = build_landmarks(graph, count, 1.0, _transfer)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+
+def _cost(graph, source_id, target_id, **kwargs):
+    result = graph.shortest_path(source_id, target_id, transfer_cost=_transfer, **kwargs)
+    return result.cost if result is not None else None
+
+
+PAIRS = [(a[0], b[0]) for a in SHOPS for b in SHOPS if a[0] != b[0]]
+
+
+@pytest.mark.parametrize("source_id,target_id", PAIRS)
+def test_algorithms_agree_on_cost(source_id, target_id):
+    graph = _building()
+    straight_line = _straight_line(graph)
+    landmarks = _landmarks(graph, 4)
+
+    dijkstra = _cost(graph, source_id, target_id)
+    assert dijkstra is not None
+    assert _cost(graph, source_id, target_id, heuristic=straight_line) == pytest.approx(dijkstra)
+    assert _cost(graph, source_id, target_id, bidirectional=True) == pytest.approx(dijkstra)
+    assert _cost(graph, source_id, target_id, heuristic=straight_line, bidirectional=True) == pytest.approx(dijkstra)
+    assert _cost(graph, source_id, target_id, heuristic=landmarks.heuristic) == pytest.approx(dijkstra)
+
+
+def test_route_is_a_connected_walk():
+    graph = _building()
+    result = graph.shortest_path("shop-a", "shop-d", transfer_cost=_transfer, bidirectional=True)
+
+    assert result.node_ids[0] == "shop-a" and result.node_ids[-1] == "shop-d"
+    total = 0.0
+    for a, b in zip(result.node_ids, result.node_ids[1:]):
+        u, v = graph.node_index[a], graph.node_index[b]
+        if graph.is_transfer(a, b):
+            total += _transfer(graph.nodes[u], graph.nodes[v])
+        else:
+            total += graph.adjacency[u][v]
+    assert total == pytest.approx(result.cost)
+
+
+def test_transfers_through_shared_connectors():
+    graph = _building()
+    # Elevators reach every floor in one ride, stairs only the next floor
+    assert graph.is_transfer("elevator-floor-1", "elevator-floor-3")
+    assert graph.is_transfer("stairs-floor-1", "stairs-floor-2")
+    assert not graph.is_transfer("stairs-floor-1", "stairs-floor-3")
+
+    result = graph.shortest_path("shop-a", "shop-e", transfer_cost=_transfer)
+    hops = [(a, b) for a, b in zip(result.node_ids, result.node_ids[1:]) if graph.is_transfer(a, b)]
+    assert hops == [("elevator-floor-1", "elevator-floor-3")]
+    # Without hop costs the floors are not connected
+    assert graph.shortest_path("shop-a", "shop-e") is None
+    # A single-floor search stays on that floor
+    assert graph.shortest_path("shop-a", "shop-e", floor_id="floor-1", transfer_cost=_transfer) is None
+
+
+def test_route_table_matches_live_search():
+    graph = _building()
+    table = RouteTable(graph, graph.version)
+    for location_id, _, _, _ in SHOPS:
+        table.add(graph.shortest_path_tree(location_id, 1.0, _transfer))
+
+    assert table.is_fresh(graph)
+    for source_id, target_id in PAIRS:
+        precomputed = table.lookup(source_id, target_id)
+        live = graph.shortest_path(source_id, target_id, transfer_cost=_transfer)
+        assert precomputed.cost == pytest.approx(live.cost)
+        assert precomputed.node_ids[0] == source_id and precomputed.node_ids[-1] == target_id
+    assert table.lookup("elevator-floor-1", "shop-a") is None
+
+    graph.remove_node("shop-b")
+    assert not table.is_fresh(graph)
+
+
+def test_remove_node_reroutes_and_readd_restores():
+    graph = _building()
+    before = _cost(graph, "shop-a", "shop-e")
+
+    version = graph.version
+    graph.remove_node("elevator-floor-1")
+    assert graph.version > version
+    assert not graph.adjacency[graph.node_index["elevator-floor-1"]]
+    assert not graph.is_transfer("elevator-floor-1", "elevator-floor-3")
+
+    # The stairs are the only way up now
+    result = graph.shortest_path("shop-a", "shop-e", transfer_cost=_transfer)
+    assert "elevator-floor-1" not in result.node_ids
+    assert "stairs-floor-1" in result.node_ids
+    assert result.cost > before
+
+    graph.upsert_node(NavigationNode("elevator-floor-1", "vertical_connector", "floor-1", 0, 0,
+                                     connector_type="elevator", shared_id="elevator"))
+    assert _cost(graph, "shop-a", "shop-e") == pytest.approx(before)
+
+
+def test_upsert_path_adds_and_replaces_legs():
+    graph = _building()
+    before = _cost(graph, "shop-a", "shop-b")
+
+    # A diagonal shortcut straight between the two shops
+    graph.upsert_path("shortcut", "Shortcut", "shop-a", "shop-b", [
+        ("floor-1", [("shop-a", 50.0, 10.0), ("shop-b", 20.0, 40.0)]),
+    ])
+    shortcut = graph.shortest_path("shop-a", "shop-b", transfer_cost=_transfer)
+    assert shortcut.node_ids == ["shop-a", "shop-b"]
+    assert shortcut.cost == pytest.approx(math.hypot(30, 30))
+
+    # Redrawn through a new waypoint: the old leg is gone, the waypoint joins the graph
+    graph.upsert_path("shortcut", "Shortcut", "shop-a", "shop-b", [
+        ("floor-1", [("shop-a", 50.0, 10.0), (None, 50.0, 40.0), ("shop-b", 20.0, 40.0)]),
+    ])
+    assert graph.node_index["shop-b"] not in graph.adjacency[graph.node_index["shop-a"]]
+    assert graph.get_node(waypoint_id("floor-1", 50, 40)).active
+
+    graph.remove_path("shortcut")
+    assert _cost(graph, "shop-a", "shop-b") == pytest.approx(before)